@@ -0,0 +1,170 @@
+from CNF import CNF
+from KnowledgeBase import KnowledgeBase
+from ForwardChaining import ForwardChaining
+from HornSAT import HornSAT
+from TwoSAT import TwoSAT
+from DPLL import DPLL
+from LocalSearch import LocalSearch
+
+class AutoSolver:
+    """
+    Classifies the knowledge base and query and sends them to the cheapest complete engine.
+
+    - definite-horn: every sentence is a Horn-form fact or rule and the query is a symbol;
+      answered by forward chaining without building the CNF.
+    - horn / dual-horn: every clause of KB ∧ ¬query has at most one positive / negative
+      literal; answered by linear time Horn-SAT.
+    - 2-cnf: every clause has at most two literals; answered by linear time 2-SAT.
+    - general: anything else; answered by DPLL, optionally after a short local search for
+      a countermodel, which can answer a non-entailed query without a full search.
+    """
+
+    LOCAL_SEARCH = {'max_flips': 10000, 'restarts': 0}
+
+    def __init__(self, knowledge_base, query, tracer=None, heuristic='JW', budget=None, local_search=None):
+        """
+        Initialize the solver with a knowledge base and a query.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base of general sentences.
+            query (Sentence): The query sentence to be solved.
+            tracer (Tracer): Passed on to the selected engine. Optional.
+            heuristic (str): DPLL branching heuristic for general knowledge bases.
+            budget (Budget): Passed on to the selected engine. Optional.
+            local_search (dict): LocalSearch keyword arguments; when given, general clause
+                sets are first tried by local search, limited by default to LOCAL_SEARCH. Optional.
+        """
+        self.kb = knowledge_base
+        self.query = query
+        self.trace = tracer
+        self.heuristic = heuristic
+        self.budget = budget
+        self.local_search = None if local_search is None else dict(self.LOCAL_SEARCH, **local_search)
+        self.model = None
+        self.stats = {}
+
+    def solve(self):
+        """
+        Solve the query with the engine selected for its class.
+
+        Returns:
+            bool: True if the query is entailed by the knowledge base, False otherwise.
+        """
+        horn_kb = self.definite_horn()
+        if horn_kb is not None:
+            self.stats = {'class': 'definite-horn', 'engine': 'FC'}
+            return ForwardChaining(horn_kb, tracer=self.trace, budget=self.budget).solve(self.query.root[0]).startswith("YES")
+
+        return not self.satisfiable(CNF.from_kb(self.kb, self.query))
+
+    def satisfiable(self, cnf):
+        """
+        Decide satisfiability of a clause store with the engine selected for its class.
+
+        Args:
+            cnf (CNF): The clause store.
+
+        Returns:
+            bool: True if the clauses are satisfiable, False otherwise. A satisfying model is left in self.model.
+        """
+        kind = self.classify(cnf)
+        self.stats = {'class': kind, 'engine': None, 'clauses': len(cnf.clauses), 'symbols': cnf.num_vars}
+        if kind == 'general' and self.local_search is not None:
+            search = LocalSearch(self.kb, self.query, tracer=self.trace, budget=self.budget, **self.local_search)
+            found = search.satisfiable(cnf)
+            self.stats.update(local_search_flips=search.stats['flips'])
+            if found and (self.kb is None or search.verify(search.model)):
+                self.model = search.model
+                self.stats['engine'] = 'LocalSearch'
+                return True
+        if kind == 'horn':
+            engine = HornSAT(self.kb, self.query, tracer=self.trace, budget=self.budget)
+        elif kind == 'dual-horn':
+            engine = HornSAT(self.kb, self.query, dual=True, tracer=self.trace, budget=self.budget)
+        elif kind == '2-cnf':
+            engine = TwoSAT(self.kb, self.query, tracer=self.trace, budget=self.budget)
+        else:
+            engine = DPLL(self.kb, self.query, heuristic=self.heuristic, tracer=self.trace, budget=self.budget)
+        satisfiable = engine.satisfiable(cnf)
+        self.model = engine.model
+        self.stats['engine'] = type(engine).__name__ + (' (dual)' if kind == 'dual-horn' else '')
+        self.stats.update(engine.stats)
+        return satisfiable
+
+    def definite_horn(self):
+        """
+        Rebuild the knowledge base as Horn-form sentences if every parsed sentence has that shape.
+
+        The shape is read from the parse tree of each sentence, not from its text, so that
+        e.g. 'c&(a=>b)' is not mistaken for the rule 'c&a=>b'.
+
+        Returns:
+            KnowledgeBase or None: The Horn-form knowledge base, or None if a sentence is not
+            a Horn-form fact or rule or the query is not a single symbol.
+        """
+        if self.query.atomic:
+            return None
+        rules = []
+        for sentence in self.kb.sentences:
+            rule = self.horn_rule(sentence)
+            if rule is None:
+                return None
+            rules.append(rule)
+        return KnowledgeBase(rules, 'HF')
+
+    @staticmethod
+    def horn_rule(sentence):
+        """
+        Read a parsed sentence as a Horn-form fact or rule.
+
+        Args:
+            sentence (Sentence): The parsed sentence.
+
+        Returns:
+            str or None: The sentence as 'a' or 'a&b=>c', or None if it is neither a single
+            symbol nor an implication from a conjunction of symbols to a symbol.
+        """
+        if len(sentence.root) != 1:
+            return None
+        components = sentence.atomic.get(sentence.root[0])
+        if components is None:
+            return sentence.root[0].strip()
+        if len(components) != 3 or components[1] != '=>' or components[2] in sentence.atomic:
+            return None
+        premises = []
+        stack = [components[0]]
+        while stack:
+            key = stack.pop()
+            components = sentence.atomic.get(key)
+            if components is None:
+                premises.append(key.strip())
+            elif len(components) == 3 and components[1] == '&':
+                stack += [components[2], components[0]]
+            else:
+                return None
+        return "&".join(premises) + "=>" + sentence.atomic[sentence.root[0]][2].strip()
+
+    @staticmethod
+    def classify(cnf):
+        """
+        Classify a clause store by the shape of its clauses.
+
+        Args:
+            cnf (CNF): The clause store.
+
+        Returns:
+            str: 'horn', 'dual-horn', '2-cnf' or 'general'.
+        """
+        horn = dual_horn = two_cnf = True
+        for clause in cnf.clauses:
+            positive = sum(1 for literal in clause if literal > 0)
+            horn = horn and positive <= 1
+            dual_horn = dual_horn and len(clause) - positive <= 1
+            two_cnf = two_cnf and len(clause) <= 2
+            if not (horn or dual_horn or two_cnf):
+                return 'general'
+        if horn:
+            return 'horn'
+        if dual_horn:
+            return 'dual-horn'
+        return '2-cnf' if two_cnf else 'general'
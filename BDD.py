@@ -0,0 +1,514 @@
+class BDDManager:
+    """
+    Reduced ordered binary decision diagrams over a fixed variable order.
+
+    Nodes are integers: 0 and 1 are the terminals and every other node is a
+    (level, low, high) triple kept unique by a hash-consing table, so equivalent
+    functions are the same integer. ITE results are memoised in a direct-mapped
+    computed cache; a colliding entry simply overwrites (evicts) the old one, which
+    bounds memory whatever the size of the computation.
+    """
+
+    FALSE = 0
+    TRUE = 1
+
+    def __init__(self, order, cache_size=1 << 16, budget=None):
+        """
+        Initializes an empty manager.
+
+        Args:
+            order (list of str): Variable names from the top level to the bottom level.
+            cache_size (int): Number of computed cache slots, rounded up to a power of two.
+            budget (Budget): Limits time, memory and the number of allocated nodes ('nodes'). Optional.
+        """
+        self.budget = budget
+        self.order = list(order)
+        self.level = {name: index for index, name in enumerate(self.order)}
+        bottom = len(self.order)
+        self.nodes = [(bottom, None, None), (bottom, None, None)]
+        self.unique = {}
+        size = 1
+        while size < cache_size:
+            size <<= 1
+        self.cache = [None] * size
+        self.mask = size - 1
+        self.stats = {'cache_hits': 0, 'cache_misses': 0, 'cache_evictions': 0}
+
+    def mk(self, level, low, high):
+        """
+        Returns the unique node for (level, low, high), applying the reduction rule.
+
+        Args:
+            level (int): The variable level.
+            low (int): The node for the variable set to False.
+            high (int): The node for the variable set to True.
+
+        Returns:
+            int: The node.
+        """
+        if low == high:
+            return low
+        key = (level, low, high)
+        node = self.unique.get(key)
+        if node is None:
+            node = len(self.nodes)
+            self.nodes.append(key)
+            self.unique[key] = node
+        return node
+
+    def var(self, name):
+        """
+        Returns the node of a single variable.
+
+        Args:
+            name (str): The variable name.
+
+        Returns:
+            int: The node.
+        """
+        return self.mk(self.level[name], self.FALSE, self.TRUE)
+
+    def ite(self, f, g, h):
+        """
+        Computes if-then-else(f, g, h), the universal BDD operation.
+
+        The Shannon expansion runs on an explicit stack rather than by recursion, so deep
+        diagrams do not hit the interpreter's recursion limit.
+
+        Args:
+            f (int): The condition node.
+            g (int): The node used where f is true.
+            h (int): The node used where f is false.
+
+        Returns:
+            int: The result node.
+        """
+        nodes = self.nodes
+        results = []
+        stack = [(f, g, h)]
+        while stack:
+            f, g, h = stack.pop()
+            if f is None:  # both cofactors are done: g is the cache key, h the top level
+                high, low = results.pop(), results.pop()
+                result = self.mk(h, low, high)
+                slot = hash(g) & self.mask
+                if self.cache[slot] is not None:
+                    self.stats['cache_evictions'] += 1
+                self.cache[slot] = (g, result)
+                results.append(result)
+                continue
+            if f == self.TRUE or g == h:
+                results.append(g)
+                continue
+            if f == self.FALSE:
+                results.append(h)
+                continue
+            if g == self.TRUE and h == self.FALSE:
+                results.append(f)
+                continue
+
+            key = (f, g, h)
+            entry = self.cache[hash(key) & self.mask]
+            if entry is not None and entry[0] == key:
+                self.stats['cache_hits'] += 1
+                results.append(entry[1])
+                continue
+            self.stats['cache_misses'] += 1
+            if self.budget:
+                self.budget.check('nodes', len(nodes))
+
+            top = min(nodes[f][0], nodes[g][0], nodes[h][0])
+            f0, f1 = (nodes[f][1], nodes[f][2]) if nodes[f][0] == top else (f, f)
+            g0, g1 = (nodes[g][1], nodes[g][2]) if nodes[g][0] == top else (g, g)
+            h0, h1 = (nodes[h][1], nodes[h][2]) if nodes[h][0] == top else (h, h)
+            stack.append((None, key, top))
+            stack.append((f1, g1, h1))
+            stack.append((f0, g0, h0))
+        return results[0]
+
+    def neg(self, f):
+        """Returns the node of ~f."""
+        return self.ite(f, self.FALSE, self.TRUE)
+
+    def apply(self, operator, f, g):
+        """
+        Combines two nodes with a binary connective of the sentence syntax.
+
+        Args:
+            operator (str): One of '&', '||', '=>' and '<=>'.
+            f (int): The left operand.
+            g (int): The right operand.
+
+        Returns:
+            int: The result node.
+        """
+        if operator == '&':
+            return self.ite(f, g, self.FALSE)
+        if operator == '||':
+            return self.ite(f, self.TRUE, g)
+        if operator == '=>':
+            return self.ite(f, g, self.TRUE)
+        if operator == '<=>':
+            return self.ite(f, g, self.neg(g))
+        raise ValueError(f"Unknown operator: {operator}")
+
+    def build(self, sentence):
+        """
+        Builds the node of a parsed sentence from its atomic sub-sentences.
+
+        Args:
+            sentence (Sentence): The parsed sentence.
+
+        Returns:
+            int: The node.
+        """
+        values = {}
+
+        def get(part):
+            part = part.strip()
+            return values[part] if part in values else self.var(part)
+
+        # Atomic sub-sentences are numbered bottom-up, so operands are always built first.
+        for atom_key, components in sentence.atomic.items():
+            if len(components) == 2:
+                values[atom_key] = self.neg(get(components[1]))
+            else:
+                values[atom_key] = self.apply(components[1], get(components[0]), get(components[2]))
+        return get(sentence.root[0])
+
+    def count(self, f):
+        """
+        Counts the satisfying assignments of f over all variables of the manager.
+
+        Linear in the number of nodes reachable from f.
+
+        Args:
+            f (int): The node.
+
+        Returns:
+            int: The model count.
+        """
+        nodes = self.nodes
+        counts = {self.FALSE: 0, self.TRUE: 1}
+        stack = [f]
+        while stack:
+            u = stack[-1]
+            if u in counts:
+                stack.pop()
+                continue
+            level, low, high = nodes[u]
+            pending = [child for child in (low, high) if child not in counts]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            counts[u] = (counts[low] << (nodes[low][0] - level - 1)) + (counts[high] << (nodes[high][0] - level - 1))
+        return counts[f] << nodes[f][0]
+
+    def size(self, *roots):
+        """
+        Counts the internal nodes reachable from the given roots.
+
+        Args:
+            *roots (int): The root nodes.
+
+        Returns:
+            int: The number of shared internal nodes.
+        """
+        seen = set()
+        stack = [root for root in roots if root > self.TRUE]
+        while stack:
+            u = stack.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            _, low, high = self.nodes[u]
+            stack.extend(child for child in (low, high) if child > self.TRUE)
+        return len(seen)
+
+    def levels(self, roots):
+        """
+        Lists the internal nodes reachable from the given roots by level.
+
+        Args:
+            roots (list of int): The root nodes.
+
+        Returns:
+            list of list of int: The nodes of every level, from the top level down.
+        """
+        by_level = [[] for _ in self.order]
+        seen = set()
+        stack = [root for root in roots if root > self.TRUE]
+        while stack:
+            u = stack.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            level, low, high = self.nodes[u]
+            by_level[level].append(u)
+            stack.extend(child for child in (low, high) if child > self.TRUE)
+        return by_level
+
+    def swap(self, level, by_level):
+        """
+        Swaps the variables of two adjacent levels in place.
+
+        Every node keeps its integer and its function, so the roots, the nodes held by the
+        caller and the computed cache stay valid. A node x of the upper level whose children
+        do not test the lower variable y only moves down a level. Any other x node becomes a
+        y node whose children are x nodes built from the four cofactors; y nodes move up a
+        level unchanged.
+
+        Args:
+            level (int): The upper of the two levels.
+            by_level (list of list of int): The nodes of every level, updated in place.
+        """
+        nodes, unique = self.nodes, self.unique
+        below = level + 1
+        moved, rebuilt = [], []
+        for u in by_level[level]:
+            _, low, high = nodes[u]
+            del unique[nodes[u]]
+            if nodes[low][0] == below or nodes[high][0] == below:
+                f00, f01 = (nodes[low][1], nodes[low][2]) if nodes[low][0] == below else (low, low)
+                f10, f11 = (nodes[high][1], nodes[high][2]) if nodes[high][0] == below else (high, high)
+                rebuilt.append((u, f00, f01, f10, f11))
+            else:
+                moved.append(u)
+        for v in by_level[below]:
+            del unique[nodes[v]]
+        for v in by_level[below]:
+            nodes[v] = (level, nodes[v][1], nodes[v][2])
+            unique[nodes[v]] = v
+        for u in moved:
+            nodes[u] = (below, nodes[u][1], nodes[u][2])
+            unique[nodes[u]] = u
+
+        upper, lower = list(by_level[below]), moved
+        for u, f00, f01, f10, f11 in rebuilt:
+            children = []
+            for x0, x1 in ((f00, f10), (f01, f11)):
+                count = len(nodes)
+                child = self.mk(below, x0, x1)
+                if child >= count:
+                    lower.append(child)
+                children.append(child)
+            nodes[u] = (level, children[0], children[1])
+            unique[nodes[u]] = u
+            upper.append(u)
+        by_level[level], by_level[below] = upper, lower
+
+        x, y = self.order[level], self.order[below]
+        self.order[level], self.order[below] = y, x
+        self.level[x], self.level[y] = below, level
+
+    def sift(self, roots, max_growth=1.2):
+        """
+        Rudell's sifting: moves each variable, widest level first, through every level by
+        adjacent swaps and leaves it where the diagrams of the roots were smallest.
+
+        A variable stops moving in one direction once the diagrams grow past max_growth
+        times their size before it moved. Nodes not reachable from the roots are dropped
+        from the unique table before and after every variable's move, since swaps only
+        update reachable nodes, and the computed cache is cleared with them.
+
+        Args:
+            roots (list of int): The nodes whose diagrams are kept; they stay valid.
+            max_growth (float): The growth bound of a single variable's move.
+
+        Returns:
+            int: The number of internal nodes reachable from the roots after sifting.
+        """
+        by_level = self.levels(roots)
+        self.collect(by_level)
+        bottom = len(self.order) - 1
+        for name in sorted(self.order, key=lambda name: -len(by_level[self.level[name]])):
+            level = start = self.level[name]
+            best = limit = self.size(*roots)
+            limit *= max_growth
+            best_level = start
+            for step, end in ((1, bottom), (-1, 0)):
+                while level != end:
+                    self.swap(min(level, level + step), by_level)
+                    level += step
+                    if self.budget:
+                        self.budget.check('nodes', len(self.nodes))
+                    size = self.size(*roots)
+                    if size < best:
+                        best, best_level = size, level
+                    if size > limit:
+                        break
+            while level != best_level:
+                step = 1 if best_level > level else -1
+                self.swap(min(level, level + step), by_level)
+                level += step
+            by_level = self.levels(roots)
+            self.collect(by_level)
+        return self.size(*roots)
+
+    def collect(self, by_level):
+        """
+        Removes unreachable nodes from the unique table and clears the computed cache,
+        whose entries may refer to them. Their integers must not be used afterwards.
+
+        Args:
+            by_level (list of list of int): The reachable nodes of every level.
+        """
+        live = {u for nodes in by_level for u in nodes}
+        self.unique = {key: u for key, u in self.unique.items() if u in live}
+        self.cache = [None] * len(self.cache)
+
+class BDD:
+    ORDERS = ['APPEARANCE', 'FREQUENCY', 'FORCE']
+    SIFT_THRESHOLD = 256  # unique table size that triggers the first sifting pass during construction
+
+    def __init__(self, knowledge_base, query, order='APPEARANCE', sift=False, cache_size=1 << 16, tracer=None, budget=None):
+        """
+        Initialize the BDD engine with a knowledge base and a query.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base of general sentences.
+            query (Sentence): The query sentence to be solved.
+            order (str): Static variable ordering heuristic: 'APPEARANCE', 'FREQUENCY' or 'FORCE'.
+            sift (bool): Reorder variables dynamically by sifting, whenever the unique table has
+                doubled while the KB diagram is built, and once more before the entailment check.
+            cache_size (int): Number of computed cache slots.
+            tracer (Tracer): Receives start and result events. Optional.
+            budget (Budget): Limits time, memory and the number of allocated nodes ('nodes'). Optional.
+        """
+        order = order.upper()
+        if order not in self.ORDERS:
+            raise Exception(f"Unknown variable order: {order}")
+        self.kb = knowledge_base
+        self.query = query
+        self.order = order
+        self.sift = sift
+        self.cache_size = cache_size
+        self.trace = tracer
+        self.budget = budget
+        self.stats = {}
+
+    def solve(self):
+        """
+        Solves the query by checking that the KB diagram implies the query diagram.
+
+        Returns:
+            str: "YES: <number of models of the KB>" if the query is entailed, otherwise "NO".
+        """
+        names = self.variable_order()
+        if self.trace:
+            self.trace.emit('start', engine='BDD', clauses=len(self.kb.sentences), symbols=len(names))
+
+        self.manager = BDDManager(names, self.cache_size, self.budget)
+        manager = self.manager
+        reorders = 0
+        threshold = self.SIFT_THRESHOLD
+        self.kb_root = manager.TRUE
+        for sentence in self.kb.sentences:
+            self.kb_root = manager.apply('&', self.kb_root, manager.build(sentence))
+            if self.sift and len(manager.unique) > threshold:
+                threshold = max(threshold, 2 * manager.sift([self.kb_root]))
+                reorders += 1
+        self.query_root = manager.build(self.query)
+        if self.sift:
+            manager.sift([self.kb_root, self.query_root])
+            reorders += 1
+
+        entailed = manager.apply('=>', self.kb_root, self.query_root) == manager.TRUE
+        self.stats = {'order': self.order + (' + sift' if self.sift else ''),
+                      'nodes': manager.size(self.kb_root, self.query_root),
+                      'allocated': len(manager.nodes)}
+        if self.sift:
+            self.stats['reorders'] = reorders
+        self.stats.update(manager.stats)
+
+        result = "YES: " + str(self.count_models()) if entailed else "NO"
+        if self.trace:
+            self.trace.emit('result', answer=result, stats=self.stats)
+        return result
+
+    def count_models(self):
+        """
+        Counts the models of the knowledge base over its own symbols, as the truth table does.
+
+        Returns:
+            int: The model count.
+        """
+        extra = len(self.manager.order) - len(self.kb.symbols)
+        return self.manager.count(self.kb_root) >> extra
+
+    def variable_order(self):
+        """
+        Computes the static variable order selected by the order heuristic.
+
+        Returns:
+            list of str: Variable names from the top level down.
+        """
+        names = list(self.kb.symbols)
+        names.extend(symbol for symbol in dict.fromkeys(self.query.symbols) if symbol not in names)
+        edges = [list(dict.fromkeys(sentence.symbols)) for sentence in self.kb.sentences]
+        edges.append(list(dict.fromkeys(self.query.symbols)))
+
+        if self.order == 'FREQUENCY':
+            occurrences = {name: 0 for name in names}
+            for edge in edges:
+                for name in edge:
+                    occurrences[name] += 1
+            return sorted(names, key=lambda name: -occurrences[name])
+        if self.order == 'FORCE':
+            return self.force(names, edges)
+        return names
+
+    def force(self, names, edges):
+        """
+        FORCE ordering: repeatedly move every variable to the mean centre of gravity of the
+        sentences it occurs in, so variables of the same sentence end up close together.
+
+        Args:
+            names (list of str): Variables in appearance order.
+            edges (list of list of str): The variables of every sentence.
+
+        Returns:
+            list of str: The improved order.
+        """
+        position = {name: index for index, name in enumerate(names)}
+        best, best_span = list(names), self.span(position, edges)
+        for _ in range(max(10, 2 * len(names).bit_length())):
+            gravity = {name: [] for name in names}
+            for edge in edges:
+                if edge:
+                    centre = sum(position[name] for name in edge) / len(edge)
+                    for name in edge:
+                        gravity[name].append(centre)
+            target = {name: sum(gravity[name]) / len(gravity[name]) if gravity[name] else position[name] for name in names}
+            ordered = sorted(names, key=lambda name: (target[name], position[name]))
+            position = {name: index for index, name in enumerate(ordered)}
+            span = self.span(position, edges)
+            if span >= best_span:
+                break
+            best, best_span = ordered, span
+        return best
+
+    @staticmethod
+    def span(position, edges):
+        """
+        Total extent of the sentences under an order, the cost FORCE minimises.
+
+        Args:
+            position (dict): Level of every variable.
+            edges (list of list of str): The variables of every sentence.
+
+        Returns:
+            int: The summed span.
+        """
+        return sum(max(position[name] for name in edge) - min(position[name] for name in edge) for edge in edges if edge)
+
+if __name__ == "__main__":
+    from KnowledgeBase import KnowledgeBase
+    from FileReader import FileReader
+    from Sentence import Sentence
+    tell, ask = FileReader.read("test.txt")
+    kb = KnowledgeBase(tell, 'GS')
+    query = Sentence(ask)
+    bdd = BDD(kb, query)
+    print(bdd.solve())
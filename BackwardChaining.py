@@ -1,56 +1,122 @@
-from KnowledgeBase import KnowledgeBase
-from Sentence import Sentence
-from HornForm import HornForm
+from array import array
+from SolverContext import SolverContext
 
 class BackwardChaining:
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, tracer=None, budget=None):
         """
         Initialize the BackwardChaining instance with a given knowledge base.
 
+        Builds the head-to-rule index of the Horn-form knowledge base as CSR arrays:
+        the rules concluding s are `rule_ids[head_offsets[s]:head_offsets[s + 1]]`, in KB order.
+        The index is never modified afterwards; the proved and active flags of a query live in
+        its SolverContext, so the instance can answer many queries, also concurrently.
+
         Args:
             knowledge_base (KnowledgeBase): The knowledge base containing propositional sentences.
+            tracer (Tracer): Receives rule-fired events. Optional.
+            budget (Budget): Limits time and memory. Optional.
         """
         self.kb = knowledge_base
-        self.inferred = []  # List to maintain the order of inferences
+        self.trace = tracer
+        self.budget = budget
+
+        kb = self.kb
+        heads = array('i', bytes(4 * (len(kb.symbols) + 1)))
+        for head in kb.heads:
+            heads[head + 1] += 1
+        for symbol in range(len(kb.symbols)):
+            heads[symbol + 1] += heads[symbol]
+        self.head_offsets = heads
+        self.rule_ids = array('i', bytes(4 * kb.num_rules))
+        fill = array('i', heads)
+        for rule, head in enumerate(kb.heads):
+            self.rule_ids[fill[head]] = rule
+            fill[head] += 1
+
+        self.context = self.new_context()
+
+    @property
+    def inferred(self):
+        """list of str: The symbols proved by the latest call to solve, in order."""
+        return self.context.inferred
 
-    def solve(self, query):
+    def new_context(self):
+        """
+        Creates the per-query state: the proved symbols and the goals on the recursion stack.
+
+        Returns:
+            SolverContext: A fresh context.
+        """
+        return SolverContext(proved=bytearray(len(self.kb.symbols)), active=bytearray(len(self.kb.symbols)))
+
+    def solve(self, query, context=None):
         """
         Use backward chaining to infer the query from the knowledge base.
 
         Args:
             query (str): The query to be inferred.
+            context (SolverContext): Per-query state from new_context. A new one is created if omitted.
 
         Returns:
             str: "YES" if the query can be inferred, "NO" otherwise.
         """
-        if self.bc_recursive(query):
-            return "YES: " + ", ".join(self.inferred)
+        context = context or self.new_context()
+        self.context = context
+        goal = self.kb.ids.get(query)
+        if goal is not None and self.bc_recursive(goal, context):
+            return "YES: " + ", ".join(context.inferred)
         else:
             return "NO"
 
-    def bc_recursive(self, goal):
+    def bc_recursive(self, goal, context):
         """
         Recursively perform backward chaining to prove the given goal.
 
+        A goal that is already being proved further up the recursion fails on this branch,
+        so cyclic rules terminate.
+
         Args:
-            goal (str): The goal to be proved.
+            goal (int): The id of the goal to be proved.
+            context (SolverContext): The state of the query.
 
         Returns:
             bool: True if the goal can be proved, False otherwise.
         """
-        if goal in self.inferred:
+        if context.proved[goal]:
             return True
+        if context.active[goal]:
+            return False
+        if self.budget:
+            self.budget.check()
 
-        if any(goal == sentence.head and not sentence.conjuncts for sentence in self.kb.sentences if isinstance(sentence, HornForm)):
-            if goal not in self.inferred:
-                self.inferred.append(goal)
+        kb = self.kb
+        rules = self.rule_ids[self.head_offsets[goal]:self.head_offsets[goal + 1]]
+        if any(kb.offsets[rule] == kb.offsets[rule + 1] for rule in rules):
+            self.prove(goal, context)
             return True
 
-        for rule in self.kb.sentences:
-            if isinstance(rule, HornForm) and rule.head == goal:
-                if all(self.bc_recursive(premise) for premise in rule.conjuncts):
-                    if goal not in self.inferred:
-                        self.inferred.append(goal)
+        context.active[goal] = 1
+        try:
+            for rule in rules:
+                premises = kb.premises[kb.offsets[rule]:kb.offsets[rule + 1]]
+                if all(self.bc_recursive(premise, context) for premise in premises):
+                    if self.trace:
+                        self.trace.emit('rule-fired', head=kb.symbols[goal], premises=kb.rule(rule)[1])
+                    self.prove(goal, context)
                     return True
+        finally:
+            context.active[goal] = 0
 
         return False
+
+    def prove(self, goal, context):
+        """
+        Record a proved goal in the order of inference.
+
+        Args:
+            goal (int): The id of the proved goal.
+            context (SolverContext): The state of the query.
+        """
+        if not context.proved[goal]:
+            context.proved[goal] = 1
+            context.inferred.append(self.kb.symbols[goal])
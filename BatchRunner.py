@@ -0,0 +1,266 @@
+import os
+import sys
+import glob
+import json
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # not available on Windows; the hard memory limit is then not applied
+    resource = None
+
+from FileReader import FileReader
+from Budget import Budget
+import InferenceEngine
+from InferenceEngine import option, number
+
+CNF_OPTIONS = ['debug', 'tracer', 'heuristic', 'symmetry', 'local_search', 'certificate']  # run options run_cnf accepts
+
+def solve_job(path, method, timeout, memory, options):
+    """
+    Solves one (file, method) job.
+
+    Args:
+        path (str): The TELL/ASK problem file, or a DIMACS file read as KB ∧ ¬query.
+        method (str): The inference method.
+        timeout (float): Per-job time limit in seconds. Optional.
+        memory (float): Per-job memory limit in MB. Optional.
+        options (dict): Extra keyword arguments for InferenceEngine.run; DIMACS jobs get
+            those of them that InferenceEngine.run_cnf accepts (CNF_OPTIONS).
+
+    Returns:
+        dict: The answer, time and stats of the job.
+    """
+    start = time.perf_counter()
+    try:
+        budget = Budget(time_limit=timeout, memory_limit=memory) if timeout or memory else None
+        if FileReader.is_dimacs(path):
+            cnf = FileReader.read_dimacs(path)
+            cnf_options = {name: value for name, value in options.items() if name in CNF_OPTIONS}
+            answer, stats = InferenceEngine.run_cnf(method, cnf, budget=budget, **cnf_options)
+        else:
+            tell, ask = FileReader.read(path)
+            answer, stats = InferenceEngine.run(method, tell, ask, budget=budget, **options)
+    except MemoryError:
+        answer, stats = f"{Budget.UNKNOWN}: out of memory", {}
+    except Exception as e:
+        answer, stats = f"Error: {e}", {}
+    return {'answer': answer, 'time': round(time.perf_counter() - start, 6), 'stats': stats}
+
+def serve_jobs(conn, timeout, memory, options):
+    """
+    Runs jobs received over a pipe in a reusable worker process until it receives None.
+
+    After each job the worker sends back (result, retire). It retires, and exits, once its
+    peak memory has passed half the memory limit, since the peak of one job would
+    otherwise count against the budgets of the jobs after it.
+
+    Args:
+        conn (Connection): Pipe end receiving (path, method) jobs and sending results back.
+        timeout (float): Per-job time limit in seconds. Optional.
+        memory (float): Per-job memory limit in MB. Optional.
+        options (dict): Extra keyword arguments for InferenceEngine.run.
+    """
+    if memory is not None and resource is not None:
+        limit = int(memory * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        result = solve_job(*job, timeout, memory, options)
+        retire = memory is not None and resource is not None and Budget.memory() > memory / 2
+        conn.send((result, retire))
+        if retire:
+            break
+    conn.close()
+
+class BatchRunner:
+    """
+    Runs inference methods over many problem files in parallel and streams the results as JSONL.
+
+    Jobs run in a bounded pool of reusable worker processes, so jobs are isolated from the
+    runner's memory and a job that overruns its timeout is killed, together with its worker,
+    without holding up the rest of the batch. Killed, crashed and retired workers are replaced,
+    so the pool never holds more than `jobs` processes. Results already present in the output
+    file are skipped, so an interrupted run can be resumed.
+    """
+
+    def __init__(self, methods, jobs=None, timeout=None, memory=None, grace=1.0, options=None):
+        """
+        Initializes the runner.
+
+        Args:
+            methods (list of str): Inference methods to run on every file.
+            jobs (int): Number of concurrent worker processes. Defaults to the number of cores.
+            timeout (float): Per-job time limit in seconds. Optional.
+            memory (float): Per-job memory limit in MB. Optional.
+            grace (float): Seconds past the timeout before a worker that ignores its budget is killed.
+            options (dict): Extra keyword arguments for InferenceEngine.run. Optional.
+        """
+        unknown = [method for method in methods if method not in InferenceEngine.METHODS]
+        if unknown:
+            raise ValueError(f"Unknown methods: {', '.join(unknown)}")
+        self.methods = list(methods)
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.memory = memory
+        self.grace = grace
+        self.options = options or {}
+
+    @staticmethod
+    def files(pattern):
+        """
+        Lists the problem files of a directory or glob pattern.
+
+        Args:
+            pattern (str): A directory, or a glob such as 'tests/*.txt'.
+
+        Returns:
+            list of str: The matching files, sorted.
+        """
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*')
+        return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+    @staticmethod
+    def completed(output):
+        """
+        Reads the jobs already recorded in an output file.
+
+        Args:
+            output (str): The JSONL results file.
+
+        Returns:
+            set: (file, method) pairs with a result.
+        """
+        done = set()
+        if output and os.path.exists(output):
+            with open(output) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short by an interrupted run
+                    done.add((record['file'], record['method']))
+        return done
+
+    def run(self, paths, output=None):
+        """
+        Runs every method on every file, writing one JSON line per finished job.
+
+        Args:
+            paths (list of str): The problem files.
+            output (str): JSONL file to append results to; stdout if omitted.
+
+        Returns:
+            int: The number of jobs run.
+        """
+        done = self.completed(output)
+        pending = [(path, method) for path in paths for method in self.methods if (path, method) not in done]
+        pending.reverse()
+        out = open(output, 'a') if output else sys.stdout
+        context = multiprocessing.get_context()
+        idle = []
+        busy = {}
+        count = 0
+        try:
+            while pending or busy:
+                while pending and len(busy) < self.jobs:
+                    conn, process = idle.pop() if idle else self.start_worker(context)
+                    path, method = pending.pop()
+                    conn.send((path, method))
+                    busy[conn] = (path, method, process, time.perf_counter())
+
+                for conn in wait(list(busy), timeout=0.05):
+                    path, method, process, start = busy.pop(conn)
+                    try:
+                        result, retire = conn.recv()
+                    except EOFError:
+                        process.join()
+                        result = {'answer': f"Error: worker exited with code {process.exitcode}",
+                                  'time': round(time.perf_counter() - start, 6), 'stats': {}}
+                        retire = True
+                    if retire:
+                        conn.close()
+                        process.join()
+                    else:
+                        idle.append((conn, process))
+                    self.write(out, path, method, result)
+                    count += 1
+
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    for conn, (path, method, process, start) in list(busy.items()):
+                        if now - start > self.timeout + self.grace:
+                            process.kill()
+                            process.join()
+                            conn.close()
+                            del busy[conn]
+                            self.write(out, path, method, {'answer': f"{Budget.UNKNOWN}: killed after {self.timeout}s",
+                                                           'time': round(now - start, 6), 'stats': {}})
+                            count += 1
+        finally:
+            for conn, process in idle:
+                try:
+                    conn.send(None)
+                except OSError:
+                    pass  # the worker is already gone
+                conn.close()
+                process.join()
+            for conn, (_, _, process, _) in busy.items():
+                process.kill()
+                conn.close()
+            if output:
+                out.close()
+        return count
+
+    def start_worker(self, context):
+        """
+        Starts a worker process serving jobs.
+
+        Args:
+            context (multiprocessing.context.BaseContext): The multiprocessing context.
+
+        Returns:
+            tuple: (conn, process), the runner's end of the job pipe and the worker process.
+        """
+        conn, worker_conn = context.Pipe()
+        process = context.Process(target=serve_jobs, daemon=True,
+                                  args=(worker_conn, self.timeout, self.memory, self.options))
+        process.start()
+        worker_conn.close()
+        return conn, process
+
+    @staticmethod
+    def write(out, path, method, result):
+        """
+        Writes one job result as a JSON line and flushes it.
+
+        Args:
+            out (file): The output stream.
+            path (str): The problem file.
+            method (str): The inference method.
+            result (dict): The answer, time and stats of the job.
+        """
+        record = {'file': path, 'method': method}
+        record.update(result)
+        out.write(json.dumps(record, default=str) + "\n")
+        out.flush()
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Enter command in the following format: python BatchRunner.py directory|glob [--methods=TT,DPLL] [--jobs=N] [--timeout=SECONDS] [--memory=MB] [--output=results.jsonl] [--heuristic=JW] [--order=APPEARANCE] [--symmetry]")
+        print("Methods: " + ", ".join(InferenceEngine.METHODS))
+        exit(0)
+
+    runner = BatchRunner(option("methods", "AUTO", start=2).split(","),
+                         jobs=number("jobs", start=2) or None,
+                         timeout=number("timeout", float, start=2),
+                         memory=number("memory", float, start=2),
+                         options={'heuristic': option("heuristic", "JW", start=2),
+                                  'order': option("order", "APPEARANCE", start=2),
+                                  'symmetry': "--symmetry" in sys.argv})
+    runner.run(BatchRunner.files(sys.argv[1]), option("output", start=2))
@@ -0,0 +1,131 @@
+class BitForwardChaining:
+    """
+    Forward chaining over bit-packed rule sets, for Horn knowledge bases with very many rules.
+
+    The rules x symbols premise matrix is stored as a blocked sparse bit matrix: rules are
+    split into blocks of BLOCK rules, and for every symbol and block holding a rule with
+    that premise, a Python integer has bit r set for each such rule r of the block. A set
+    operation over a whole block is then one big-integer operation done in C.
+
+    The number of premises each rule still waits for is stored bit-sliced: plane b of a
+    block holds bit b of the count of every rule in the block. When a symbol becomes
+    known, the counts of all its rules in a block are decremented at once by a borrow
+    ripple through the planes. The rules ready to fire are those whose count is zero in
+    every plane. Inference runs in semi-naive rounds. Each round fires every ready rule
+    together and decrements the counts only for the symbols that round added. The next
+    round only re-examines the blocks whose counts changed. Once a symbol is known, every
+    rule concluding it is dropped with one mask operation per block, so the interpreted
+    work per round is proportional to the new symbols rather than to the ready rules.
+    """
+
+    BLOCK = 1 << 12
+
+    def __init__(self, knowledge_base, tracer=None, budget=None):
+        """
+        Builds the premise and head masks and the count planes of a Horn-form knowledge base.
+
+        Args:
+            knowledge_base (KnowledgeBase): The Horn-form knowledge base.
+            tracer (Tracer): Receives round and rule-fired events. Optional.
+            budget (Budget): Limits time and memory. Optional.
+        """
+        self.kb = knowledge_base
+        self.trace = tracer
+        self.budget = budget
+        self.stats = {}
+
+        kb = self.kb
+        blocks = -(-kb.num_rules // self.BLOCK)
+        self.by_premise = [{} for _ in kb.symbols]
+        self.by_head = [{} for _ in kb.symbols]
+        self.planes = [[] for _ in range(blocks)]
+        for rule in range(kb.num_rules):
+            block, bit = divmod(rule, self.BLOCK)
+            bit = 1 << bit
+            for premise in kb.premises[kb.offsets[rule]:kb.offsets[rule + 1]]:
+                masks = self.by_premise[premise]
+                masks[block] = masks.get(block, 0) | bit
+            masks = self.by_head[kb.heads[rule]]
+            masks[block] = masks.get(block, 0) | bit
+            planes = self.planes[block]
+            count = kb.offsets[rule + 1] - kb.offsets[rule]
+            plane = 0
+            while count:
+                if plane == len(planes):
+                    planes.append(0)
+                if count & 1:
+                    planes[plane] |= bit
+                count >>= 1
+                plane += 1
+        self.full = [(1 << min(self.BLOCK, kb.num_rules - block * self.BLOCK)) - 1 for block in range(blocks)]
+
+    def solve(self, query):
+        """
+        Infers symbols round by round until the query is known or no rule can fire.
+
+        Args:
+            query (str): The query symbol to be inferred.
+
+        Returns:
+            str: "YES: [inferred symbols]" if the query is entailed, otherwise "NO". The
+            symbols are listed by round and, within a round, in the order of the rules
+            that produced them.
+        """
+        kb = self.kb
+        heads = kb.heads
+        planes = [list(block) for block in self.planes]
+        pending = list(self.full)
+        known = bytearray(len(kb.symbols))
+        inferred = []
+        target = kb.ids.get(query)
+        dirty = range(len(planes))
+        self.stats = {'rounds': 0, 'fired': 0}
+
+        while True:
+            if self.budget:
+                self.budget.check()
+            delta = []
+            for block in sorted(dirty):
+                waiting = 0
+                for plane in planes[block]:
+                    waiting |= plane
+                fired = pending[block] & ~waiting
+                base = block * self.BLOCK
+                while fired:
+                    low = fired & -fired
+                    rule = base + low.bit_length() - 1
+                    self.stats['fired'] += 1
+                    head = heads[rule]
+                    if self.trace:
+                        self.trace.emit('rule-fired', head=kb.symbols[head], premises=kb.rule(rule)[1])
+                    known[head] = 1
+                    delta.append(head)
+                    for other, mask in self.by_head[head].items():
+                        pending[other] &= ~mask
+                    fired &= pending[block]
+            if not delta:
+                return "NO"
+            self.stats['rounds'] += 1
+            inferred.extend(kb.symbols[head] for head in delta)
+            if self.trace:
+                self.trace.emit('round', round=self.stats['rounds'], inferred=[kb.symbols[head] for head in delta])
+            if target is not None and known[target]:
+                return "YES: " + ", ".join(inferred)
+
+            dirty = set()
+            for head in delta:
+                for block, borrow in self.by_premise[head].items():
+                    dirty.add(block)
+                    block_planes = planes[block]
+                    for index, plane in enumerate(block_planes):
+                        block_planes[index] = plane ^ borrow
+                        borrow &= ~plane
+                        if not borrow:
+                            break
+
+if __name__ == "__main__":
+    from KnowledgeBase import KnowledgeBase
+
+    tell = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+    kb = KnowledgeBase(tell, 'HF')
+    print(BitForwardChaining(kb).solve("d"))
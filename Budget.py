@@ -0,0 +1,116 @@
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows; the memory cap is then not enforced
+    resource = None
+
+class BudgetExceeded(Exception):
+    """
+    Raised inside an engine when its budget runs out. The answer is then UNKNOWN.
+
+    Attributes:
+        reason (str): Which limit was hit.
+        stats (dict): Partial statistics of the interrupted run.
+    """
+
+    def __init__(self, reason, stats):
+        super().__init__(reason)
+        self.reason = reason
+        self.stats = stats
+
+class Budget:
+    """
+    Resource limits shared by the inference engines, checked cooperatively in their hot loops.
+
+    A budget combines a wall-clock deadline, counters such as clauses, models, decisions or
+    nodes, and a soft cap on the peak resident memory of the process. Engines call `check`
+    once per unit of work; when a limit is exceeded, or `cancel` was called from another
+    thread, `check` raises BudgetExceeded carrying the counters reached so far.
+    """
+
+    UNKNOWN = "UNKNOWN"
+
+    def __init__(self, time_limit=None, memory_limit=None, interval=1024, **limits):
+        """
+        Initializes the budget; the deadline starts counting immediately.
+
+        Args:
+            time_limit (float): Wall-clock limit in seconds. Optional.
+            memory_limit (float): Soft cap on peak resident memory in MB. Optional.
+            interval (int): Number of checks between two memory measurements.
+            **limits (int): Counter limits, e.g. clauses=10000, models=1000000, decisions=5000.
+        """
+        self.start = time.perf_counter()
+        self.deadline = self.start + time_limit if time_limit is not None else None
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.interval = interval
+        self.limits = {name: limit for name, limit in limits.items() if limit is not None}
+        self.used = {}
+        self.checks = 0
+        self.cancelled = False
+
+    def cancel(self):
+        """
+        Requests cancellation; the engine stops at its next check.
+        """
+        self.cancelled = True
+
+    def check(self, counter=None, used=0):
+        """
+        Records progress and raises BudgetExceeded if any limit is exceeded.
+
+        Args:
+            counter (str): Name of the counter being advanced, e.g. 'decisions'. Optional.
+            used (int): Current value of that counter.
+
+        Raises:
+            BudgetExceeded: If a limit is exceeded or the budget was cancelled.
+        """
+        self.checks += 1
+        if counter is not None:
+            self.used[counter] = used
+            limit = self.limits.get(counter)
+            if limit is not None and used > limit:
+                self.exceeded(f"{counter} limit of {limit} exceeded")
+        if self.cancelled:
+            self.exceeded("cancelled")
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.exceeded(f"time limit of {self.time_limit}s exceeded")
+        if self.memory_limit is not None and resource is not None and self.checks % self.interval == 0:
+            if self.memory() > self.memory_limit:
+                self.exceeded(f"memory limit of {self.memory_limit}MB exceeded")
+
+    @staticmethod
+    def memory():
+        """
+        Returns the peak resident memory of the process.
+
+        Returns:
+            float: Peak resident set size in MB.
+        """
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        unit = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+
+    def stats(self):
+        """
+        Returns the progress recorded so far.
+
+        Returns:
+            dict: Elapsed seconds, number of checks and the last value of every counter.
+        """
+        stats = {'elapsed': round(time.perf_counter() - self.start, 6), 'checks': self.checks}
+        stats.update(self.used)
+        return stats
+
+    def exceeded(self, reason):
+        """
+        Raises BudgetExceeded with the partial statistics.
+
+        Args:
+            reason (str): Which limit was hit.
+        """
+        raise BudgetExceeded(reason, self.stats())
@@ -0,0 +1,168 @@
+import sympy
+from sympy.logic.boolalg import to_cnf, Not, And, Or, BooleanTrue, BooleanFalse
+
+class CNF:
+    """
+    Integer clause store used by the search based engines.
+
+    Symbols are interned to ids 1..n in order of first appearance in the knowledge base,
+    then the query, so every symbol has an id even if its sentences simplify away.
+    Literals are encoded DIMACS style as +id / -id. Clauses are stored as tuples of
+    literals with duplicates removed; tautologies are dropped when they are added.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty clause store.
+        """
+        self.symbols = []
+        self.ids = {}
+        self.clauses = []
+
+    @classmethod
+    def from_kb(cls, kb, query=None):
+        """
+        Builds the clause set of KB ∧ ¬query.
+
+        Args:
+            kb (KnowledgeBase): A knowledge base of general sentences.
+            query (Sentence): The query sentence, negated before it is added. Optional.
+
+        Returns:
+            CNF: The clause store.
+        """
+        cnf = cls()
+        for symbol in kb.symbols:
+            cnf.intern(symbol)
+        if query is not None:
+            for symbol in query.symbols:
+                cnf.intern(symbol)
+        for sentence in kb.sentences:
+            cnf.add_expr(to_cnf(sentence.to_sympy_expr(sentence.root[0])))
+        if query is not None:
+            cnf.add_expr(to_cnf(Not(query.to_sympy_expr(query.root[0]))))
+        return cnf
+
+    @property
+    def num_vars(self):
+        """int: The number of interned symbols."""
+        return len(self.symbols)
+
+    def intern(self, name):
+        """
+        Returns the id of a symbol, assigning the next free id to unseen symbols.
+
+        Args:
+            name (str): The symbol name.
+
+        Returns:
+            int: The symbol id.
+        """
+        var = self.ids.get(name)
+        if var is None:
+            self.symbols.append(name)
+            var = len(self.symbols)
+            self.ids[name] = var
+        return var
+
+    def add_expr(self, expr):
+        """
+        Adds the clauses of a SymPy expression that is already in CNF.
+
+        Args:
+            expr (sympy.Expr): The CNF expression.
+        """
+        if isinstance(expr, BooleanTrue):
+            return
+        if isinstance(expr, BooleanFalse):
+            self.clauses.append(())
+            return
+        conjuncts = expr.args if isinstance(expr, And) else (expr,)
+        for clause in conjuncts:
+            disjuncts = clause.args if isinstance(clause, Or) else (clause,)
+            self.add_clause([self.__literal(literal) for literal in disjuncts])
+
+    def __literal(self, literal):
+        """
+        Converts a SymPy literal to its integer encoding.
+
+        Args:
+            literal (sympy.Expr): A symbol or a negated symbol.
+
+        Returns:
+            int: The encoded literal.
+        """
+        if isinstance(literal, Not):
+            return -self.intern(literal.args[0].name)
+        if isinstance(literal, sympy.Symbol):
+            return self.intern(literal.name)
+        raise ValueError(f"Expression is not in CNF: {literal}")
+
+    def add_clause(self, literals):
+        """
+        Adds a clause given as integer literals.
+
+        Args:
+            literals (iterable of int): The literals of the clause.
+
+        Returns:
+            bool: False if the clause was a tautology and skipped, True otherwise.
+        """
+        clause = tuple(dict.fromkeys(literals))
+        seen = set(clause)
+        if any(-literal in seen for literal in clause):
+            return False
+        self.clauses.append(clause)
+        return True
+
+    def assume(self, literals):
+        """
+        Returns a copy of the clause store with extra unit clauses.
+
+        The copy shares the symbol table, so it must not intern new symbols.
+
+        Args:
+            literals (iterable of int): The literals assumed true.
+
+        Returns:
+            CNF: The clauses plus one unit clause per literal.
+
+        Raises:
+            ValueError: If a literal names a symbol outside the store.
+        """
+        literals = list(literals)
+        for literal in literals:
+            if not 0 < abs(literal) <= self.num_vars:
+                raise ValueError(f"Literal {literal} is not a symbol of the clause store")
+        cnf = CNF()
+        cnf.symbols = self.symbols
+        cnf.ids = self.ids
+        cnf.clauses = self.clauses + [(literal,) for literal in literals]
+        return cnf
+
+    def literal_name(self, literal):
+        """
+        Formats an integer literal with its symbol name.
+
+        Args:
+            literal (int): The encoded literal.
+
+        Returns:
+            str: The literal as text, e.g. '~a'.
+        """
+        name = self.symbols[abs(literal) - 1]
+        return name if literal > 0 else '~' + name
+
+    def clause_str(self, clause):
+        """
+        Formats a clause with symbol names.
+
+        Args:
+            clause (tuple of int): The clause.
+
+        Returns:
+            str: The clause as text, e.g. 'a || ~b'.
+        """
+        if not clause:
+            return '∅'
+        return ' || '.join(self.literal_name(literal) for literal in clause)
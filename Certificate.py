@@ -0,0 +1,246 @@
+class Certificate:
+    """
+    Binary proof and model certificates, written as a stream while an engine runs.
+
+    A certificate starts with a magic line and the symbol table, so it can be checked
+    against the original knowledge base by symbol name. Then come records, each a tag
+    byte followed by unsigned LEB128 varints. Literals are encoded as in binary DRAT:
+    2 * symbol + 1 for a negative literal, 2 * symbol for a positive one, with 0 ending a list.
+
+    - i: an input clause of KB ∧ ¬query (literals).
+    - r: the resolvent of two earlier clauses (left id, right id).
+    - u: a lemma derived by unit propagation (literals, then hint ids). Propagating the
+      hint clauses in order, after making the lemma false, must end in a falsified clause.
+    - m: a model of KB ∧ ¬query (the true literals of every symbol).
+
+    Input clauses, resolvents and lemmas are numbered 1, 2, ... in the order they are
+    written. A YES certificate derives the empty clause; a NO certificate holds a model.
+    """
+
+    MAGIC = b'IECERT1\n'
+    BUFFER = 1 << 16
+
+    def __init__(self, path):
+        """
+        Opens a certificate file for writing.
+
+        Args:
+            path (str): The certificate file.
+        """
+        self.path = path
+        self.file = open(path, 'wb')
+        self.data = bytearray(self.MAGIC)
+        self.count = 0
+        self.stats = {'inputs': 0, 'resolvents': 0, 'lemmas': 0, 'models': 0}
+
+    def header(self, symbols):
+        """
+        Writes the symbol table. Symbol i (1-based) of the table is literal i of the records.
+
+        Args:
+            symbols (list of str): The symbol names.
+        """
+        self.varint(len(symbols))
+        for name in symbols:
+            name = name.encode()
+            self.varint(len(name))
+            self.data += name
+
+    def input(self, clause):
+        """
+        Writes an input clause.
+
+        Args:
+            clause (iterable of int): The DIMACS literals.
+
+        Returns:
+            int: The clause id.
+        """
+        self.data += b'i'
+        self.literals(clause)
+        self.stats['inputs'] += 1
+        return self.next()
+
+    def resolvent(self, left, right):
+        """
+        Writes a resolution step; the checker finds the pivot and recomputes the resolvent.
+
+        Args:
+            left (int): The id of the first parent clause.
+            right (int): The id of the second parent clause.
+
+        Returns:
+            int: The resolvent id.
+        """
+        self.data += b'r'
+        self.varint(left)
+        self.varint(right)
+        self.stats['resolvents'] += 1
+        return self.next()
+
+    def lemma(self, clause, hints):
+        """
+        Writes a lemma with the clauses that refute its negation by unit propagation.
+
+        Args:
+            clause (iterable of int): The DIMACS literals.
+            hints (list of int): Clause ids, each unit in turn, the last one falsified.
+
+        Returns:
+            int: The lemma id.
+        """
+        self.data += b'u'
+        self.literals(clause)
+        for hint in hints:
+            self.varint(hint)
+        self.data.append(0)
+        self.stats['lemmas'] += 1
+        return self.next()
+
+    def model(self, literals):
+        """
+        Writes a model.
+
+        Args:
+            literals (iterable of int): The true literal of every symbol.
+        """
+        self.data += b'm'
+        self.literals(literals)
+        self.stats['models'] += 1
+        self.flush()
+
+    def literals(self, literals):
+        """
+        Appends a zero-terminated literal list.
+
+        Args:
+            literals (iterable of int): The DIMACS literals.
+        """
+        for literal in literals:
+            self.varint(2 * literal if literal > 0 else 1 - 2 * literal)
+        self.data.append(0)
+
+    def varint(self, value):
+        """
+        Appends an unsigned LEB128 integer.
+
+        Args:
+            value (int): A non-negative integer.
+        """
+        while value > 0x7f:
+            self.data.append(value & 0x7f | 0x80)
+            value >>= 7
+        self.data.append(value)
+
+    def next(self):
+        """
+        Numbers the clause record just written and writes the buffer out when it is full.
+
+        Returns:
+            int: The id of the record.
+        """
+        self.count += 1
+        if len(self.data) >= self.BUFFER:
+            self.flush()
+        return self.count
+
+    def flush(self):
+        """
+        Writes the buffered records to the file.
+        """
+        self.file.write(self.data)
+        self.data = bytearray()
+
+    def close(self):
+        """
+        Writes the remaining records and closes the file.
+        """
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+    @classmethod
+    def read(cls, path):
+        """
+        Reads a certificate.
+
+        Args:
+            path (str): The certificate file.
+
+        Returns:
+            tuple: (symbols, records) where records yields (tag, literals, ids) with tag one
+            of 'i', 'r', 'u', 'm'; literals is a tuple of DIMACS literals and ids a tuple of clause ids.
+
+        Raises:
+            ValueError: If the file is not a certificate or is truncated.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(cls.MAGIC):
+            raise ValueError("Not a certificate file.")
+        position = len(cls.MAGIC)
+
+        def varint():
+            nonlocal position
+            value = shift = 0
+            while True:
+                if position >= len(data):
+                    raise ValueError("Truncated certificate.")
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7f) << shift
+                if byte < 0x80:
+                    return value
+                shift += 7
+
+        def literals():
+            result = []
+            code = varint()
+            while code:
+                result.append(-(code >> 1) if code & 1 else code >> 1)
+                code = varint()
+            return tuple(result)
+
+        symbols = []
+        for _ in range(varint()):
+            length = varint()
+            symbols.append(data[position:position + length].decode())
+            position += length
+
+        def records():
+            nonlocal position
+            while position < len(data):
+                tag = chr(data[position])
+                position += 1
+                if tag in 'im':
+                    yield tag, literals(), ()
+                elif tag == 'r':
+                    yield tag, (), (varint(), varint())
+                elif tag == 'u':
+                    clause, hints = literals(), []
+                    hint = varint()
+                    while hint:
+                        hints.append(hint)
+                        hint = varint()
+                    yield tag, clause, tuple(hints)
+                else:
+                    raise ValueError(f"Unknown certificate record: {tag!r}")
+
+        return symbols, records()
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), "example.cert")
+    certificate = Certificate(path)
+    certificate.header(["a", "b"])
+    left = certificate.input([1])
+    right = certificate.input([-1, 2])
+    unit = certificate.input([-2])
+    middle = certificate.resolvent(left, right)
+    certificate.lemma([], [middle, unit])
+    certificate.close()
+    symbols, records = Certificate.read(path)
+    print(symbols, list(records))
@@ -0,0 +1,314 @@
+import sys
+from collections import Counter
+from itertools import product
+from FileReader import FileReader
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from Certificate import Certificate
+
+class CertificateChecker:
+    """
+    Independent checker for the certificates written by the RP, DPLL and LS engines.
+
+    The checker rebuilds KB ∧ ¬query from the original problem file and reads the
+    certificate once, front to back:
+
+    - every input clause must be implied by a KB sentence or by ¬query, compared by symbol
+      name. The checker converts the parsed sentences to clauses itself rather than through
+      the SymPy conversion of the engines, so a fault there cannot vouch for its own output.
+      An input clause is accepted if it contains a clause of that conversion, looked up in
+      an index on each clause's rarest literal; otherwise, for instance when SymPy
+      simplified a sentence further, if some sentence is false under every assignment that
+      falsifies the clause, which is checked by enumerating the assignments of that
+      sentence's other symbols, for sentences with at most ENUMERATION_LIMIT of them;
+    - every resolvent is recomputed from its two parents, which must clash on exactly one symbol;
+    - every lemma is checked by propagating its hint clauses only, each of which must be
+      unit or, for the last one, falsified once the lemma is made false;
+    - a model must satisfy every KB sentence and falsify the query (for a DIMACS file,
+      satisfy every clause).
+
+    Each record is checked in time linear in its size and in the size of the clauses it
+    references, so checking takes time linear in the size of the certificate plus the KB,
+    except for input clauses that need the enumeration fallback. A certificate that ends
+    without a conclusion, as written by an engine that stopped with UNKNOWN, or an input
+    clause that only a sentence too large to enumerate could imply, gives UNKNOWN.
+    """
+
+    ENUMERATION_LIMIT = 16  # most symbols of one sentence enumerated to check an input clause
+
+    def __init__(self, filename):
+        """
+        Loads the problem a certificate is checked against.
+
+        Args:
+            filename (str): The TELL/ASK problem file, or a DIMACS file read as KB ∧ ¬query.
+        """
+        if FileReader.is_dimacs(filename):
+            self.kb = self.query = None
+            self.cnf = FileReader.read_dimacs(filename)
+            self.inputs = {self.named(clause, self.cnf.symbols) for clause in self.cnf.clauses}
+        else:
+            tell, ask = FileReader.read(filename)
+            self.kb = KnowledgeBase(tell, 'GS')
+            self.query = Sentence(ask)
+            self.cnf = None
+            self.sentences = [(sentence, True) for sentence in self.kb.sentences] + [(self.query, False)]
+            self.inputs = {clause for sentence, value in self.sentences for clause in self.clauses(sentence, value)}
+        self.index = self.subsumption_index(self.inputs)
+
+    @staticmethod
+    def subsumption_index(clauses):
+        """
+        Indexes clauses by their least frequent literal, so that the clauses contained in a
+        given clause are found among those indexed by one of its own literals.
+
+        Args:
+            clauses (set of frozenset): The clauses.
+
+        Returns:
+            dict: Lists of clauses by their indexed literal; the empty clause under None.
+        """
+        counts = Counter(literal for clause in clauses for literal in clause)
+        index = {}
+        for clause in clauses:
+            index.setdefault(min(clause, key=counts.__getitem__, default=None), []).append(clause)
+        return index
+
+    @classmethod
+    def clauses(cls, sentence, value=True):
+        """
+        Converts a parsed sentence, or its negation, to clauses without SymPy.
+
+        Implications and equivalences are expanded, negations are pushed to the symbols and
+        disjunctions are distributed over conjunctions. Tautologies are dropped. Every
+        subformula is only converted in the polarities it occurs in.
+
+        Args:
+            sentence (Sentence): The parsed sentence.
+            value (bool): False to convert the negation of the sentence.
+
+        Returns:
+            list of frozenset: The clauses as sets of (symbol name, sign) pairs.
+        """
+        def distribute(left, right):
+            clauses = (a | b for a in left for b in right)
+            return [clause for clause in clauses if not any((name, not sign) in clause for name, sign in clause)]
+
+        done = {}
+        stack = [(sentence.root[0], value, False)]
+        while stack:
+            key, positive, expanded = stack.pop()
+            if (key, positive) in done:
+                continue
+            components = sentence.atomic.get(key)
+            if components is None:
+                done[key, positive] = [frozenset([(key.strip(), positive)])]
+                continue
+            if len(components) == 2:
+                needed = [(components[1], not positive)]
+            elif components[1] == '<=>':
+                needed = [(operand, sign) for operand in (components[0], components[2]) for sign in (True, False)]
+            else:
+                left = positive if components[1] != '=>' else not positive
+                needed = [(components[0], left), (components[2], positive)]
+            if not expanded:
+                stack.append((key, positive, True))
+                stack.extend((operand, sign, False) for operand, sign in needed)
+                continue
+            if len(components) == 2:
+                clauses = done[needed[0]]
+            elif components[1] == '<=>':
+                (lp, ln), (rp, rn) = (done[needed[0]], done[needed[1]]), (done[needed[2]], done[needed[3]])
+                clauses = distribute(ln, rp) + distribute(lp, rn) if positive else distribute(lp, rp) + distribute(ln, rn)
+            else:
+                left, right = done[needed[0]], done[needed[1]]
+                # a conjunction when true, a disjunction when false, and the reverse for || and =>
+                conjunction = (components[1] == '&') == positive
+                clauses = left + right if conjunction else distribute(left, right)
+            done[key, positive] = list(dict.fromkeys(clauses))
+        return done[sentence.root[0], value]
+
+    def implied(self, clause):
+        """
+        Checks that a named clause is implied by the problem.
+
+        Args:
+            clause (frozenset): (symbol name, sign) pairs.
+
+        Returns:
+            bool or None: True if the clause contains an input clause, or is implied by one KB
+            sentence or by ¬query alone; None if it is not, but a sentence with more than
+            ENUMERATION_LIMIT other symbols was not enumerated; False otherwise.
+        """
+        if clause in self.inputs:
+            return True
+        for literal in [None, *clause]:
+            if any(input_clause <= clause for input_clause in self.index.get(literal, ())):
+                return True
+        if self.kb is None:
+            return False
+        if any((name, not sign) in clause for name, sign in clause):
+            return True
+        falsified = {name: not sign for name, sign in clause}
+        undecided = False
+        for sentence, value in self.sentences:
+            free = sorted(set(sentence.symbols) - set(falsified))
+            if len(free) > self.ENUMERATION_LIMIT:
+                undecided = True
+                continue
+            model = {symbol: falsified[symbol] for symbol in sentence.symbols if symbol in falsified}
+            for values in product([True, False], repeat=len(free)):
+                model.update(zip(free, values))
+                if sentence.solve(model) == value:
+                    break
+            else:
+                return True
+        return None if undecided else False
+
+    @staticmethod
+    def named(clause, symbols):
+        """
+        Converts a clause to a set of (symbol name, sign) pairs.
+
+        Args:
+            clause (tuple of int): The DIMACS literals.
+            symbols (list of str): The symbol table the literals refer to.
+
+        Returns:
+            frozenset: The named literals.
+        """
+        return frozenset((symbols[abs(literal) - 1], literal > 0) for literal in clause)
+
+    def check(self, path):
+        """
+        Checks a certificate.
+
+        Args:
+            path (str): The certificate file.
+
+        Returns:
+            tuple: (answer, reason) where answer is "YES" for a valid refutation, "NO" for a
+            valid countermodel, "UNKNOWN" if the certificate proves neither, or could not be
+            checked within ENUMERATION_LIMIT, or "INVALID", and reason describes the outcome.
+        """
+        try:
+            symbols, records = Certificate.read(path)
+            clauses = [None]  # clause literals by id
+            for tag, literals, ids in records:
+                if any(literal == 0 or abs(literal) > len(symbols) for literal in literals):
+                    return "INVALID", f"record {len(clauses)} uses an unknown symbol"
+                if any(not 0 < clause_id < len(clauses) for clause_id in ids):
+                    return "INVALID", f"record {len(clauses)} refers to a clause not defined before it"
+
+                if tag == 'm':
+                    return self.check_model(literals, symbols)
+                if tag == 'i':
+                    implied = self.implied(self.named(literals, symbols))
+                    if implied is None:
+                        return "UNKNOWN", (f"input clause {len(clauses)} is only implied, if at all, by a sentence "
+                                           f"with more than {self.ENUMERATION_LIMIT} other symbols")
+                    if not implied:
+                        return "INVALID", f"input clause {len(clauses)} is not implied by KB ∧ ¬query"
+                    clause = literals
+                elif tag == 'r':
+                    clause = self.resolve(clauses[ids[0]], clauses[ids[1]])
+                    if clause is None:
+                        return "INVALID", f"clauses {ids[0]} and {ids[1]} do not clash on exactly one symbol"
+                else:
+                    if not self.propagates(literals, ids, clauses):
+                        return "INVALID", f"the hints of lemma {len(clauses)} do not refute its negation"
+                    clause = literals
+                if not clause:
+                    return "YES", f"empty clause derived by record {len(clauses)}"
+                clauses.append(clause)
+        except ValueError as e:
+            return "INVALID", str(e)
+        return "UNKNOWN", "the certificate ends with neither an empty clause nor a model"
+
+    @staticmethod
+    def resolve(left, right):
+        """
+        Resolves two clauses on their only clashing symbol.
+
+        Args:
+            left (tuple of int): The first parent.
+            right (tuple of int): The second parent.
+
+        Returns:
+            tuple of int or None: The resolvent, or None unless exactly one symbol clashes.
+        """
+        others = set(right)
+        pivots = [literal for literal in left if -literal in others]
+        if len(pivots) != 1:
+            return None
+        pivot = pivots[0]
+        others.discard(-pivot)
+        others.update(literal for literal in left if literal != pivot)
+        return tuple(others)
+
+    @staticmethod
+    def propagates(lemma, hints, clauses):
+        """
+        Checks a lemma by unit propagation over its hint clauses.
+
+        Args:
+            lemma (tuple of int): The lemma literals.
+            hints (tuple of int): Clause ids.
+            clauses (list): Clause literals by id.
+
+        Returns:
+            bool: True if the last hint is falsified and every earlier one is unit.
+        """
+        true = {-literal for literal in lemma}
+        for hint in hints:
+            open_literals = [literal for literal in clauses[hint] if -literal not in true]
+            if any(literal in true for literal in open_literals):
+                return False
+            if not open_literals:
+                return True
+            if len(open_literals) > 1:
+                return False
+            true.add(open_literals[0])
+        return False
+
+    def check_model(self, literals, symbols):
+        """
+        Checks a countermodel against the original problem.
+
+        Args:
+            literals (tuple of int): The true literals.
+            symbols (list of str): The certificate symbol table.
+
+        Returns:
+            tuple: (answer, reason) as for check.
+        """
+        model = {}
+        for literal in literals:
+            name = symbols[abs(literal) - 1]
+            if model.setdefault(name, literal > 0) != (literal > 0):
+                return "INVALID", f"the model assigns {name} both values"
+        if self.kb is None:
+            for clause in self.cnf.clauses:
+                if not any(model.get(self.cnf.symbols[abs(literal) - 1], False) == (literal > 0) for literal in clause):
+                    return "INVALID", f"the model falsifies the clause {self.cnf.clause_str(clause)}"
+            return "NO", "the model satisfies every clause"
+        for symbol in self.kb.symbols + self.query.symbols:
+            model.setdefault(symbol, False)
+        for sentence in self.kb.sentences:
+            if not sentence.solve(model):
+                return "INVALID", f"the model falsifies the KB sentence {sentence.text}"
+        if self.query.solve(model):
+            return "INVALID", "the model satisfies the query"
+        return "NO", "the model satisfies the KB and falsifies the query"
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Enter command in the following format: python CertificateChecker.py problem.txt|problem.cnf proof.cert")
+        sys.exit(0)
+    try:
+        answer, reason = CertificateChecker(sys.argv[1]).check(sys.argv[2])
+    except FileNotFoundError:
+        print("File not found.")
+        sys.exit(1)
+    print(f"{answer}: {reason}")
+    sys.exit(0 if answer in ("YES", "NO") else 1)
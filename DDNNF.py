@@ -0,0 +1,447 @@
+import sys
+import hashlib
+from sympy.logic.boolalg import to_cnf
+from CNF import CNF
+
+class DDNNF:
+    """
+    Decision-DNNF circuit compiled from a knowledge base.
+
+    Nodes are stored bottom-up in a list, so every child has a smaller index than its
+    parent and a single forward pass evaluates the circuit:
+    - ('L', literal): a literal;
+    - ('A', children): a decomposable AND, whose children share no symbols;
+    - ('O', var, children): a deterministic decision OR on var, whose children disagree on it.
+    The circuit is also smooth: both children of a decision cover the same symbols and the
+    root covers every KB symbol (an unconstrained symbol x appears as x || ~x). Model
+    counting, conditioning and clausal entailment are therefore linear in the circuit size.
+    """
+
+    def __init__(self, symbols, kb_hash=None):
+        """
+        Initializes an empty circuit.
+
+        Args:
+            symbols (list of str): Symbol names; symbol i has id i + 1.
+            kb_hash (str): Hash of the compiled knowledge base, used to detect stale files. Optional.
+        """
+        self.symbols = list(symbols)
+        self.ids = {name: index + 1 for index, name in enumerate(self.symbols)}
+        self.kb_hash = kb_hash
+        self.nodes = []
+        self.unique = {}
+        self.root = None
+        self.stats = {}
+
+    @staticmethod
+    def hash_kb(kb):
+        """
+        Hashes the sentences of a knowledge base.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base.
+
+        Returns:
+            str: A hex digest identifying this version of the knowledge base.
+        """
+        return hashlib.sha1("\n".join(sentence.text for sentence in kb.sentences).encode()).hexdigest()
+
+    @classmethod
+    def compile(cls, kb, budget=None):
+        """
+        Compiles a knowledge base with a component caching, decision based search.
+
+        The search runs on an explicit stack (see run), so its depth is not limited by the
+        interpreter's recursion limit and no process-wide setting is changed.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base of general sentences.
+            budget (Budget): Limits time, memory and the number of decisions ('decisions'). Optional.
+
+        Returns:
+            DDNNF: The compiled circuit.
+        """
+        cnf = CNF.from_kb(kb)
+        circuit = cls(cnf.symbols, cls.hash_kb(kb))
+        circuit.cache = {}
+        circuit.budget = budget
+        circuit.stats = {'decisions': 0, 'cache_hits': 0}
+        clauses = [frozenset(clause) for clause in cnf.clauses]
+        scope = frozenset(range(1, cnf.num_vars + 1))
+        if frozenset() in clauses:  # a sentence simplified to False
+            circuit.root = circuit.false()
+        else:
+            circuit.root = circuit.run(circuit.compile_clauses(clauses, scope))
+        del circuit.cache
+        del circuit.budget
+        circuit.stats['nodes'] = len(circuit.nodes)
+        return circuit
+
+    def node(self, node):
+        """
+        Returns the index of a node, adding it unless an identical node exists.
+
+        Args:
+            node (tuple): The node.
+
+        Returns:
+            int: The node index.
+        """
+        index = self.unique.get(node)
+        if index is None:
+            index = len(self.nodes)
+            self.nodes.append(node)
+            self.unique[node] = index
+        return index
+
+    def true(self):
+        """Returns the constant true node, an empty AND."""
+        return self.node(('A', ()))
+
+    def false(self):
+        """Returns the constant false node, an empty OR."""
+        return self.node(('O', 0, ()))
+
+    def conjoin(self, children):
+        """
+        Returns an AND node, simplifying constant children.
+
+        Args:
+            children (list of int): The child nodes.
+
+        Returns:
+            int: The node index.
+        """
+        false = self.false()
+        if false in children:
+            return false
+        true = self.true()
+        children = tuple(child for child in children if child != true)
+        if len(children) == 1:
+            return children[0]
+        return self.node(('A', children))
+
+    def run(self, task):
+        """
+        Runs a compilation task on an explicit stack instead of the Python call stack.
+
+        A task is a generator that yields the sub-tasks it needs and receives their nodes;
+        its return value is its own node.
+
+        Args:
+            task (generator): A task made by compile_clauses or compile_component.
+
+        Returns:
+            int: The node index.
+        """
+        stack = [task]
+        value = None
+        while True:
+            try:
+                subtask = stack[-1].send(value)
+            except StopIteration as done:
+                stack.pop()
+                if not stack:
+                    return done.value
+                value = done.value
+            else:
+                stack.append(subtask)
+                value = None
+
+    def compile_clauses(self, clauses, scope):
+        """
+        Compiles a clause set into a node that is smooth over the given symbols.
+
+        Args:
+            clauses (list of frozenset): Clauses with no assigned literals.
+            scope (frozenset of int): The symbols the node must cover.
+
+        Returns:
+            generator: A task for run, returning the node index.
+        """
+        units = []
+        while True:
+            unit = next((clause for clause in clauses if len(clause) == 1), None)
+            if unit is None:
+                break
+            literal = next(iter(unit))
+            units.append(literal)
+            clauses = self.condition_clauses(clauses, literal)
+            if clauses is None:
+                return self.false()
+
+        occurring = set()
+        for clause in clauses:
+            occurring.update(abs(literal) for literal in clause)
+        assigned = {abs(literal) for literal in units}
+        children = [self.node(('L', literal)) for literal in units]
+        for var in sorted(scope - assigned - occurring):
+            children.append(self.node(('O', var, (self.node(('L', var)), self.node(('L', -var))))))
+        for component in self.components(clauses):
+            children.append((yield self.compile_component(component)))
+        return self.conjoin(children)
+
+    def compile_component(self, clauses):
+        """
+        Compiles a connected clause set by deciding its most frequent symbol.
+
+        Args:
+            clauses (list of frozenset): A connected component of clauses.
+
+        Returns:
+            generator: A task for run, returning the node index.
+        """
+        key = frozenset(clauses)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats['cache_hits'] += 1
+            return cached
+
+        occurrences = {}
+        for clause in clauses:
+            for literal in clause:
+                occurrences[abs(literal)] = occurrences.get(abs(literal), 0) + 1
+        var = max(occurrences, key=lambda var: (occurrences[var], -var))
+        scope = frozenset(occurrences) - {var}
+        self.stats['decisions'] += 1
+        if self.budget:
+            self.budget.check('decisions', self.stats['decisions'])
+
+        children = []
+        for literal in (var, -var):
+            conditioned = self.condition_clauses(clauses, literal)
+            if conditioned is not None:
+                child = self.conjoin([self.node(('L', literal)), (yield self.compile_clauses(conditioned, scope))])
+                if child != self.false():
+                    children.append(child)
+        if not children:
+            result = self.false()
+        elif len(children) == 1:
+            result = children[0]
+        else:
+            result = self.node(('O', var, tuple(children)))
+        self.cache[key] = result
+        return result
+
+    @staticmethod
+    def condition_clauses(clauses, literal):
+        """
+        Simplifies clauses with a literal made true.
+
+        Args:
+            clauses (list of frozenset): The clauses.
+            literal (int): The true literal.
+
+        Returns:
+            list of frozenset or None: The simplified clauses, or None if one became empty.
+        """
+        result = []
+        for clause in clauses:
+            if literal in clause:
+                continue
+            if -literal in clause:
+                clause = clause - {-literal}
+                if not clause:
+                    return None
+            result.append(clause)
+        return result
+
+    @staticmethod
+    def components(clauses):
+        """
+        Splits clauses into groups that share no symbols.
+
+        Args:
+            clauses (list of frozenset): The clauses.
+
+        Returns:
+            list of list of frozenset: The connected components.
+        """
+        parent = {}
+
+        def find(var):
+            while parent[var] != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+
+        for clause in clauses:
+            variables = [abs(literal) for literal in clause]
+            for var in variables:
+                parent.setdefault(var, var)
+            root = find(variables[0])
+            for var in variables[1:]:
+                other = find(var)
+                if other != root:
+                    parent[other] = root
+
+        groups = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(next(iter(clause)))), []).append(clause)
+        return list(groups.values())
+
+    def count(self, assumptions=()):
+        """
+        Counts the models of the knowledge base consistent with a set of literals.
+
+        Args:
+            assumptions (iterable of int): Literals to condition on.
+
+        Returns:
+            int: The number of models over the KB symbols that satisfy every assumption.
+        """
+        assigned = set(assumptions)
+        values = []
+        for node in self.nodes:
+            if node[0] == 'L':
+                values.append(0 if -node[1] in assigned else 1)
+            elif node[0] == 'A':
+                value = 1
+                for child in node[1]:
+                    value *= values[child]
+                values.append(value)
+            else:
+                values.append(sum(values[child] for child in node[2]))
+        return values[self.root]
+
+    def satisfiable(self, assumptions=()):
+        """
+        Checks whether the knowledge base has a model consistent with a set of literals.
+
+        Args:
+            assumptions (iterable of int): Literals to condition on.
+
+        Returns:
+            bool: True if such a model exists.
+        """
+        assigned = set(assumptions)
+        values = []
+        for node in self.nodes:
+            if node[0] == 'L':
+                values.append(-node[1] not in assigned)
+            elif node[0] == 'A':
+                values.append(all(values[child] for child in node[1]))
+            else:
+                values.append(any(values[child] for child in node[2]))
+        return values[self.root]
+
+    def entails_clause(self, clause):
+        """
+        Checks whether the knowledge base entails a clause: KB ∧ ¬clause has no model.
+
+        Args:
+            clause (iterable of int): The clause literals. Symbols unknown to the KB are ignored.
+
+        Returns:
+            bool: True if the clause is entailed.
+        """
+        literals = [literal for literal in clause if abs(literal) <= len(self.symbols)]
+        if any(-literal in literals for literal in literals):
+            return True
+        return not self.satisfiable(-literal for literal in literals)
+
+    def entails(self, query):
+        """
+        Checks whether the knowledge base entails a query sentence, one CNF clause at a time.
+
+        Args:
+            query (Sentence): The query sentence.
+
+        Returns:
+            bool: True if every clause of the query's CNF is entailed.
+        """
+        cnf = CNF()
+        for symbol in self.symbols:
+            cnf.intern(symbol)
+        cnf.add_expr(to_cnf(query.to_sympy_expr(query.root[0])))
+        return all(self.entails_clause(clause) for clause in cnf.clauses)
+
+    def save(self, filename):
+        """
+        Writes the circuit in the c2d NNF text format, with the symbol table and KB hash as comments.
+
+        Args:
+            filename (str): The output path.
+        """
+        edges = sum(len(node[1]) if node[0] == 'A' else len(node[2]) for node in self.nodes if node[0] != 'L')
+        with open(filename, 'w') as f:
+            if self.kb_hash:
+                f.write(f"c kb {self.kb_hash}\n")
+            for index, name in enumerate(self.symbols):
+                f.write(f"c symbol {index + 1} {name}\n")
+            f.write(f"c root {self.root}\n")
+            f.write(f"nnf {len(self.nodes)} {edges} {len(self.symbols)}\n")
+            for node in self.nodes:
+                if node[0] == 'L':
+                    f.write(f"L {node[1]}\n")
+                elif node[0] == 'A':
+                    f.write(f"A {len(node[1])} {' '.join(map(str, node[1]))}".rstrip() + "\n")
+                else:
+                    f.write(f"O {node[1]} {len(node[2])} {' '.join(map(str, node[2]))}".rstrip() + "\n")
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Reads a circuit written by save.
+
+        Args:
+            filename (str): The input path.
+
+        Returns:
+            DDNNF: The circuit.
+        """
+        kb_hash = None
+        symbols = {}
+        root = None
+        lines = []
+        with open(filename) as f:
+            for line in f:
+                parts = line.split()
+                if not parts:
+                    continue
+                if parts[0] == 'c':
+                    if parts[1] == 'kb':
+                        kb_hash = parts[2]
+                    elif parts[1] == 'symbol':
+                        symbols[int(parts[2])] = parts[3]
+                    elif parts[1] == 'root':
+                        root = int(parts[2])
+                elif parts[0] != 'nnf':
+                    lines.append(parts)
+
+        circuit = cls([symbols[index] for index in range(1, len(symbols) + 1)], kb_hash)
+        for parts in lines:
+            if parts[0] == 'L':
+                circuit.node(('L', int(parts[1])))
+            elif parts[0] == 'A':
+                circuit.node(('A', tuple(int(child) for child in parts[2:])))
+            else:
+                circuit.node(('O', int(parts[1]), tuple(int(child) for child in parts[3:])))
+        circuit.root = len(circuit.nodes) - 1 if root is None else root
+        circuit.stats = {'nodes': len(circuit.nodes)}
+        return circuit
+
+    def solve(self, query):
+        """
+        Answers an entailment query in the style of the truth table method.
+
+        Args:
+            query (Sentence): The query sentence.
+
+        Returns:
+            str: "YES: <number of models of the KB>" if the query is entailed, otherwise "NO".
+        """
+        return "YES: " + str(self.count()) if self.entails(query) else "NO"
+
+if __name__ == "__main__":
+    from FileReader import FileReader
+    from KnowledgeBase import KnowledgeBase
+
+    if len(sys.argv) < 3:
+        print("Enter command in the following format: python DDNNF.py inputfile outputfile.nnf")
+        exit(0)
+
+    tell, ask = FileReader.read(sys.argv[1])
+    circuit = DDNNF.compile(KnowledgeBase(tell, 'GS'))
+    circuit.save(sys.argv[2])
+    print(f"Compiled {len(circuit.symbols)} symbols into {len(circuit.nodes)} nodes: {circuit.stats}")
@@ -1,261 +1,386 @@
 from Sentence import Sentence
-from sympy.logic.boolalg import to_cnf, Not, And, Or
-import sympy
+from CNF import CNF
+from Tracer import Tracer
+from Symmetry import Symmetry
 
 class DPLL:
-    def __init__(self, knowledge_base, query, debug=False):
+    HEURISTICS = ['FIXED', 'MOMS', 'JW', 'DLIS']
+
+    def __init__(self, knowledge_base, query, debug=False, heuristic='JW', pure_literals=True, tracer=None, budget=None, symmetry=False, certificate=None):
         """
         Initialize the DPLL solver with a knowledge base, a query, and an optional debug mode.
-        
+
         Args:
             knowledge_base (KnowledgeBase): The knowledge base containing propositional sentences.
             query (Sentence): The query sentence to be solved.
             debug (bool): Flag to enable debug mode for detailed steps.
+            heuristic (str): Branching heuristic, one of 'FIXED', 'MOMS', 'JW' or 'DLIS'.
+            pure_literals (bool): Flag to assign pure literals before branching.
+            tracer (Tracer): Receives search events. Debug mode uses a text tracer on stdout.
+            budget (Budget): Limits time, memory and the number of decisions ('decisions'). Optional.
+            symmetry (bool): Detect symmetries of the clauses and add lex-leader symmetry-breaking clauses before searching.
+            certificate (Certificate): Receives the input clauses, a lemma with unit propagation
+                hints for every refuted branch, and the model if one is found. Optional.
         """
+        heuristic = heuristic.upper()
+        if heuristic not in self.HEURISTICS:
+            raise Exception(f"Unknown branching heuristic: {heuristic}")
+        if symmetry and certificate:
+            raise Exception("Symmetry-breaking clauses are not implied by the KB, so no certificate can be written")
         self.kb = knowledge_base
         self.query = query
         self.debug = debug
+        self.trace = tracer or (Tracer.debug() if debug else None)
+        self.budget = budget
+        self.heuristic = heuristic
+        self.pure_literals = pure_literals
+        self.symmetry = symmetry
+        self.certificate = certificate
+        self.stats = {'decisions': 0, 'propagations': 0, 'pure': 0, 'conflicts': 0}
 
-    def debug_print(self, *args, **kwargs):
-        """Print debug messages if debugging is enabled."""
-        if self.debug:
-            print(*args, **kwargs)
-    
     def solve(self):
         """
         Solve the query using the DPLL algorithm.
 
-        Returns:
-            bool: True if the query is satisfiable, False otherwise.
-        """
-        self.debug_print("Starting DPLL algorithm...")
-        clauses = self.parse_kb()
-        self.debug_print("Initial clauses from knowledge base:")
-        for clause in clauses:
-            self.debug_print(f"  {clause}")
-
-        negated_query_clauses = self.negate_query()
-        self.debug_print("\nNegated query clauses:")
-        for clause in negated_query_clauses:
-            self.debug_print(f"  {clause}")
-
-        clauses.extend(negated_query_clauses)
-        symbols = set()
-        for clause in clauses:
-            symbols.update(clause.free_symbols)
-
-        self.debug_print("\nSymbols in the clauses:", symbols)
-        result = self.dpll(clauses, symbols, {})
-        self.debug_print("\nDPLL result:", "SATISFIABLE" if result else "UNSATISFIABLE")
-        return result
-    
-    def parse_kb(self):
-        """
-        Parse the knowledge base and convert it to a list of clauses in CNF.
+        The query is entailed exactly when KB ∧ ¬query is unsatisfiable.
 
         Returns:
-            list: List of clauses in CNF form.
+            bool: True if the query is entailed by the knowledge base, False otherwise.
         """
-        clauses = []
-        for sentence in self.kb.sentences:
-            cnf = to_cnf(sentence.to_sympy_expr(sentence.root[0]))
-            clauses.extend(self.extract_clauses(cnf))
-        return clauses
+        return not self.satisfiable(CNF.from_kb(self.kb, self.query))
 
-    def extract_clauses(self, cnf_expr):
+    def satisfiable(self, cnf):
         """
-        Extract clauses from a CNF expression.
+        Decide satisfiability of a clause store, leaving a satisfying model in self.model.
 
         Args:
-            cnf_expr (sympy.Expr): CNF expression.
-
-        Returns:
-            list: List of individual clauses.
-        """
-        if isinstance(cnf_expr, sympy.Or):
-            return [cnf_expr]
-        elif isinstance(cnf_expr, sympy.And):
-            return list(cnf_expr.args)
-        else:
-            return [cnf_expr]
-
-    def negate_query(self):
-        """
-        Negate the query and convert it to CNF.
+            cnf (CNF): The clause store.
 
         Returns:
-            list: List of clauses representing the negated query in CNF.
+            bool: True if the clauses are satisfiable, False otherwise.
         """
-        query_expr = self.query.to_sympy_expr(self.query.root[0])
-        query_cnf = to_cnf(Not(query_expr))
-        return self.extract_clauses(query_cnf)
-
-    def dpll(self, clauses, symbols, model):
+        self.num_vars = cnf.num_vars
+        if self.symmetry:
+            symmetry = Symmetry(cnf, budget=self.budget)
+            cnf = symmetry.break_symmetries()
+            self.stats.update(symmetry.stats)
+        self.cnf = cnf
+        if self.trace:
+            self.trace.emit('start', engine='DPLL', clauses=len(self.cnf.clauses), symbols=self.cnf.num_vars)
+            for clause in self.cnf.clauses:
+                self.trace.emit('clause', clause=self.cnf.clause_str(clause))
+
+        self.model = None
+        if self.certificate:
+            self.certificate.header(cnf.symbols)
+            self.proof = {}  # certificate id to clause literals
+            self.input_ids = []
+            for clause in cnf.clauses:
+                clause_id = self.certificate.input(clause)
+                self.proof[clause_id] = clause
+                self.input_ids.append(clause_id)
+        satisfiable = self.dpll()
+        if self.certificate and satisfiable:
+            self.certificate.model(var if self.values.get(var, False) else -var for var in range(1, self.num_vars + 1))
+        if self.trace:
+            self.trace.emit('result', answer="SATISFIABLE" if satisfiable else "UNSATISFIABLE", stats=self.stats)
+        return satisfiable
+
+    def dpll(self):
         """
-        Apply the DPLL algorithm to determine satisfiability.
+        Apply the DPLL algorithm to determine satisfiability of the clause store.
 
-        Args:
-            clauses (list): List of clauses.
-            symbols (set): Set of propositional symbols.
-            model (dict): Current truth assignment model.
+        Assignments are recorded on a trail; backtracking pops the trail back to the
+        mark of the decision being undone instead of copying the model.
 
         Returns:
             bool: True if the clauses are satisfiable, False otherwise.
         """
-        self.debug_print("\nCurrent model:", model)
-        self.debug_print("Remaining clauses:")
-        for clause in clauses:
-            self.debug_print(f"  {clause}")
-        self.debug_print("Remaining symbols:", symbols)
-
-        all_satisfied = all(self.evaluate(clause, model) is True for clause in clauses)
-        self.debug_print(f"All clauses satisfied check: {all_satisfied}")
-        if all_satisfied:
-            self.debug_print("All clauses satisfied with current model.")
-            return True
-        
-        unsat_clauses = [clause for clause in clauses if self.evaluate(clause, model) is False]
-        if unsat_clauses:
-            self.debug_print(f"Unsatisfied clauses: {unsat_clauses}")
+        if not self.setup():
             return False
 
-        self.debug_print("\nPerforming unit propagation...")
-        unit_clauses = self.find_unit_clauses(clauses)
-        self.debug_print(f"Initial unit clauses: {unit_clauses}")
-        while unit_clauses:
-            unit = unit_clauses.pop()
-            literal = unit if isinstance(unit, sympy.Symbol) else next(iter(unit.args))
-            if isinstance(literal, Not):
-                literal = literal.args[0]
-
-            self.debug_print(f"  Unit clause found: {unit}. Propagating {literal}.")
-            model[literal] = True
-            clauses = self.simplify(clauses, literal)
-            self.debug_print(f"  Updated model: {model}")
-            self.debug_print("  Simplified clauses:")
-            for clause in clauses:
-                self.debug_print(f"    {clause}")
-
-            all_satisfied = all(self.evaluate(clause, model) is True for clause in clauses)
-            self.debug_print(f"All clauses satisfied check after propagation: {all_satisfied}")
-            if all_satisfied:
-                self.debug_print("All clauses satisfied with current model after propagation.")
+        stack = []
+        while True:
+            if self.budget:
+                self.budget.check('decisions', self.stats['decisions'])
+            if not self.propagate():
+                self.stats['conflicts'] += 1
+                lemma = self.refute(stack) if self.certificate else None
+                while stack:
+                    mark, literal, flipped = stack.pop()
+                    self.undo(mark)
+                    if not flipped:
+                        if self.trace:
+                            self.trace.emit('backtrack', level=len(stack) + 1, literal=self.cnf.literal_name(-literal))
+                        stack.append((mark, -literal, True))
+                        self.assign(-literal, lemma)
+                        break
+                else:
+                    return False
+                continue
+
+            literal = self.decide()
+            if literal is None:
+                self.model = {self.cnf.symbols[var - 1]: self.values.get(var, False)
+                              for var in range(1, self.num_vars + 1)}
+                if self.trace:
+                    self.trace.emit('model', model=self.model)
                 return True
-            unsat_clauses = [clause for clause in clauses if self.evaluate(clause, model) is False]
-            if unsat_clauses:
-                self.debug_print(f"Unsatisfied clauses after propagation: {unsat_clauses}")
-                return False
+            if literal == 0:
+                continue
 
-            unit_clauses = self.find_unit_clauses(clauses)
-            self.debug_print(f"New unit clauses after propagation: {unit_clauses}")
+            self.stats['decisions'] += 1
+            if self.trace:
+                self.trace.emit('decision', level=len(stack) + 1, literal=self.cnf.literal_name(literal))
+            stack.append((len(self.trail), literal, False))
+            self.assign(literal)
 
-        if not symbols:
-            self.debug_print("No symbols left to process. Returning False.")
-            return False
+    def setup(self):
+        """
+        Build the watch lists and enqueue the unit clauses of the clause store.
 
-        P = next(iter(symbols))
-        rest = symbols - {P}
-        new_model = model.copy()
+        Returns:
+            bool: False if the clause store contains the empty clause or contradicting units.
+        """
+        self.values = {}
+        self.trail = []
+        self.head = 0
+        self.clauses = []
+        self.clause_ids = []  # certificate id of every clause in self.clauses
+        self.reasons = {}  # certificate id of the clause that implied each assigned symbol
+        self.watches = {}
+        for var in range(1, self.cnf.num_vars + 1):
+            self.watches[var] = []
+            self.watches[-var] = []
+
+        ids = self.input_ids if self.certificate else range(1, len(self.cnf.clauses) + 1)
+        for clause_id, clause in zip(ids, self.cnf.clauses):
+            if not clause:
+                if self.certificate:
+                    self.certificate.lemma((), [clause_id])
+                return False
+            if len(clause) == 1:
+                value = self.value(clause[0])
+                if value is False:
+                    if self.certificate:
+                        self.certificate.lemma((), [self.reasons[abs(clause[0])], clause_id])
+                    return False
+                if value is None:
+                    self.assign(clause[0], clause_id)
+                continue
+            index = len(self.clauses)
+            self.clauses.append(list(clause))
+            self.clause_ids.append(clause_id)
+            self.watches[clause[0]].append(index)
+            self.watches[clause[1]].append(index)
+        return True
+
+    def value(self, literal):
+        """
+        Return the current value of a literal.
 
-        self.debug_print(f"\nTrying {P} as True")
-        new_model[P] = True
-        if self.dpll(clauses, rest, new_model):
-            return True
+        Args:
+            literal (int): The encoded literal.
 
-        self.debug_print(f"\nTrying {P} as False")
-        new_model = model.copy()
-        new_model[P] = False
-        return self.dpll(clauses, rest, new_model)
+        Returns:
+            bool or None: The value of the literal, or None if it is unassigned.
+        """
+        value = self.values.get(abs(literal))
+        if value is None or literal > 0:
+            return value
+        return not value
 
-    def find_unit_clauses(self, clauses):
+    def assign(self, literal, reason=None):
         """
-        Identify unit clauses from the list of clauses.
+        Make a literal true and push it on the trail.
 
         Args:
-            clauses (list): List of clauses.
+            literal (int): The encoded literal.
+            reason (int): Certificate id of the clause implying the literal; None for decisions and pure literals.
+        """
+        self.values[abs(literal)] = literal > 0
+        self.trail.append(literal)
+        if self.certificate:
+            self.reasons[abs(literal)] = reason
+
+    def undo(self, mark):
+        """
+        Pop assignments from the trail down to the given mark.
+
+        Args:
+            mark (int): Trail length to restore.
+        """
+        for literal in self.trail[mark:]:
+            del self.values[abs(literal)]
+        del self.trail[mark:]
+        self.head = min(self.head, mark)
+
+    def propagate(self):
+        """
+        Perform unit propagation over the unprocessed part of the trail using two watched literals.
 
         Returns:
-            list: List of unit clauses.
+            bool: False if a clause became falsified, True otherwise.
         """
-        unit_clauses = []
-        self.debug_print("\nFinding unit clauses...")
-        for clause in clauses:
-            if isinstance(clause, sympy.Symbol):
-                unit_clauses.append(clause)
-            elif isinstance(clause, sympy.Or) and len(clause.args) == 1:
-                unit_clauses.append(clause)
-            elif isinstance(clause, Not):
-                unit_clauses.append(clause)
-        self.debug_print(f"All unit clauses found: {unit_clauses}")
-        return unit_clauses
-
-    def simplify(self, clauses, literal):
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watchers = self.watches[false_literal]
+            i = 0
+            while i < len(watchers):
+                index = watchers[i]
+                clause = self.clauses[index]
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                other = clause[0]
+                if self.value(other) is True:
+                    i += 1
+                    continue
+
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(index)
+                        watchers[i] = watchers[-1]
+                        watchers.pop()
+                        break
+                else:
+                    if self.value(other) is False:
+                        if self.trace:
+                            self.trace.emit('conflict', clause=self.cnf.clause_str(clause))
+                        self.head = len(self.trail)
+                        self.conflict = index
+                        return False
+                    self.stats['propagations'] += 1
+                    if self.trace:
+                        self.trace.emit('propagate', literal=self.cnf.literal_name(other), clause=self.cnf.clause_str(clause))
+                    self.assign(other, self.clause_ids[index] if self.certificate else None)
+                    i += 1
+        return True
+
+    def refute(self, stack):
         """
-        Simplify the clause set given a literal assignment.
+        Write the lemma refuting the current branch to the certificate.
+
+        The lemma is the negation of the open decisions on the stack. Making it false makes
+        them true again, and unit propagation over the reasons of the conflict, in trail
+        order, falsifies the conflicting clause. Pure literals never falsify a literal of
+        an open clause, so they are never needed.
 
         Args:
-            clauses (list): List of clauses.
-            literal (sympy.Symbol): Literal to be propagated.
+            stack (list): The decision stack at the conflict.
 
         Returns:
-            list: Simplified list of clauses.
+            int: The certificate id of the lemma, the reason for the flipped decision.
         """
-        new_clauses = []
-        self.debug_print(f"Simplifying clauses with {literal} set to True")
-        for clause in clauses:
-            if isinstance(clause, sympy.Symbol):
-                clause_literals = {clause}
-            elif isinstance(clause, sympy.Or):
-                clause_literals = set(clause.args)
-            else:
-                clause_literals = {clause}
-
-            if literal in clause_literals:
-                continue
+        lemma = tuple(-literal for _, literal, flipped in stack if not flipped)
+        conflict = self.clause_ids[self.conflict]
+        position = {abs(literal): index for index, literal in enumerate(self.trail)}
+        seen = set()
+        hints = []
+        pending = [conflict]
+        while pending:
+            for literal in self.proof[pending.pop()]:
+                var = abs(literal)
+                if var in seen:
+                    continue
+                seen.add(var)
+                reason = self.reasons.get(var)
+                if reason is not None:
+                    hints.append((position[var], reason))
+                    pending.append(reason)
+        lemma_id = self.certificate.lemma(lemma, [reason for _, reason in sorted(hints)] + [conflict])
+        self.proof[lemma_id] = lemma
+        return lemma_id
+
+    def decide(self):
+        """
+        Assign pure literals or pick the next branching literal with the selected heuristic.
 
-            new_clause_literals = clause_literals - {Not(literal)}
-            if new_clause_literals:
-                if len(new_clause_literals) == 1:
-                    new_clause = new_clause_literals.pop()
-                else:
-                    new_clause = Or(*new_clause_literals)
-                new_clauses.append(new_clause)
+        Returns:
+            int or None: The branching literal, 0 if pure literals were assigned and
+            propagation must run again, or None if every clause is satisfied.
+        """
+        if self.heuristic == 'FIXED' and not self.pure_literals:
+            for var in range(1, self.cnf.num_vars + 1):
+                if var not in self.values:
+                    return var
+            return None
+
+        open_clauses = []
+        for clause in self.clauses:
+            literals = []
+            for literal in clause:
+                value = self.value(literal)
+                if value is True:
+                    break
+                if value is None:
+                    literals.append(literal)
             else:
-                self.debug_print(f"  Clause {clause} is empty after removing {Not(literal)}.")
-        return new_clauses
+                open_clauses.append(literals)
+        if not open_clauses:
+            return None
+
+        if self.pure_literals:
+            occurring = {literal for literals in open_clauses for literal in literals}
+            pure = sorted((literal for literal in occurring if -literal not in occurring), key=abs)
+            if pure:
+                for literal in pure:
+                    self.stats['pure'] += 1
+                    if self.trace:
+                        self.trace.emit('pure', literal=self.cnf.literal_name(literal))
+                    self.assign(literal)
+                return 0
+
+        if self.heuristic == 'FIXED':
+            return min((literal for literals in open_clauses for literal in literals), key=abs)
+        if self.heuristic == 'MOMS':
+            return self.moms(open_clauses)
+        if self.heuristic == 'JW':
+            return self.best_literal(open_clauses, lambda literals: 2.0 ** -len(literals))
+        return self.best_literal(open_clauses, lambda literals: 1)
+
+    def best_literal(self, open_clauses, weight):
+        """
+        Pick the literal with the highest summed clause weight (Jeroslow-Wang, DLIS).
 
-    def evaluate(self, clause, model):
+        Args:
+            open_clauses (list): Unassigned literals of every unsatisfied clause.
+            weight (callable): Weight of a clause given its unassigned literals.
+
+        Returns:
+            int: The branching literal. Ties go to the lowest variable, positive first.
+        """
+        scores = {}
+        for literals in open_clauses:
+            w = weight(literals)
+            for literal in literals:
+                scores[literal] = scores.get(literal, 0) + w
+        return max(scores, key=lambda literal: (scores[literal], -abs(literal), literal))
+
+    def moms(self, open_clauses):
         """
-        Evaluate a clause under the current model.
+        Pick the variable with Maximum Occurrences in clauses of Minimum Size.
 
         Args:
-            clause (sympy.Expr): Clause to be evaluated.
-            model (dict): Current truth assignment model.
+            open_clauses (list): Unassigned literals of every unsatisfied clause.
 
         Returns:
-            bool: Evaluation result.
+            int: The branching literal, in the more frequent polarity.
         """
-        if isinstance(clause, sympy.Symbol):
-            return model.get(clause, None)
-        if isinstance(clause, Not):
-            return not self.evaluate(clause.args[0], model)
-        if isinstance(clause, Or):
-            results = [self.evaluate(arg, model) for arg in clause.args]
-            if any(result is True for result in results):
-                return True
-            elif all(result is False for result in results):
-                return False
-            else:
-                return None
-        if isinstance(clause, And):
-            results = [self.evaluate(arg, model) for arg in clause.args]
-            if all(result is True for result in results):
-                return True
-            elif any(result is False for result in results):
-                return False
-            else:
-                return None
-        return None
+        size = min(len(literals) for literals in open_clauses)
+        counts = {}
+        for literals in open_clauses:
+            if len(literals) == size:
+                for literal in literals:
+                    counts[literal] = counts.get(literal, 0) + 1
+
+        def score(var):
+            pos, neg = counts.get(var, 0), counts.get(-var, 0)
+            return ((pos + neg) * 2 ** size + pos * neg, -var)
+
+        var = max({abs(literal) for literal in counts}, key=score)
+        return var if counts.get(var, 0) >= counts.get(-var, 0) else -var
 
 if __name__ == "__main__":
     import sys
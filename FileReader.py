@@ -1,6 +1,9 @@
+from CNF import CNF
+
 class FileReader:
     """
-    A utility class to read and parse the knowledge base (TELL) and query (ASK) statements from a text file.
+    A utility class to read and parse the knowledge base (TELL) and query (ASK) statements from a text file,
+    and to read and write DIMACS CNF files.
     """
 
     @staticmethod
@@ -37,3 +40,136 @@ class FileReader:
                         ask_found = True
 
         return tell, ask
+
+    @staticmethod
+    def is_dimacs(filename):
+        """
+        Tells DIMACS CNF files apart from TELL/ASK files by their extension.
+
+        Args:
+            filename (str): The path to the input file.
+
+        Returns:
+            bool: True for '.cnf' and '.dimacs' files.
+        """
+        return filename.lower().endswith(('.cnf', '.dimacs'))
+
+    @staticmethod
+    def read_dimacs(filename):
+        """
+        Reads a DIMACS CNF file straight into an integer clause store.
+
+        Variable i is named by a 'c symbol i name' comment if the file has one (as written
+        by write_dimacs), otherwise 'x<i>'. Clauses may span lines; a '%' line ends the
+        clause list, as in the SATLIB benchmark files.
+
+        Args:
+            filename (str): The path to the DIMACS file.
+
+        Returns:
+            CNF: The clause store.
+
+        Raises:
+            ValueError: If the header is missing or malformed, or a literal exceeds the declared variable count.
+        """
+        names = {}
+        num_vars = None
+        literals = []
+        with open(filename) as f:
+            for line in f:
+                if line.startswith('c'):
+                    parts = line.split()
+                    if len(parts) == 4 and parts[1] == 'symbol':
+                        names[int(parts[2])] = parts[3]
+                elif line.startswith('p'):
+                    parts = line.split()
+                    if len(parts) != 4 or parts[1] != 'cnf':
+                        raise ValueError(f"Bad DIMACS header: {line.strip()}")
+                    num_vars = int(parts[2])
+                elif line.startswith('%'):
+                    break
+                else:
+                    literals.extend(map(int, line.split()))
+        if num_vars is None:
+            raise ValueError("Missing DIMACS header 'p cnf <variables> <clauses>'.")
+
+        cnf = CNF()
+        for var in range(1, num_vars + 1):
+            cnf.intern(names.get(var, f"x{var}"))
+        clause = []
+        for literal in literals:
+            if literal == 0:
+                cnf.add_clause(clause)
+                clause = []
+            elif abs(literal) > num_vars:
+                raise ValueError(f"Literal {literal} exceeds the {num_vars} declared variables.")
+            else:
+                clause.append(literal)
+        if clause:
+            cnf.add_clause(clause)
+        return cnf
+
+    @staticmethod
+    def read_dimacs_query(filename, cnf):
+        """
+        Reads DIMACS query clauses and numbers them with the symbol table of a KB clause store.
+
+        A query file with 'c symbol' comments is matched by symbol name. Without them its
+        variables can only be taken to use the KB's numbering, so its header must declare
+        the same number of variables as the KB.
+
+        Args:
+            filename (str): The path to the DIMACS query file.
+            cnf (CNF): The clause store of the knowledge base.
+
+        Returns:
+            list of tuple of int: The query clauses, in the KB's numbering.
+
+        Raises:
+            ValueError: If a named query symbol is not a KB symbol, or an unnamed query file
+                declares a different number of variables than the KB.
+        """
+        query = FileReader.read_dimacs(filename)
+        if all(name == f"x{var}" for var, name in enumerate(query.symbols, 1)):  # no names, or default ones
+            if query.num_vars != cnf.num_vars:
+                raise ValueError(f"The query file declares {query.num_vars} variables but the knowledge base has "
+                                 f"{cnf.num_vars}; name them with 'c symbol' comments to match them by name")
+            return list(query.clauses)
+        ids = []
+        for name in query.symbols:
+            if name not in cnf.ids:
+                raise ValueError(f"Query symbol {name} is not a symbol of the knowledge base")
+            ids.append(cnf.ids[name])
+        return [tuple(ids[abs(literal) - 1] if literal > 0 else -ids[abs(literal) - 1] for literal in clause)
+                for clause in query.clauses]
+
+    @staticmethod
+    def write_dimacs(cnf, filename):
+        """
+        Writes an integer clause store as DIMACS CNF, with the symbol names as comments.
+
+        Args:
+            cnf (CNF): The clause store.
+            filename (str): The output path.
+        """
+        with open(filename, 'w') as f:
+            for var, name in enumerate(cnf.symbols, 1):
+                f.write(f"c symbol {var} {name}\n")
+            f.write(f"p cnf {cnf.num_vars} {len(cnf.clauses)}\n")
+            for clause in cnf.clauses:
+                f.write(" ".join(map(str, clause)) + " 0\n")
+
+if __name__ == "__main__":
+    import sys
+    from KnowledgeBase import KnowledgeBase
+    from Sentence import Sentence
+
+    if len(sys.argv) < 3:
+        print("Enter command in the following format: python FileReader.py inputfile outputfile.cnf")
+        print("Writes the CNF of KB ∧ ¬query as DIMACS; the query is entailed exactly when it is unsatisfiable.")
+        exit(0)
+
+    tell, ask = FileReader.read(sys.argv[1])
+    cnf = CNF.from_kb(KnowledgeBase(tell, 'GS'), Sentence(ask) if ask else None)
+    FileReader.write_dimacs(cnf, sys.argv[2])
+    print(f"Wrote {cnf.num_vars} variables and {len(cnf.clauses)} clauses.")
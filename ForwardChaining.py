@@ -1,47 +1,99 @@
-from KnowledgeBase import KnowledgeBase
-from Sentence import Sentence
-from HornForm import HornForm
+import heapq
+from array import array
+from SolverContext import SolverContext
 
 class ForwardChaining:
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, tracer=None, budget=None):
         """
         Initialize the ForwardChaining instance.
 
+        Builds the premise-to-rule index of the Horn-form knowledge base as CSR arrays:
+        the rules with premise s are `rule_ids[occurrence_offsets[s]:occurrence_offsets[s + 1]]`.
+        The index and the initial agenda are never modified afterwards, so the instance can
+        answer many queries, concurrently if each call has its own SolverContext.
+
         Args:
             knowledge_base (KnowledgeBase): The knowledge base containing propositional sentences.
+            tracer (Tracer): Receives rule-fired events. Optional.
+            budget (Budget): Limits time and memory. Optional.
         """
         self.kb = knowledge_base
-        self.agenda = [(sentence.head, len(sentence.conjuncts)) 
-                       for sentence in self.kb.sentences 
-                       if isinstance(sentence, HornForm) and not sentence.conjuncts]
-        self.inferred = []
+        self.trace = tracer
+        self.budget = budget
+
+        kb = self.kb
+        occurrences = array('i', bytes(4 * (len(kb.symbols) + 1)))
+        for premise in kb.premises:
+            occurrences[premise + 1] += 1
+        for symbol in range(len(kb.symbols)):
+            occurrences[symbol + 1] += occurrences[symbol]
+        self.occurrence_offsets = occurrences
+        self.rule_ids = array('i', bytes(4 * len(kb.premises)))
+        fill = array('i', occurrences)
+        for rule in range(kb.num_rules):
+            for premise in kb.premises[kb.offsets[rule]:kb.offsets[rule + 1]]:
+                self.rule_ids[fill[premise]] = rule
+                fill[premise] += 1
+
+        facts = [rule for rule in range(kb.num_rules) if kb.offsets[rule] == kb.offsets[rule + 1]]
+        self.agenda = [(0, sequence, kb.heads[rule]) for sequence, rule in enumerate(facts)]
+        self.context = SolverContext()
 
-    def solve(self, query):
+    @property
+    def inferred(self):
+        """list of str: The symbols inferred by the latest call to solve, in order."""
+        return self.context.inferred
+
+    def solve(self, query, context=None):
         """
         Use forward chaining to infer the query from the knowledge base.
 
+        Each rule keeps a count of premises not yet inferred and fires when it reaches zero.
+        The agenda is a priority queue on the premise count of the rule that produced each
+        symbol, ties in order of insertion.
+
         Args:
             query (str): The query symbol to be inferred.
+            context (SolverContext): Receives the inferred symbols. A new one is created if omitted.
 
         Returns:
             str: "YES: [inferred symbols]" if the query is entailed, otherwise "NO".
         """
-        while self.agenda:
-            p, _ = self.agenda.pop(0)
-            if p not in self.inferred:
-                self.inferred.append(p)
-
-            if p == query:
-                return "YES: " + ", ".join(self.inferred)
-
-            new_agenda_items = []
-            for rule in self.kb.sentences:
-                if isinstance(rule, HornForm) and p in rule.conjuncts:
-                    if all(premise in self.inferred for premise in rule.conjuncts):
-                        if rule.head not in self.inferred and rule.head not in [item[0] for item in new_agenda_items]:
-                            new_agenda_items.append((rule.head, len(rule.conjuncts)))
-
-            self.agenda.extend(new_agenda_items)
-            self.agenda.sort(key=lambda x: x[1])
-        
+        context = context or SolverContext()
+        self.context = context
+        kb = self.kb
+        symbols = kb.symbols
+        offsets = kb.offsets
+        count = array('i', (offsets[rule + 1] - offsets[rule] for rule in range(kb.num_rules)))
+        inferred = bytearray(len(symbols))
+        agenda = list(self.agenda)
+        heapq.heapify(agenda)
+        sequence = len(agenda)
+        target = kb.ids.get(query)
+
+        while agenda:
+            _, _, p = heapq.heappop(agenda)
+            if self.budget:
+                self.budget.check()
+            if inferred[p]:
+                continue
+            inferred[p] = 1
+            context.inferred.append(symbols[p])
+
+            if p == target:
+                return "YES: " + ", ".join(context.inferred)
+
+            queued = set()
+            for index in range(self.occurrence_offsets[p], self.occurrence_offsets[p + 1]):
+                rule = self.rule_ids[index]
+                count[rule] -= 1
+                if count[rule] == 0:
+                    head = kb.heads[rule]
+                    if not inferred[head] and head not in queued:
+                        queued.add(head)
+                        if self.trace:
+                            self.trace.emit('rule-fired', head=symbols[head], premises=kb.rule(rule)[1])
+                        heapq.heappush(agenda, (offsets[rule + 1] - offsets[rule], sequence, head))
+                        sequence += 1
+
         return "NO"
@@ -0,0 +1,118 @@
+from CNF import CNF
+
+class HornSAT:
+    """
+    Linear time solver for Horn clause sets (at most one positive literal per clause).
+
+    Every clause counts its negative literals whose symbols are not yet true. Symbols are
+    made true only when forced, starting from the positive units; a clause whose count
+    drops to zero forces its positive literal, or is violated if it has none. If no clause
+    is violated, making every other symbol false satisfies the clauses. Dual-Horn sets (at
+    most one negative literal per clause) are solved by flipping every literal.
+    """
+
+    def __init__(self, knowledge_base, query, dual=False, tracer=None, budget=None):
+        """
+        Initialize the Horn-SAT solver with a knowledge base and a query.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base containing propositional sentences.
+            query (Sentence): The query sentence to be solved.
+            dual (bool): Treat the clauses as dual-Horn by flipping every literal.
+            tracer (Tracer): Receives propagate, conflict, model and result events. Optional.
+            budget (Budget): Limits time and memory. Optional.
+        """
+        self.kb = knowledge_base
+        self.query = query
+        self.dual = dual
+        self.trace = tracer
+        self.budget = budget
+        self.model = None
+        self.stats = {'propagations': 0}
+
+    def solve(self):
+        """
+        Solve the query; it is entailed exactly when KB ∧ ¬query is unsatisfiable.
+
+        Returns:
+            bool: True if the query is entailed by the knowledge base, False otherwise.
+        """
+        return not self.satisfiable(CNF.from_kb(self.kb, self.query))
+
+    def satisfiable(self, cnf):
+        """
+        Decide satisfiability of a Horn (or, when dual, dual-Horn) clause store.
+
+        Args:
+            cnf (CNF): The clause store.
+
+        Returns:
+            bool: True if the clauses are satisfiable, False otherwise.
+
+        Raises:
+            ValueError: If a clause has more than one positive (dual: negative) literal.
+        """
+        if self.trace:
+            self.trace.emit('start', engine='DualHornSAT' if self.dual else 'HornSAT',
+                            clauses=len(cnf.clauses), symbols=cnf.num_vars)
+
+        sign = -1 if self.dual else 1
+        self.model = None
+        heads = []
+        missing = []
+        watch = {}
+        queue = []
+        for index, clause in enumerate(cnf.clauses):
+            positive = [sign * literal for literal in clause if sign * literal > 0]
+            if len(positive) > 1:
+                raise ValueError(f"Clause is not Horn: {cnf.clause_str(clause)}")
+            negative = {-sign * literal for literal in clause if sign * literal < 0}
+            heads.append(positive[0] if positive else None)
+            missing.append(len(negative))
+            for var in negative:
+                watch.setdefault(var, []).append(index)
+            if not negative:
+                if not positive:
+                    return self.__result(False, cnf, clause)
+                queue.append(positive[0])
+
+        true = set()
+        while queue:
+            var = queue.pop()
+            if var in true:
+                continue
+            if self.budget:
+                self.budget.check()
+            true.add(var)
+            self.stats['propagations'] += 1
+            if self.trace:
+                self.trace.emit('propagate', literal=cnf.literal_name(sign * var))
+            for index in watch.get(var, ()):
+                missing[index] -= 1
+                if missing[index] == 0:
+                    if heads[index] is None:
+                        return self.__result(False, cnf, cnf.clauses[index])
+                    queue.append(heads[index])
+
+        self.model = {cnf.symbols[var - 1]: (var in true) != self.dual for var in range(1, cnf.num_vars + 1)}
+        if self.trace:
+            self.trace.emit('model', model=self.model)
+        return self.__result(True, cnf)
+
+    def __result(self, satisfiable, cnf, conflict=None):
+        """
+        Record the outcome in the trace.
+
+        Args:
+            satisfiable (bool): The outcome.
+            cnf (CNF): The clause store.
+            conflict (tuple of int): The violated clause, if any.
+
+        Returns:
+            bool: The outcome, unchanged.
+        """
+        if self.trace:
+            if conflict is not None:
+                self.trace.emit('conflict', clause=cnf.clause_str(conflict))
+            self.trace.emit('result', answer="SATISFIABLE" if satisfiable else "UNSATISFIABLE", stats=self.stats)
+        return satisfiable
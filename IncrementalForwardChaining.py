@@ -0,0 +1,212 @@
+from HornForm import HornForm
+
+class IncrementalForwardChaining:
+    """
+    Stateful Horn reasoner that maintains the forward chaining closure of a live knowledge base.
+
+    Facts and rules can be told and retracted at any time. Each rule keeps a counter of
+    premises missing from the closure, so a new atom only visits the rules it is a premise
+    of. Retraction uses DRed (delete and rederive): everything derived through the removed
+    fact or rule is over-deleted, then atoms that still have support are rederived. Queries
+    are a set lookup.
+    """
+
+    def __init__(self, knowledge_base=None, tracer=None):
+        """
+        Initialize the reasoner, optionally loading the sentences of a Horn knowledge base.
+
+        Args:
+            knowledge_base (KnowledgeBase): A knowledge base of Horn-form sentences. Optional.
+            tracer (Tracer): Receives rule-fired events. Optional.
+        """
+        self.trace = tracer
+        self.closure = set()
+        self.facts = {}
+        self.rules = {}
+        self.rule_ids = {}
+        self.missing = {}
+        self.watch = {}
+        self.heads = {}
+        self.next_id = 0
+
+        if knowledge_base is not None:
+            for head, premises in knowledge_base.rules():
+                self.__tell(head, premises)
+
+    def tell(self, sentence):
+        """
+        Add a fact or rule and extend the closure with everything it makes derivable.
+
+        Args:
+            sentence (str or HornForm): A Horn-form sentence such as 'a' or 'a&b=>c'.
+        """
+        sentence = self.__horn(sentence)
+        self.__tell(sentence.head, sentence.conjuncts)
+
+    def __tell(self, head, premises):
+        """
+        Add a fact (no premises) or rule given by symbol names.
+
+        Args:
+            head (str): The concluded symbol.
+            premises (list of str): The premises of the rule.
+        """
+        if not premises:
+            self.facts[head] = self.facts.get(head, 0) + 1
+            self.__derive(head)
+            return
+
+        premises = tuple(dict.fromkeys(premises))
+        rule_id = self.next_id
+        self.next_id += 1
+        self.rules[rule_id] = (head, premises)
+        self.rule_ids.setdefault((head, frozenset(premises)), []).append(rule_id)
+        self.heads.setdefault(head, set()).add(rule_id)
+        for premise in premises:
+            self.watch.setdefault(premise, set()).add(rule_id)
+        self.missing[rule_id] = sum(1 for premise in premises if premise not in self.closure)
+        if self.missing[rule_id] == 0:
+            self.__fire(rule_id)
+
+    def retract(self, sentence):
+        """
+        Remove a previously told fact or rule and withdraw the conclusions that lost their support.
+
+        Args:
+            sentence (str or HornForm): The sentence to remove.
+
+        Raises:
+            KeyError: If the sentence was never told.
+        """
+        sentence = self.__horn(sentence)
+        if not sentence.conjuncts:
+            count = self.facts.get(sentence.head, 0)
+            if count == 0:
+                raise KeyError(f"Fact not in knowledge base: {sentence.head}")
+            if count > 1:
+                self.facts[sentence.head] = count - 1
+                return
+            del self.facts[sentence.head]
+            self.__remove(sentence.head)
+            return
+
+        ids = self.rule_ids.get((sentence.head, frozenset(sentence.conjuncts)))
+        if not ids:
+            raise KeyError(f"Rule not in knowledge base: {'&'.join(sentence.conjuncts)}=>{sentence.head}")
+        rule_id = ids.pop()
+        if not ids:
+            del self.rule_ids[(sentence.head, frozenset(sentence.conjuncts))]
+        head, premises = self.rules.pop(rule_id)
+        self.heads[head].discard(rule_id)
+        for premise in premises:
+            self.watch[premise].discard(rule_id)
+        if self.missing.pop(rule_id) == 0:
+            self.__remove(head)
+
+    def ask(self, query):
+        """
+        Check whether a symbol is in the current closure.
+
+        Args:
+            query (str): The query symbol.
+
+        Returns:
+            bool: True if the query is entailed by the current knowledge base.
+        """
+        return query in self.closure
+
+    def solve(self, query):
+        """
+        Answer a query against the current closure.
+
+        Args:
+            query (str): The query symbol.
+
+        Returns:
+            str: "YES" if the query is entailed, otherwise "NO".
+        """
+        return "YES" if query in self.closure else "NO"
+
+    def __horn(self, sentence):
+        """
+        Parse a sentence into HornForm unless it already is one.
+
+        Args:
+            sentence (str or HornForm): The sentence.
+
+        Returns:
+            HornForm: The parsed sentence.
+        """
+        return sentence if isinstance(sentence, HornForm) else HornForm(sentence.replace(" ", ""))
+
+    def __fire(self, rule_id):
+        """
+        Derive the head of a rule whose premises are all in the closure.
+
+        Args:
+            rule_id (int): The rule.
+        """
+        head, premises = self.rules[rule_id]
+        if self.trace and head not in self.closure:
+            self.trace.emit('rule-fired', head=head, premises=list(premises))
+        self.__derive(head)
+
+    def __derive(self, symbol):
+        """
+        Add a symbol to the closure and propagate through the rules it is a premise of.
+
+        Args:
+            symbol (str): The newly entailed symbol.
+        """
+        queue = [symbol]
+        while queue:
+            p = queue.pop()
+            if p in self.closure:
+                continue
+            self.closure.add(p)
+            for rule_id in self.watch.get(p, ()):
+                self.missing[rule_id] -= 1
+                if self.missing[rule_id] == 0:
+                    head = self.rules[rule_id][0]
+                    if head not in self.closure:
+                        if self.trace:
+                            self.trace.emit('rule-fired', head=head, premises=list(self.rules[rule_id][1]))
+                        queue.append(head)
+
+    def __remove(self, symbol):
+        """
+        Withdraw a symbol that lost a support, then rederive whatever is still supported.
+
+        Args:
+            symbol (str): The symbol whose fact or rule was removed.
+        """
+        if symbol not in self.closure or symbol in self.facts:
+            return
+
+        deleted = []
+        queue = [symbol]
+        while queue:
+            p = queue.pop()
+            if p not in self.closure:
+                continue
+            self.closure.discard(p)
+            deleted.append(p)
+            for rule_id in self.watch.get(p, ()):
+                if self.missing[rule_id] == 0:
+                    queue.append(self.rules[rule_id][0])
+                self.missing[rule_id] += 1
+
+        for p in deleted:
+            if p in self.facts or any(self.missing[rule_id] == 0 for rule_id in self.heads.get(p, ())):
+                self.__derive(p)
+
+if __name__ == "__main__":
+    ifc = IncrementalForwardChaining()
+    for sentence in ["a", "a => b", "b => c", "b&c=>d", "d=>e"]:
+        ifc.tell(sentence)
+    print("Ask e:", ifc.solve("e"))
+    ifc.retract("a")
+    print("Ask e after retracting a:", ifc.solve("e"))
+    ifc.tell("c => b")
+    ifc.tell("c")
+    print("Ask e after telling c => b and c:", ifc.solve("e"))
@@ -1,12 +1,266 @@
+import os
 import sys
 from FileReader import FileReader
 from KnowledgeBase import KnowledgeBase
 from Sentence import Sentence
 from TruthTable import TruthTable
 from ForwardChaining import ForwardChaining
+from BitForwardChaining import BitForwardChaining
 from BackwardChaining import BackwardChaining
 from ResolutionProver import ResolutionProver
 from DPLL import DPLL
+from Tracer import Tracer
+from AutoSolver import AutoSolver
+from LocalSearch import LocalSearch
+from BDD import BDD
+from DDNNF import DDNNF
+from Slicer import Slicer
+from ResultCache import ResultCache
+from Budget import Budget, BudgetExceeded
+from Certificate import Certificate
+
+def option(name, default=None, start=3):
+    """
+    Reads an optional "--name=value" command line argument.
+
+    Args:
+        name (str): The option name without the leading dashes.
+        default (str): The value returned when the option is absent.
+        start (int): Index of the first argument after the positional ones.
+
+    Returns:
+        str: The option value.
+    """
+    prefix = "--" + name + "="
+    for arg in sys.argv[start:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
+
+METHODS = ['TT', 'FC', 'BC', 'RP', 'DPLL', 'AUTO', 'BDD', 'DDNNF', 'LS']
+SLICED_METHODS = ['TT', 'RP', 'DPLL']
+CNF_METHODS = ['DPLL', 'AUTO', 'LS']
+CERTIFIED_METHODS = ['RP', 'DPLL', 'LS']
+
+def run(method, tell, ask, debug=False, tracer=None, budget=None, heuristic="JW", order="APPEARANCE", sift=False, nnf=None, slice=False, symmetry=False, workers=None, bitmatrix=False, local_search=None, certificate=None):
+    """
+    Runs one inference method on a parsed problem.
+
+    Args:
+        method (str): The inference method, e.g. 'TT' or 'DPLL'.
+        tell (list of str): The knowledge base sentences.
+        ask (str): The query.
+        debug (bool): Debug mode for the Resolution Prover and DPLL.
+        tracer (Tracer): Receives engine events. Optional.
+        budget (Budget): Resource limits for the engine. Optional.
+        heuristic (str): DPLL branching heuristic.
+        order (str): BDD variable order.
+        sift (bool): Refine the BDD variable order by sifting.
+        nnf (str): File caching the compiled DDNNF circuit. Optional.
+        slice (bool): Solve TT, RP and DPLL on the query's cone of influence only.
+        symmetry (bool): Use symmetries of the problem in TT and DPLL.
+        workers (int): Saturate RP level by level with this many processes (0 for one per core). Optional.
+        bitmatrix (bool): Run FC over bit-packed rule sets in semi-naive rounds.
+        local_search (dict): LocalSearch keyword arguments for LS; when given, AUTO also tries
+            local search before DPLL. Optional.
+        certificate (str): File receiving a certificate of the answer, for one of CERTIFIED_METHODS. Optional.
+
+    Returns:
+        tuple: (answer, stats) where answer is the text printed for the method, or
+        "UNKNOWN: <reason>" if the budget ran out, and stats is a dict of engine statistics.
+
+    Raises:
+        ValueError: If the method is unknown, or a certificate is requested for another
+            method or together with slicing.
+    """
+    if certificate and method not in CERTIFIED_METHODS:
+        raise ValueError(f"Method {method} does not write certificates; use one of {', '.join(CERTIFIED_METHODS)}")
+    if certificate and slice:
+        raise ValueError("A certificate must cover the whole knowledge base, so it cannot be combined with slicing")
+    kb = KnowledgeBase(tell, 'GS')
+    engine = None
+    rest = []
+    certificate = Certificate(certificate) if certificate else None
+    try:
+        if slice and method in SLICED_METHODS:
+            kb, rest = Slicer(kb).slice(Sentence(ask))
+            if method != 'TT' and not Slicer.consistent(rest, budget):
+                return "YES", {'components': len(rest) + 1, 'cone_symbols': len(kb.symbols)}
+
+        if method == 'TT':
+            factor = Slicer.count(rest, budget) if rest else 1
+            if factor == 0:
+                return "YES: 0", {'models': 0}
+            engine = TruthTable(kb, tracer=tracer, budget=budget, symmetry=symmetry)
+            query = Sentence(ask)
+            answer = engine.solve(query)
+            if factor != 1 and answer.startswith("YES"):
+                answer = "YES: " + str(engine.count * factor)
+            return answer, dict(engine.stats, models=engine.count * factor)
+        elif method == 'FC':
+            try:
+                kb = KnowledgeBase(tell, 'HF')
+                if bitmatrix:
+                    engine = BitForwardChaining(kb, tracer=tracer, budget=budget)
+                    return engine.solve(ask), engine.stats
+                engine = ForwardChaining(kb, tracer=tracer, budget=budget)
+                return engine.solve(ask), {}
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                return f"Error: {e}. Ensure the knowledge base contains only Horn-form sentences.", {}
+        elif method == 'BC':
+            try:
+                kb = KnowledgeBase(tell, 'HF')
+                engine = BackwardChaining(kb, tracer=tracer, budget=budget)
+                return engine.solve(ask), {}
+            except BudgetExceeded:
+                raise
+            except Exception as e:
+                return f"Error: {e}. Ensure the knowledge base contains only Horn-form sentences.", {}
+        elif method == 'RP':
+            query = Sentence(ask)
+            engine = ResolutionProver(kb, query, debug=debug, tracer=tracer, budget=budget, workers=workers, certificate=certificate)
+            return "YES" if engine.solve() else "NO", dict(engine.context.stats, steps=engine.step)
+        elif method == 'DPLL':
+            query = Sentence(ask)
+            try:
+                engine = DPLL(kb, query, debug=debug, heuristic=heuristic, tracer=tracer, budget=budget, symmetry=symmetry,
+                              certificate=certificate)
+            except Exception as e:
+                return f"Error: {e}.", {}
+            return "YES" if engine.solve() else "NO", engine.stats
+        elif method == 'AUTO':
+            query = Sentence(ask)
+            engine = AutoSolver(kb, query, tracer=tracer, heuristic=heuristic, budget=budget, local_search=local_search)
+            return "YES" if engine.solve() else "NO", engine.stats
+        elif method == 'LS':
+            query = Sentence(ask)
+            try:
+                engine = LocalSearch(kb, query, tracer=tracer, budget=budget, certificate=certificate, **(local_search or {}))
+            except Exception as e:
+                return f"Error: {e}.", {}
+            entailed = engine.solve()
+            if entailed is None:
+                return f"{Budget.UNKNOWN}: no countermodel found in {engine.stats['tries']} tries", engine.stats
+            return "YES" if entailed else "NO", engine.stats
+        elif method == 'BDD':
+            query = Sentence(ask)
+            try:
+                engine = BDD(kb, query, order=order, sift=sift, tracer=tracer, budget=budget)
+            except Exception as e:
+                return f"Error: {e}.", {}
+            return engine.solve(), engine.stats
+        elif method == 'DDNNF':
+            query = Sentence(ask)
+            circuit = None
+            if nnf and os.path.exists(nnf):
+                circuit = DDNNF.load(nnf)
+                if circuit.kb_hash != DDNNF.hash_kb(kb):
+                    circuit = None
+            if circuit is None:
+                circuit = DDNNF.compile(kb, budget=budget)
+                if nnf:
+                    circuit.save(nnf)
+            return circuit.solve(query), circuit.stats
+        else:
+            raise ValueError(f"Unknown method: {method}")
+    except BudgetExceeded as e:
+        stats = dict(getattr(engine, 'stats', None) or {})
+        stats.update(e.stats)
+        return f"{Budget.UNKNOWN}: {e.reason}", stats
+    finally:
+        if certificate:
+            certificate.close()
+
+def run_cnf(method, cnf, query=(), debug=False, tracer=None, budget=None, heuristic="JW", symmetry=False, local_search=None,
+            certificate=None):
+    """
+    Runs a satisfiability based method on a clause store, e.g. one read from a DIMACS file.
+
+    Without query clauses the clause store is taken to be KB ∧ ¬query, as written by the
+    DIMACS export, so the answer is YES exactly when it is unsatisfiable. Otherwise it is
+    the KB and every query clause must be entailed: the KB together with the negated
+    literals of the clause must be unsatisfiable.
+
+    Args:
+        method (str): One of CNF_METHODS.
+        cnf (CNF): The clause store.
+        query (list of tuple of int): Query clauses; a conjunction of literals is a list of unit clauses.
+        debug (bool): Debug mode for DPLL.
+        tracer (Tracer): Receives engine events. Optional.
+        budget (Budget): Resource limits for the engine. Optional.
+        heuristic (str): DPLL branching heuristic.
+        symmetry (bool): Add symmetry-breaking clauses before the DPLL search.
+        local_search (dict): LocalSearch keyword arguments for LS, and to let AUTO try local search. Optional.
+        certificate (str): File receiving a certificate of the answer, for DPLL or LS without query clauses. Optional.
+
+    Returns:
+        tuple: (answer, stats) as for run.
+
+    Raises:
+        ValueError: If the method does not accept a clause store, or a certificate is
+            requested for another method or together with query clauses.
+    """
+    if certificate and (method not in CERTIFIED_METHODS or query):
+        raise ValueError("Certificates of DIMACS input are written by DPLL and LS, for a file without query clauses")
+    certificate = Certificate(certificate) if certificate else None
+    if method == 'DPLL':
+        engine = DPLL(None, None, debug=debug, heuristic=heuristic, tracer=tracer, budget=budget, symmetry=symmetry,
+                      certificate=certificate)
+    elif method == 'AUTO':
+        engine = AutoSolver(None, None, tracer=tracer, heuristic=heuristic, budget=budget, local_search=local_search)
+    elif method == 'LS':
+        engine = LocalSearch(None, None, tracer=tracer, budget=budget, certificate=certificate, **(local_search or {}))
+    else:
+        raise ValueError(f"Method {method} does not accept DIMACS input; use one of {', '.join(CNF_METHODS)}")
+    try:
+        checks = [cnf.assume(-literal for literal in clause) for clause in query] or [cnf]
+        unknown = False
+        for check in checks:
+            satisfiable = engine.satisfiable(check)
+            if satisfiable:
+                return "NO", engine.stats
+            unknown = unknown or satisfiable is None  # local search gave up
+        if unknown:
+            return f"{Budget.UNKNOWN}: no countermodel found in {engine.stats['tries']} tries", engine.stats
+        return "YES", engine.stats
+    except BudgetExceeded as e:
+        stats = dict(engine.stats)
+        stats.update(e.stats)
+        return f"{Budget.UNKNOWN}: {e.reason}", stats
+    finally:
+        if certificate:
+            certificate.close()
+
+def number(name, convert=int, start=3):
+    """
+    Reads an optional numeric "--name=value" command line argument.
+
+    Args:
+        name (str): The option name without the leading dashes.
+        convert (callable): Converts the option text, e.g. int or float.
+        start (int): Index of the first argument after the positional ones.
+
+    Returns:
+        int or float or None: The option value, or None if it is absent.
+    """
+    value = option(name, start=start)
+    return convert(value) if value is not None else None
+
+def local_search_options():
+    """
+    Collects the local search options given on the command line.
+
+    Returns:
+        dict or None: LocalSearch keyword arguments, or None if no local search option is given.
+    """
+    options = {'algorithm': option("local-search"), 'noise': number("noise", float),
+               'max_flips': number("flips"), 'restarts': number("restarts"), 'seed': number("seed")}
+    options = {name: value for name, value in options.items() if value is not None}
+    if not options and "--local-search" not in sys.argv:
+        return None
+    return options
 
 def main():
     """
@@ -14,13 +268,63 @@ def main():
     Reads the input file and determines which inference method to use.
     """
     if len(sys.argv) < 3:
-        print("Enter command in the following format: iengine method filename [-d]")
-        print("Methods: TT, FC, BC, RP")
+        print("Enter command in the following format: iengine method filename [-d] [-s] [--heuristic=JW] [--order=APPEARANCE] [--sift] [--nnf=file.nnf] [--slice] [--symmetry] [--workers=N] [--bitmatrix] [--local-search=PROBSAT] [--certificate=file.cert] [--cache=file.json] [--cache-size=N]")
+        print("    [--trace=file.jsonl] [--trace-buffer=N] [--noise=X] [--flips=N] [--restarts=N] [--seed=N]")
+        print("    [--timeout=SECONDS] [--memory=MB] [--max-clauses=N] [--max-models=N] [--max-decisions=N] [--max-nodes=N]")
+        print("    DIMACS input (.cnf): iengine DPLL|AUTO|LS file.cnf [--query=query.cnf] [--assume=1,-2]")
+        print("Methods: " + ", ".join(METHODS))
+        print("DPLL heuristics: FIXED, MOMS, JW, DLIS")
+        print("BDD orders: APPEARANCE, FREQUENCY, FORCE")
+        print("Local search algorithms: " + ", ".join(LocalSearch.ALGORITHMS))
         exit(0)
 
     debug_mode = "-d" in sys.argv
+    stats_mode = "-s" in sys.argv
     filename_index = 2
 
+    method = sys.argv[1]
+
+    tracer = None
+    if option("trace") or option("trace-buffer"):
+        capacity = option("trace-buffer")
+        tracer = Tracer(option("trace"), capacity=int(capacity) if capacity else None)
+    elif debug_mode:
+        tracer = Tracer.debug()
+
+    limits = {'time_limit': number("timeout", float), 'memory_limit': number("memory", float),
+              'clauses': number("max-clauses"), 'models': number("max-models"),
+              'decisions': number("max-decisions"), 'nodes': number("max-nodes")}
+    budget = Budget(**limits) if any(limit is not None for limit in limits.values()) else None
+
+    filename = sys.argv[filename_index]
+    if FileReader.is_dimacs(filename):
+        try:
+            cnf = FileReader.read_dimacs(filename)
+            query = FileReader.read_dimacs_query(option("query"), cnf) if option("query") else []
+            if option("assume"):
+                query += [(int(literal),) for literal in option("assume").split(",")]
+        except FileNotFoundError:
+            print("File not found.")
+            sys.exit(0)
+        except ValueError as e:
+            print(f"Error: {e}.")
+            sys.exit(0)
+        if method not in CNF_METHODS:
+            print("DIMACS input supports the methods: " + ", ".join(CNF_METHODS))
+        else:
+            try:
+                answer, stats = run_cnf(method, cnf, query, debug=debug_mode, tracer=tracer, budget=budget,
+                                        heuristic=option("heuristic", "JW"), symmetry="--symmetry" in sys.argv,
+                                        local_search=local_search_options(), certificate=option("certificate"))
+            except Exception as e:
+                answer, stats = f"Error: {e}.", {}
+            print(answer)
+            if stats_mode:
+                print("Stats:", stats)
+        if tracer:
+            tracer.close()
+        return
+
     try:
         tell, ask = FileReader.read(sys.argv[filename_index])
     except FileNotFoundError:
@@ -34,37 +338,37 @@ def main():
         print("No ask found.")
         sys.exit(0)
 
-    method = sys.argv[1]
-    kb = KnowledgeBase(tell, 'GS')
+    if method not in METHODS:
+        print("Unknown method entered.")
+    else:
+        def solve():
+            return run(method, tell, ask, debug=debug_mode, tracer=tracer, budget=budget,
+                       nnf=option("nnf"), certificate=option("certificate"), **options)
 
-    if method == 'TT':
-        tt = TruthTable(kb)
-        query = Sentence(ask)
-        print(tt.solve(query))
-    elif method == 'FC':
-        try:
-            kb = KnowledgeBase(tell, 'HF')
-            fc = ForwardChaining(kb)
-            print(fc.solve(ask))
-        except Exception as e:
-            print(f"Error: {e}. Ensure the knowledge base contains only Horn-form sentences.")
-    elif method == 'BC':
+        cache = None
         try:
-            kb = KnowledgeBase(tell, 'HF')
-            bc = BackwardChaining(kb)
-            print(bc.solve(ask))
-        except Exception as e:
-            print(f"Error: {e}. Ensure the knowledge base contains only Horn-form sentences.")
-    elif method == 'RP':
-        query = Sentence(ask)
-        rp = ResolutionProver(kb, query, debug=debug_mode)
-        print("YES" if rp.solve() else "NO")
-    elif method == 'DPLL':
-        query = Sentence(ask)
-        dpll = DPLL(kb, query, debug=debug_mode)
-        print("YES" if dpll.solve() else "NO")
-    else:
-        print("Unknown method entered.")
+            # the options that can change the answer or its statistics, so they are part of the cache key
+            options = {'heuristic': option("heuristic", "JW"), 'order': option("order", "APPEARANCE"),
+                       'sift': "--sift" in sys.argv, 'slice': "--slice" in sys.argv,
+                       'symmetry': "--symmetry" in sys.argv, 'workers': number("workers"),
+                       'bitmatrix': "--bitmatrix" in sys.argv, 'local_search': local_search_options()}
+            # a cached answer comes without a certificate or a compiled circuit file
+            if option("cache") and not option("certificate") and not option("nnf"):
+                cache = ResultCache(number("cache-size") or 1024, option("cache"))
+                answer, stats = cache.lookup(method, tell, ask, solve, options)
+                cache.save()
+            else:
+                answer, stats = solve()
+        except ValueError as e:
+            answer, stats = f"Error: {e}.", {}
+        print(answer)
+        if stats_mode:
+            print("Stats:", stats)
+            if cache:
+                print("Cache:", cache.info())
+
+    if tracer:
+        tracer.close()
 
 if __name__ == "__main__":
     main()
@@ -1,9 +1,15 @@
+from array import array
 from Sentence import Sentence
 from HornForm import HornForm
 
 class KnowledgeBase:
     """
     KnowledgeBase is used to store propositional logic statements and their corresponding symbols.
+
+    General sentences are kept as parsed Sentence objects. Horn-form sentences are parsed,
+    validated and then stored in compressed sparse row (CSR) form over interned symbol ids:
+    rule i has head `heads[i]` and premises `premises[offsets[i]:offsets[i + 1]]`, with facts
+    being rules without premises. The HornForm objects themselves are not kept.
     """
 
     def __init__(self, sentences, type):
@@ -16,11 +22,17 @@ class KnowledgeBase:
         """
         self.sentences = []
         self.symbols = []
+        self.ids = {}
         if type in ['HF', 'GS']:
             self.type = type
         else:
             raise Exception("Unknown sentence type.")
 
+        if self.type == 'HF':
+            self.heads = array('i')
+            self.offsets = array('i', [0])
+            self.premises = array('i')
+
         for sentence in sentences:
             self.tell(sentence)
 
@@ -33,11 +45,57 @@ class KnowledgeBase:
         """
         if self.type == 'HF':
             new = HornForm(sentence)
-        elif self.type == 'GS':
-            new = Sentence(sentence)
-        
+            self.premises.extend(dict.fromkeys(self.intern(symbol) for symbol in new.conjuncts))
+            self.offsets.append(len(self.premises))
+            self.heads.append(self.intern(new.head))
+            return
+
+        new = Sentence(sentence)
         self.sentences.append(new)
-        
         for symbol in new.symbols:
-            if symbol not in self.symbols:
-                self.symbols.append(symbol)
+            self.intern(symbol)
+
+    def intern(self, symbol):
+        """
+        Returns the id of a symbol, registering it in the symbol list when it is new.
+
+        Args:
+            symbol (str): The symbol name.
+
+        Returns:
+            int: The index of the symbol in self.symbols.
+        """
+        index = self.ids.get(symbol)
+        if index is None:
+            index = len(self.symbols)
+            self.symbols.append(symbol)
+            self.ids[symbol] = index
+        return index
+
+    @property
+    def num_rules(self):
+        """int: The number of Horn-form rules and facts."""
+        return len(self.heads)
+
+    def rule(self, index):
+        """
+        Returns a Horn-form rule by name.
+
+        Args:
+            index (int): The rule index.
+
+        Returns:
+            tuple: (head, premises) with the premises as a list of symbol names.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.symbols[self.heads[index]], [self.symbols[premise] for premise in self.premises[start:end]]
+
+    def rules(self):
+        """
+        Iterates over the Horn-form rules by name, in the order they were told.
+
+        Returns:
+            generator: (head, premises) tuples.
+        """
+        for index in range(len(self.heads)):
+            yield self.rule(index)
@@ -0,0 +1,205 @@
+import random
+from CNF import CNF
+
+class LocalSearch:
+    """
+    Stochastic local search for a countermodel: an assignment satisfying KB ∧ ¬query.
+
+    Every try starts from a random assignment and repeatedly flips one symbol of a random
+    clause that is still false. The break count of a symbol is the number of clauses that
+    would become false if it were flipped, i.e. the clauses in which its literal is the
+    only true one.
+
+    - WALKSAT: flips a symbol with break count zero if there is one; otherwise, with
+      probability noise, a random symbol of the clause, else one with the smallest break count.
+    - PROBSAT: flips a symbol of the clause with probability proportional to
+      (1 + break) ** -noise, so noise is the exponent cb of the polynomial break rule.
+
+    The search is incomplete: it can show that the query is not entailed by finding a
+    countermodel, which is checked against the original sentences, but it can never show
+    that the query is entailed.
+    """
+
+    ALGORITHMS = ['WALKSAT', 'PROBSAT']
+    NOISE = {'WALKSAT': 0.567, 'PROBSAT': 2.3}
+
+    def __init__(self, knowledge_base, query, algorithm='PROBSAT', noise=None, max_flips=100000, restarts=10,
+                 seed=None, tracer=None, budget=None, certificate=None):
+        """
+        Initialize the local search with a knowledge base and a query.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base of general sentences.
+            query (Sentence): The query sentence to be solved.
+            algorithm (str): 'WALKSAT' or 'PROBSAT'.
+            noise (float): The WalkSAT random walk probability or the ProbSAT exponent. Defaults to NOISE[algorithm].
+            max_flips (int): Flips per try before restarting from a new random assignment.
+            restarts (int): The number of restarts after the first try.
+            seed (int): Seed of the random generator, for reproducible runs. Optional.
+            tracer (Tracer): Receives start, restart, model and result events. Optional.
+            budget (Budget): Limits time, memory and total flips ('flips'). Optional.
+            certificate (Certificate): Receives the model found. Optional.
+
+        Raises:
+            ValueError: If the algorithm is unknown.
+        """
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unknown local search algorithm: {algorithm}; use one of {', '.join(self.ALGORITHMS)}")
+        self.kb = knowledge_base
+        self.query = query
+        self.algorithm = algorithm
+        self.noise = self.NOISE[algorithm] if noise is None else noise
+        self.max_flips = max_flips
+        self.restarts = restarts
+        self.random = random.Random(seed)
+        self.trace = tracer
+        self.budget = budget
+        self.certificate = certificate
+        self.model = None
+        self.stats = {'tries': 0, 'flips': 0, 'best': None}
+
+    def solve(self):
+        """
+        Search for a countermodel of the query.
+
+        Returns:
+            bool or None: False if a countermodel was found, so the query is not entailed;
+            True if KB ∧ ¬query simplifies to the empty clause; None if the search gave up.
+
+        Raises:
+            Exception: If a model of the clauses does not satisfy the original sentences.
+        """
+        satisfiable = self.satisfiable(CNF.from_kb(self.kb, self.query))
+        if satisfiable and not self.verify(self.model):
+            raise Exception("Local search model is not a countermodel of the query.")
+        return None if satisfiable is None else not satisfiable
+
+    def verify(self, model):
+        """
+        Check a countermodel against the original sentences.
+
+        Args:
+            model (dict): Truth value per symbol.
+
+        Returns:
+            bool: True if the model satisfies every KB sentence and falsifies the query.
+        """
+        model = dict(model)
+        for symbol in self.kb.symbols + self.query.symbols:
+            model.setdefault(symbol, False)
+        return all(sentence.solve(model) for sentence in self.kb.sentences) and not self.query.solve(model)
+
+    def satisfiable(self, cnf):
+        """
+        Search for a model of a clause store, leaving it in self.model.
+
+        Args:
+            cnf (CNF): The clause store.
+
+        Returns:
+            bool or None: True if a model was found, False if the store holds the empty
+            clause, None if every try ran out of flips.
+        """
+        self.model = None
+        self.stats = {'tries': 0, 'flips': 0, 'best': None}
+        if self.trace:
+            self.trace.emit('start', engine='LocalSearch', algorithm=self.algorithm, noise=self.noise,
+                            clauses=len(cnf.clauses), symbols=cnf.num_vars)
+        if self.certificate:
+            self.certificate.header(cnf.symbols)
+        if any(not clause for clause in cnf.clauses):
+            satisfiable = False
+            if self.certificate:
+                self.certificate.input(())
+        else:
+            satisfiable = self.search(cnf)
+            if satisfiable and self.certificate:
+                self.certificate.model(cnf.ids[name] if value else -cnf.ids[name] for name, value in self.model.items())
+        if self.trace:
+            answer = {True: "SATISFIABLE", False: "UNSATISFIABLE", None: "UNKNOWN"}[satisfiable]
+            self.trace.emit('result', answer=answer, stats=self.stats)
+        return satisfiable
+
+    def search(self, cnf):
+        """
+        Run the tries of the local search.
+
+        Args:
+            cnf (CNF): The clause store, without empty clauses.
+
+        Returns:
+            bool or None: True if a model was found, otherwise None.
+        """
+        n = cnf.num_vars
+        clauses = cnf.clauses
+        occurrences = [[] for _ in range(2 * n + 1)]  # literal l at index l, -l at index 2n+1-l
+        for index, clause in enumerate(clauses):
+            for literal in clause:
+                occurrences[literal].append(index)
+        rand = self.random
+        walksat = self.algorithm == 'WALKSAT'
+        weights = [(1 + b) ** -self.noise for b in range(max(map(len, occurrences)) + 1)]
+
+        for attempt in range(self.restarts + 1):
+            self.stats['tries'] += 1
+            if self.trace and attempt:
+                self.trace.emit('restart', tries=self.stats['tries'], flips=self.stats['flips'])
+            values = [False] + [rand.random() < 0.5 for _ in range(n)]
+            true_count = [sum(1 for literal in clause if values[abs(literal)] == (literal > 0)) for clause in clauses]
+            unsat = [index for index, count in enumerate(true_count) if count == 0]
+            position = [-1] * len(clauses)
+            for slot, index in enumerate(unsat):
+                position[index] = slot
+
+            for flip in range(self.max_flips + 1):
+                if self.stats['best'] is None or len(unsat) < self.stats['best']:
+                    self.stats['best'] = len(unsat)
+                if not unsat:
+                    self.model = {cnf.symbols[var - 1]: values[var] for var in range(1, n + 1)}
+                    if self.trace:
+                        self.trace.emit('model', model=self.model)
+                    return True
+                if flip == self.max_flips:
+                    break
+                self.stats['flips'] += 1
+                if self.budget:
+                    self.budget.check('flips', self.stats['flips'])
+
+                clause = clauses[unsat[rand.randrange(len(unsat))]]
+                breaks = [sum(1 for index in occurrences[-literal] if true_count[index] == 1) for literal in clause]
+                if walksat:
+                    least = min(breaks)
+                    if least and rand.random() < self.noise:
+                        literal = rand.choice(clause)
+                    else:
+                        literal = rand.choice([lit for lit, b in zip(clause, breaks) if b == least])
+                else:
+                    literal = rand.choices(clause, [weights[b] for b in breaks])[0]
+
+                # The literal is false, so flipping its symbol makes it true and -literal false.
+                var = abs(literal)
+                values[var] = not values[var]
+                for index in occurrences[literal]:
+                    true_count[index] += 1
+                    if true_count[index] == 1:
+                        last = unsat.pop()
+                        if last != index:
+                            unsat[position[index]] = last
+                            position[last] = position[index]
+                        position[index] = -1
+                for index in occurrences[-literal]:
+                    true_count[index] -= 1
+                    if true_count[index] == 0:
+                        position[index] = len(unsat)
+                        unsat.append(index)
+        return None
+
+if __name__ == "__main__":
+    from KnowledgeBase import KnowledgeBase
+    from Sentence import Sentence
+
+    kb = KnowledgeBase(["p => q", "q => r", "a || b", "~a || c"], 'GS')
+    search = LocalSearch(kb, Sentence("c"), seed=1)
+    print("Entailed:", search.solve())
+    print("Countermodel:", search.model)
+    print("Stats:", search.stats)
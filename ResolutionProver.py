@@ -1,22 +1,92 @@
+import os
+import multiprocessing
 from Sentence import Sentence
 from KnowledgeBase import KnowledgeBase
+from Tracer import Tracer
+from SolverContext import SolverContext
+from CNF import CNF
+from SharedKB import SharedKB
 import sympy
 from sympy.logic.boolalg import to_cnf, Not, Or, And, Implies, Equivalent
 
+def resolve_chunk(jobs):
+    """
+    Resolves clause pairs on a group of symbols; run in the worker processes of a saturation level.
+
+    Args:
+        jobs (list of tuple): (var, positives, negatives, start) where positives and negatives
+            are (index, clause) pairs of the clauses containing var and -var, and only pairs
+            with an index of at least start, i.e. a clause from the previous level, are resolved.
+            A clause of None is read from the frozen input clauses of the worker (SharedKB.worker).
+
+    Returns:
+        list of tuple: (left, right, resolvent) for the first derivation of every distinct
+        non-tautological resolvent, in order of symbol, then left index, then right index.
+    """
+    results = []
+    seen = set()
+    for var, positives, negatives, start in jobs:
+        positives = [(i, left or SharedKB.worker.clause(i)) for i, left in positives]
+        negatives = [(j, right or SharedKB.worker.clause(j)) for j, right in negatives]
+        for i, left in positives:
+            for j, right in negatives:
+                if i < start and j < start:
+                    continue
+                resolvent = set(left)
+                resolvent.discard(var)
+                resolvent.update(literal for literal in right if literal != -var)
+                if any(-literal in resolvent for literal in resolvent):
+                    continue
+                resolvent = tuple(sorted(resolvent, key=abs))
+                if resolvent not in seen:
+                    seen.add(resolvent)
+                    results.append((i, j, resolvent))
+    return results
+
 class ResolutionProver:
-    def __init__(self, kb, query, debug=False):
+    PARALLEL_PAIRS = 20000  # Levels with fewer candidate pairs are resolved in this process
+
+    def __init__(self, kb, query, debug=False, tracer=None, budget=None, workers=None, certificate=None):
         """
         Initialize the ResolutionProver with a knowledge base and a query.
 
+        The knowledge base is converted to clauses here, once. The clause list is never
+        modified afterwards, so further queries can be passed to solve, also concurrently
+        if each call has its own SolverContext.
+
         Args:
             kb (KnowledgeBase): The knowledge base consisting of propositional logic sentences.
             query (Sentence): The query sentence to be resolved.
             debug (bool): Flag to enable debug mode for detailed steps.
+            tracer (Tracer): Receives resolution events. Debug mode uses a text tracer on stdout.
+            budget (Budget): Limits time, memory and the number of clauses kept ('clauses'). Optional.
+            workers (int): Saturate level by level with this many processes (0 for one per core)
+                instead of the default given-clause search. Optional.
+            certificate (Certificate): Receives the input clauses and every resolvent kept, or a
+                countermodel when the clauses saturate. Certificates are written by the level
+                saturation, which is then used with one process if workers is not given. Optional.
         """
         self.kb = kb
         self.query = query
         self.debug = debug
-        self.step = 0
+        self.trace = tracer or (Tracer.debug() if debug else None)
+        self.budget = budget
+        self.workers = (os.cpu_count() or 1) if workers == 0 else workers
+        self.certificate = certificate
+        if certificate is not None and not self.workers:
+            self.workers = 1
+        self.context = SolverContext()
+        self.kb_clauses = self.parse_kb()
+
+    @property
+    def step(self):
+        """int: The number of resolution steps taken by the latest call to solve."""
+        return self.context.step
+
+    @property
+    def resolved_literals(self):
+        """set: The literals resolved upon by the latest call to solve."""
+        return self.context.resolved_literals
 
     def parse_kb(self):
         """
@@ -58,14 +128,18 @@ class ResolutionProver:
         else:
             return [cnf_expr]
 
-    def negate_query(self):
+    def negate_query(self, query=None):
         """
         Negate the query and convert it into CNF.
 
+        Args:
+            query (Sentence): The query sentence. Defaults to the query given at construction.
+
         Returns:
             list: A list of CNF clauses derived from the negated query.
         """
-        query_expr = self.query.to_sympy_expr(self.query.root[0])
+        query = query or self.query
+        query_expr = query.to_sympy_expr(query.root[0])
         if not self.is_cnf(query_expr):
             query_cnf = to_cnf(query_expr, simplify=True)
         else:
@@ -76,13 +150,14 @@ class ResolutionProver:
 
         return self.extract_clauses(negated_query_cnf)
 
-    def resolve(self, clause1, clause2):
+    def resolve(self, clause1, clause2, context):
         """
         Resolve two clauses to find their resolvents.
 
         Args:
             clause1 (sympy.Expr): The first clause.
             clause2 (sympy.Expr): The second clause.
+            context (SolverContext): The resolved literals and step count of the query.
 
         Returns:
             tuple: A tuple (is_resolved, resolvents) where is_resolved is True if a contradiction is found,
@@ -95,90 +170,255 @@ class ResolutionProver:
         for literal in clause1:
             complement = Not(literal)
             if complement in clause2:
-                if literal in self.resolved_literals or complement in self.resolved_literals:
+                if literal in context.resolved_literals or complement in context.resolved_literals:
                     continue
                 resolvent = (clause1 - {literal}) | (clause2 - {complement})
-                self.resolved_literals.add(literal)
-                self.resolved_literals.add(complement)
-                self.step += 1
-                if self.debug:
-                    if len(resolvent) == 0:
-                        print(f"{self.step}. Resolve {clause1} with {clause2} -> Contradiction: ∅")
-                    else:
-                        resolvent_expr = Or(*resolvent) if len(resolvent) > 1 else next(iter(resolvent))
-                        print(f"{self.step}. Resolve {clause1} with {clause2} -> Resolvent: {resolvent_expr}")
+                context.resolved_literals.add(literal)
+                context.resolved_literals.add(complement)
+                context.step += 1
+                if self.trace:
+                    self.trace.emit('resolvent', step=context.step, left=str(Or(*clause1)), right=str(Or(*clause2)),
+                                    resolvent=str(Or(*resolvent)) if resolvent else "∅")
                 if len(resolvent) == 0:
                     return True, []
                 resolvent_expr = Or(*resolvent) if len(resolvent) > 1 else next(iter(resolvent))
                 resolvents.append(resolvent_expr)
         return False, resolvents
 
-    def solve(self):
+    def solve(self, query=None, context=None):
         """
         Attempt to resolve the query using the resolution method.
 
+        Args:
+            query (Sentence): The query sentence. Defaults to the query given at construction.
+            context (SolverContext): Receives the step count and resolved literals. A new one is created if omitted.
+
         Returns:
             bool: True if the query is entailed by the knowledge base, False otherwise.
         """
-        clauses = self.parse_kb()
-        negated_query_clauses = self.negate_query()
+        context = context or SolverContext()
+        self.context = context
+        if self.workers:
+            return self.saturate(query or self.query, context)
+        clauses = list(self.kb_clauses)
+        negated_query_clauses = self.negate_query(query)
         clauses.extend(negated_query_clauses)
 
-        if self.debug:
-            print("-" * 40)
-            print("Initial clauses [in CNF]:")
-            print("-" * 40)
+        if self.trace:
+            self.trace.emit('start', engine='RP', clauses=len(clauses), symbols=len(self.kb.symbols))
             for clause in clauses:
-                print(clause)
-            print("-" * 40)
+                self.trace.emit('clause', clause=str(clause))
 
         new = set(negated_query_clauses)
         processed = set()
-        self.resolved_literals = set()
-
-        if self.debug:
-            print("Starting the Resolution Process")
-            print("-" * 40)
+        resolved_literals = context.resolved_literals
 
         while new:
             found_new_resolvents = False
             clause1 = new.pop()
             for clause2 in clauses:
+                if self.budget:
+                    self.budget.check('clauses', len(clauses) + len(new))
                 if clause1 == clause2 or clause1 in processed or clause2 in processed:
                     continue
-                is_resolved, resolvents = self.resolve(clause1, clause2)
+                is_resolved, resolvents = self.resolve(clause1, clause2, context)
                 if is_resolved:
-                    if self.debug:
-                        print("-" * 40)
-                        print(f"Since we have derived a contradiction (∅), the query {self.query.original} is entailed by the KB.")
-                        print("-" * 40)
+                    if self.trace:
+                        self.trace.emit('result', answer="YES", stats={'steps': context.step, 'reason': "empty clause"})
                     return True
                 for resolvent in resolvents:
                     if resolvent not in clauses and resolvent not in new:
                         if isinstance(resolvent, sympy.Symbol):
-                            all_resolved = resolvent in self.resolved_literals or Not(resolvent) in self.resolved_literals
+                            all_resolved = resolvent in resolved_literals or Not(resolvent) in resolved_literals
                         else:
-                            all_resolved = all(literal in self.resolved_literals or Not(literal) in self.resolved_literals for literal in resolvent.args)
+                            all_resolved = all(literal in resolved_literals or Not(literal) in resolved_literals for literal in resolvent.args)
                         
                         if all_resolved:
-                            if self.debug:
-                                print("-" * 40)
-                                print(f"All literals in the resolvent {resolvent} have already been resolved.")
-                                print(f"Since we have derived a contradiction (∅), the query {self.query.original} is entailed by the KB.")
-                                print("-" * 40)
+                            if self.trace:
+                                self.trace.emit('result', answer="YES", stats={'steps': context.step, 'reason': f"all literals of {resolvent} resolved"})
                             return True
                         new.add(resolvent)
                         found_new_resolvents = True
             if not found_new_resolvents:
-                if self.debug:
-                    print("-" * 40)
-                    print(f"No new clauses were generated. The query {self.query.original} is not proven.")
-                    print("-" * 40)
+                if self.trace:
+                    self.trace.emit('result', answer="NO", stats={'steps': context.step, 'reason': "no new clauses"})
                 return False
             clauses.append(clause1)
             processed.add(clause1)
         return False
 
+    def saturate(self, query, context):
+        """
+        Refute KB ∧ ¬query by level saturation, resolving each level in parallel.
+
+        Every level resolves all clause pairs that involve a clause added by the previous
+        level. The pairs are grouped by the symbol they are resolved on, using the literal
+        occurrence lists, and the groups are shared out among the worker processes. The
+        resolvents are merged in the order of the groups, so the clauses added, and the
+        proof, are the same for any number of workers. The input clauses are frozen into
+        shared memory once, when the pool starts, so the jobs only carry their indexes and
+        the clauses derived since. A resolvent is kept unless it is
+        already known or subsumed by a kept clause. Unlike the given-clause search this
+        procedure is complete: it stops with the empty clause exactly when the query is entailed.
+
+        Args:
+            query (Sentence): The query sentence.
+            context (SolverContext): Receives the number of resolvents kept.
+
+        Returns:
+            bool: True if the query is entailed by the knowledge base, False otherwise.
+        """
+        cnf = CNF.from_kb(self.kb, query)
+        clauses = []
+        known = set()
+        occurrences = {}
+        watched = {}
+        for clause in cnf.clauses:
+            self.keep(tuple(sorted(clause, key=abs)), clauses, known, occurrences, watched)
+        if self.trace:
+            self.trace.emit('start', engine='RP', clauses=len(clauses), symbols=cnf.num_vars, workers=self.workers)
+            for clause in clauses:
+                self.trace.emit('clause', clause=cnf.clause_str(clause))
+        if self.certificate:
+            self.certificate.header(cnf.symbols)
+            ids = [self.certificate.input(clause) for clause in clauses]
+        context.stats['levels'] = 0
+        if () in known:
+            return self.__saturated(True, context, "empty clause")
+
+        inputs = len(clauses)
+        pool = shared = None
+        try:
+            start = 0
+            while True:
+                if self.budget:
+                    self.budget.check('clauses', len(clauses))
+                groups = []
+                pairs = 0
+                for var in range(1, cnf.num_vars + 1):
+                    positives, negatives = occurrences.get(var, []), occurrences.get(-var, [])
+                    if positives and negatives and max(positives[-1], negatives[-1]) >= start:
+                        groups.append((var, positives, negatives))
+                        pairs += len(positives) * len(negatives)
+                parallel = self.workers > 1 and groups and pairs >= self.PARALLEL_PAIRS
+                if parallel and pool is None:
+                    cnf.clauses = clauses[:inputs]
+                    shared = SharedKB.freeze(self.kb, cnf)
+                    pool = multiprocessing.Pool(self.workers, initializer=SharedKB.attach_worker, initargs=(shared.handle,))
+                base = inputs if parallel else 0  # clauses the workers read from shared memory
+                jobs = [(var, [(i, clauses[i] if i >= base else None) for i in positives],
+                         [(j, clauses[j] if j >= base else None) for j in negatives], start)
+                        for var, positives, negatives in groups]
+                if parallel:
+                    size = -(-len(jobs) // (4 * self.workers))
+                    results = pool.map(resolve_chunk, [jobs[k:k + size] for k in range(0, len(jobs), size)])
+                else:
+                    results = [resolve_chunk(jobs)]
+
+                context.stats['levels'] += 1
+                level = len(clauses)
+                for chunk in results:
+                    for i, j, resolvent in chunk:
+                        if not self.keep(resolvent, clauses, known, occurrences, watched):
+                            continue
+                        if self.certificate:
+                            ids.append(self.certificate.resolvent(ids[i], ids[j]))
+                        context.step += 1
+                        if self.budget:
+                            self.budget.check('clauses', len(clauses))
+                        if self.trace:
+                            self.trace.emit('resolvent', step=context.step, left=cnf.clause_str(clauses[i]),
+                                            right=cnf.clause_str(clauses[j]), resolvent=cnf.clause_str(resolvent))
+                        if not resolvent:
+                            return self.__saturated(True, context, "empty clause")
+                if len(clauses) == level:
+                    if self.certificate:
+                        self.certificate.model(self.countermodel(clauses, cnf.num_vars))
+                    return self.__saturated(False, context, "saturated")
+                start = level
+        finally:
+            if pool is not None:
+                pool.terminate()
+                shared.close()
+                shared.unlink()
+
+    def keep(self, clause, clauses, known, occurrences, watched):
+        """
+        Add a clause unless it is already known or subsumed by a kept clause.
+
+        Every kept clause is also stored as a bit mask of its literals under its first
+        literal only. A clause subsuming the new one has its first literal in the new
+        clause, so only the masks under the new clause's literals need a subset test.
+
+        Args:
+            clause (tuple of int): The clause, sorted by symbol.
+            clauses (list of tuple): The kept clauses, indexed by position.
+            known (set of tuple): The kept clauses, for duplicate checks.
+            occurrences (dict): Literal to the indexes of the kept clauses containing it, ascending.
+            watched (dict): Literal to the masks of the kept clauses whose first literal it is.
+
+        Returns:
+            bool: True if the clause was added.
+        """
+        if clause in known:
+            return False
+        mask = 0
+        for literal in clause:
+            mask |= 1 << (2 * abs(literal) + (literal < 0))
+        for literal in clause:
+            for other in watched.get(literal, ()):
+                if other & mask == other:
+                    return False
+        index = len(clauses)
+        clauses.append(clause)
+        known.add(clause)
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(index)
+        if clause:
+            watched.setdefault(clause[0], []).append(mask)
+        return True
+
+    def countermodel(self, clauses, num_vars):
+        """
+        Build a model of a clause set closed under resolution that lacks the empty clause.
+
+        Symbols are set in order, each to false unless that falsifies a clause whose other
+        literals are on earlier symbols, which are all false then. If both values falsified
+        such a clause, their resolvent, or a clause subsuming it, would already be false.
+
+        Args:
+            clauses (list of tuple): The saturated clauses, each sorted by symbol.
+            num_vars (int): The number of symbols.
+
+        Returns:
+            list of int: The true literal of every symbol.
+        """
+        last = {}
+        for clause in clauses:
+            last.setdefault(abs(clause[-1]), []).append(clause)
+        values = [False] * (num_vars + 1)
+        for var in range(1, num_vars + 1):
+            values[var] = any(all(literal == var or values[abs(literal)] != (literal > 0) for literal in clause)
+                              for clause in last.get(var, ()) if clause[-1] == var)
+        return [var if values[var] else -var for var in range(1, num_vars + 1)]
+
+    def __saturated(self, entailed, context, reason):
+        """
+        Record the outcome of a saturation in the trace.
+
+        Args:
+            entailed (bool): The outcome.
+            context (SolverContext): The state of the query.
+            reason (str): Why the saturation stopped.
+
+        Returns:
+            bool: The outcome, unchanged.
+        """
+        if self.trace:
+            self.trace.emit('result', answer="YES" if entailed else "NO",
+                            stats={'steps': context.step, 'levels': context.stats['levels'], 'reason': reason})
+        return entailed
+
     def is_cnf(self, expr):
         """
         Check if a given SymPy expression is in CNF form.
@@ -0,0 +1,204 @@
+import os
+import json
+import hashlib
+from collections import OrderedDict
+from sympy.logic.boolalg import to_cnf
+from CNF import CNF
+from Sentence import Sentence
+
+class ResultCache:
+    """
+    Bounded LRU cache of inference results, optionally persisted to a JSON file.
+
+    Entries are keyed on the method, the options that can change the answer or its
+    statistics, the knowledge base and the query. Sentences are compared with whitespace
+    stripped; for the truth table, whose answer and model count depend only on the models
+    of the knowledge base, they are also sorted and deduplicated, so a reordered KB still
+    hits. Every other method keeps the sentences as given: forward and backward chaining
+    list the inferred symbols in rule order, the resolution prover's search depends on
+    clause order, the BDD node count on the variable order taken from the sentences, and
+    DPLL, AUTO, DDNNF and local search break ties by clause order. The query is
+    compared by its symbols and its sorted, deduplicated CNF clauses, so 'a & b' and
+    'b & a' share an entry.
+    """
+
+    UNORDERED_METHODS = ['TT']
+
+    def __init__(self, capacity=1024, path=None):
+        """
+        Initializes the cache, loading the entries saved at path if the file exists.
+
+        Args:
+            capacity (int): The maximum number of entries kept.
+            path (str): JSON file the cache is loaded from and saved to. Optional.
+        """
+        if capacity < 1:
+            raise Exception("Cache capacity must be at least 1.")
+        self.capacity = capacity
+        self.path = path
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        if path and os.path.exists(path):
+            self.load(path)
+
+    @staticmethod
+    def normalize_query(ask):
+        """
+        Normalizes a query to its symbols and its sorted, deduplicated CNF clauses.
+
+        The symbols are kept because a query naming a symbol outside the knowledge base
+        is answered differently even when it simplifies to the same clauses. A query that
+        does not parse is kept as text with whitespace stripped, so it still gets a key.
+
+        Args:
+            ask (str): The query.
+
+        Returns:
+            str: The normalized query.
+        """
+        try:
+            query = Sentence(ask)
+            cnf = CNF()
+            cnf.add_expr(to_cnf(query.to_sympy_expr(query.root[0])))
+        except Exception:
+            return ask.replace(" ", "")
+        clauses = sorted({"(" + "||".join(sorted(cnf.literal_name(literal) for literal in clause)) + ")"
+                          for clause in cnf.clauses})
+        return ",".join(sorted(set(query.symbols))) + ":" + "&".join(clauses)
+
+    @classmethod
+    def key(cls, method, tell, ask, options=None):
+        """
+        Computes the cache key of a problem.
+
+        Args:
+            method (str): The inference method.
+            tell (list of str): The knowledge base sentences.
+            ask (str): The query.
+            options (dict): The run keyword arguments that can change the answer or its
+                statistics, e.g. heuristic or slice. None and False values are
+                treated as absent. Optional.
+
+        Returns:
+            str: A hex digest of the normalized method, options, knowledge base and query.
+        """
+        sentences = [sentence.replace(" ", "") for sentence in tell]
+        if method in cls.UNORDERED_METHODS:
+            sentences = sorted(set(sentences))
+        options = {name: value for name, value in (options or {}).items()
+                   if value is not None and value is not False}
+        text = "\n".join([method, json.dumps(options, sort_keys=True, default=str),
+                          cls.normalize_query(ask)] + sentences)
+        return hashlib.sha1(text.encode()).hexdigest()
+
+    def get(self, method, tell, ask, options=None):
+        """
+        Looks up a result, marking it as the most recently used.
+
+        Args:
+            method (str): The inference method.
+            tell (list of str): The knowledge base sentences.
+            ask (str): The query.
+            options (dict): The answer-relevant run options, as for key. Optional.
+
+        Returns:
+            tuple or None: (answer, stats), or None on a miss.
+        """
+        key = self.key(method, tell, ask, options)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats['hits'] += 1
+        return entry[1], dict(entry[2])
+
+    def put(self, method, tell, ask, answer, stats, options=None):
+        """
+        Stores a result, evicting the least recently used entry when the cache is full.
+        Unknown answers and errors are not stored, since a rerun may succeed.
+
+        Args:
+            method (str): The inference method.
+            tell (list of str): The knowledge base sentences.
+            ask (str): The query.
+            answer (str): The answer text.
+            stats (dict): The engine statistics.
+            options (dict): The answer-relevant run options, as for key. Optional.
+        """
+        if not answer.startswith(("YES", "NO")):
+            return
+        key = self.key(method, tell, ask, options)
+        self.entries[key] = (method, answer, dict(stats))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def lookup(self, method, tell, ask, solve, options=None):
+        """
+        Returns the cached result of a problem, solving and storing it on a miss.
+
+        Args:
+            method (str): The inference method.
+            tell (list of str): The knowledge base sentences.
+            ask (str): The query.
+            solve (callable): Returns (answer, stats) for the problem when called without arguments.
+            options (dict): The answer-relevant run options solve uses, as for key. Optional.
+
+        Returns:
+            tuple: (answer, stats).
+        """
+        result = self.get(method, tell, ask, options)
+        if result is None:
+            result = solve()
+            self.put(method, tell, ask, *result, options)
+        return result
+
+    def info(self):
+        """
+        Returns the hit and miss statistics.
+
+        Returns:
+            dict: Hits, misses, evictions, the number of entries and the hit rate.
+        """
+        lookups = self.stats['hits'] + self.stats['misses']
+        info = dict(self.stats, size=len(self.entries))
+        info['hit_rate'] = round(self.stats['hits'] / lookups, 4) if lookups else 0.0
+        return info
+
+    def load(self, path):
+        """
+        Loads entries saved by save, keeping their recency order.
+
+        Args:
+            path (str): The JSON file.
+        """
+        with open(path) as f:
+            for key, method, answer, stats in json.load(f):
+                self.entries[key] = (method, answer, stats)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def save(self, path=None):
+        """
+        Writes the entries, least recently used first, replacing the file atomically.
+
+        Args:
+            path (str): The JSON file. Defaults to the path given at construction.
+        """
+        path = path or self.path
+        if not path:
+            return
+        temp = path + ".tmp"
+        with open(temp, 'w') as f:
+            json.dump([[key] + list(entry) for key, entry in self.entries.items()], f, default=str)
+        os.replace(temp, path)
+
+if __name__ == "__main__":
+    cache = ResultCache(capacity=2)
+    cache.put('TT', ["a", "a => b"], "b", "YES: 1", {'models': 1})
+    print(cache.get('TT', ["a=>b", "a"], "b"))
+    print(cache.get('FC', ["a", "a => b"], "b"))
+    print(cache.get('TT', ["a", "a => b"], "b", {'slice': True}))
+    print(cache.info())
@@ -10,6 +10,7 @@ class Sentence:
         Args:
             sentence (str): The propositional logic sentence to be parsed.
         """
+        self.text = sentence
         self.symbols = []
         self.root = []
         self.atomic = {}
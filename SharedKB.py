@@ -0,0 +1,375 @@
+import os
+import mmap
+import struct
+from array import array
+from multiprocessing import shared_memory
+from CNF import CNF
+
+class SharedKB:
+    """
+    A parsed knowledge base frozen into flat buffers that worker processes attach without copying.
+
+    Sending a KnowledgeBase to a worker pickles every Sentence with its atomic dict and
+    string lists. A frozen KB is one block of bytes instead, held in shared memory or in a
+    file mapped with mmap. A worker receives only its handle, a short tuple, and reads the
+    block in place through memoryviews, so attaching costs the same for any KB size and the
+    pages are shared by all workers.
+
+    The block starts with a header (magic, number of sections) and an (offset, length)
+    entry per section, followed by the sections, each 8-byte aligned:
+
+    - names: the symbol names, UTF-8, separated by newlines. Symbol i of this table is
+      Horn id i and CNF variable i + 1.
+    - heads, offsets, premises: the Horn-form rules in the CSR layout of KnowledgeBase;
+      empty for general sentences.
+    - clause_offsets, literals: clauses in CSR form, with DIMACS literals.
+    - program_offsets, program: one postfix program per general sentence. A code below
+      PUSH is an operator (NOT, AND, OR, IMPLIES, IFF); PUSH + i pushes the value of symbol i.
+
+    A frozen KB offers the attributes of a Horn-form KnowledgeBase (symbols, ids, heads,
+    offsets, premises, num_rules, rule), so ForwardChaining, BackwardChaining and
+    BitForwardChaining run on it directly.
+    """
+
+    MAGIC = b'SKB1'
+    SECTIONS = ['names', 'heads', 'offsets', 'premises', 'clause_offsets', 'literals', 'program_offsets', 'program']
+    NOT, AND, OR, IMPLIES, IFF = range(5)
+    PUSH = 5
+    OPERATORS = {'&': AND, '||': OR, '=>': IMPLIES, '<=>': IFF}
+
+    worker = None  # The frozen KB attached by attach_worker in a pool worker
+    engine = None  # The ForwardChaining engine built on it by attach_chaining_worker
+
+    def __init__(self, buffer, handle, owner=None):
+        """
+        Wraps a block written by freeze. Use freeze or attach rather than calling this directly.
+
+        Args:
+            buffer (memoryview): The block.
+            handle (tuple): ('shm', name) or ('file', path), passed to attach in other processes.
+            owner (object): The SharedMemory or mmap holding the block, closed by close.
+
+        Raises:
+            ValueError: If the block does not start with the SharedKB header.
+        """
+        self.buffer = buffer
+        self.handle = handle
+        self.owner = owner
+        magic, count = struct.unpack_from('<4sI', buffer, 0)
+        if magic != self.MAGIC or count != len(self.SECTIONS):
+            raise ValueError("Not a frozen knowledge base.")
+        self.views = {}
+        self.exports = []  # every view of the buffer, released by close
+        for index, name in enumerate(self.SECTIONS):
+            offset, length = struct.unpack_from('<qq', buffer, 8 + 16 * index)
+            view = buffer[offset:offset + length]
+            self.exports.append(view)
+            if name != 'names':
+                view = view.cast('i')
+                self.exports.append(view)
+            self.views[name] = view
+        self.type = 'HF' if len(self.views['offsets']) else 'GS'
+        self.heads = self.views['heads']
+        self.offsets = self.views['offsets']
+        self.premises = self.views['premises']
+        self._symbols = None
+        self._ids = None
+
+    @classmethod
+    def freeze(cls, kb, cnf=None, path=None):
+        """
+        Freezes a knowledge base into a new shared memory block, or into a file.
+
+        Args:
+            kb (KnowledgeBase): The knowledge base, Horn-form or general.
+            cnf (CNF): The clauses to store; their symbols must start with those of the KB.
+                Defaults to the CNF of a general KB, and to no clauses for a Horn-form KB.
+            path (str): File to write the block to and map, instead of shared memory. Optional.
+
+        Returns:
+            SharedKB: The frozen KB; its owner must call close and unlink when done.
+
+        Raises:
+            ValueError: If the CNF symbols do not start with the KB symbols.
+        """
+        if cnf is None:
+            cnf = CNF.from_kb(kb) if kb.type == 'GS' else CNF()
+        symbols = cnf.symbols if cnf.symbols else kb.symbols
+        if symbols[:len(kb.symbols)] != kb.symbols:
+            raise ValueError("The CNF symbols must start with the knowledge base symbols.")
+
+        clause_offsets, literals = array('i', [0]), array('i')
+        for clause in cnf.clauses:
+            literals.extend(clause)
+            clause_offsets.append(len(literals))
+        program_offsets, program = array('i', [0]), array('i')
+        if kb.type == 'GS':
+            for sentence in kb.sentences:
+                program.extend(cls.compile(sentence, kb.ids))
+                program_offsets.append(len(program))
+        horn = kb.type == 'HF'
+        sections = {'names': "\n".join(symbols).encode(),
+                    'heads': kb.heads if horn else array('i'),
+                    'offsets': kb.offsets if horn else array('i'),
+                    'premises': kb.premises if horn else array('i'),
+                    'clause_offsets': clause_offsets, 'literals': literals,
+                    'program_offsets': program_offsets, 'program': program}
+
+        table = []
+        position = 8 + 16 * len(cls.SECTIONS)
+        for name in cls.SECTIONS:
+            position += -position % 8
+            data = bytes(sections[name])
+            table.append((position, len(data), data))
+            position += len(data)
+        size = max(position, 1)
+
+        if path:
+            with open(path, 'w+b') as f:
+                f.truncate(size)
+                cls.write(f.fileno(), table, size)
+            return cls.attach(('file', path))
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        cls.write(memory.buf, table, size)
+        return cls(memory.buf, ('shm', memory.name), memory)
+
+    @classmethod
+    def write(cls, target, table, size):
+        """
+        Writes the header and sections of a block.
+
+        Args:
+            target (memoryview or int): A writable buffer, or the descriptor of a file of the block size.
+            table (list of tuple): (offset, length, data) per section, in SECTIONS order.
+            size (int): The block size.
+        """
+        if isinstance(target, int):
+            with mmap.mmap(target, size) as block:
+                cls.write(block, table, size)
+            return
+        struct.pack_into('<4sI', target, 0, cls.MAGIC, len(cls.SECTIONS))
+        for index, (offset, length, data) in enumerate(table):
+            struct.pack_into('<qq', target, 8 + 16 * index, offset, length)
+            target[offset:offset + length] = data
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Attaches to a frozen KB created by freeze, possibly in another process, without copying it.
+
+        Args:
+            handle (tuple): The handle of the frozen KB.
+
+        Returns:
+            SharedKB: A read-only view of the frozen KB.
+        """
+        kind, name = handle
+        if kind == 'file':
+            with open(name, 'rb') as f:
+                block = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return cls(memoryview(block), handle, block)
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  # Python before 3.13 has no track argument
+            memory = shared_memory.SharedMemory(name=name)
+        return cls(memory.buf, handle, memory)
+
+    @classmethod
+    def attach_worker(cls, handle):
+        """
+        Pool initializer attaching a worker process to a frozen KB, kept in SharedKB.worker.
+
+        Args:
+            handle (tuple): The handle of the frozen KB.
+        """
+        cls.worker = cls.attach(handle)
+
+    @classmethod
+    def attach_chaining_worker(cls, handle):
+        """
+        Pool initializer attaching a worker process to a frozen Horn-form KB and building its
+        forward chaining index once, kept in SharedKB.engine for query_worker.
+
+        Args:
+            handle (tuple): The handle of the frozen KB.
+        """
+        from ForwardChaining import ForwardChaining
+        cls.attach_worker(handle)
+        cls.engine = ForwardChaining(cls.worker)
+
+    @classmethod
+    def compile(cls, sentence, ids):
+        """
+        Compiles a parsed sentence into a postfix program.
+
+        Args:
+            sentence (Sentence): The sentence.
+            ids (dict): Symbol name to symbol id.
+
+        Returns:
+            list of int: The program codes.
+        """
+        program = []
+        stack = [(sentence.root[0], False)]
+        while stack:
+            key, expanded = stack.pop()
+            components = sentence.atomic.get(key)
+            if components is None:
+                program.append(cls.PUSH + ids[key.strip()])
+            elif expanded:
+                program.append(cls.NOT if len(components) == 2 else cls.OPERATORS[components[1]])
+            else:
+                stack.append((key, True))
+                operands = [components[1]] if len(components) == 2 else [components[0], components[2]]
+                stack.extend((operand, False) for operand in reversed(operands))
+        return program
+
+    @property
+    def symbols(self):
+        """list of str: The symbol names, decoded on first use."""
+        if self._symbols is None:
+            names = bytes(self.views['names']).decode()
+            self._symbols = names.split("\n") if names else []
+        return self._symbols
+
+    @property
+    def ids(self):
+        """dict: Symbol name to symbol id, built on first use."""
+        if self._ids is None:
+            self._ids = {symbol: index for index, symbol in enumerate(self.symbols)}
+        return self._ids
+
+    @property
+    def num_rules(self):
+        """int: The number of Horn-form rules and facts."""
+        return len(self.heads)
+
+    @property
+    def num_clauses(self):
+        """int: The number of stored clauses."""
+        return len(self.views['clause_offsets']) - 1
+
+    @property
+    def num_sentences(self):
+        """int: The number of compiled general sentences."""
+        return len(self.views['program_offsets']) - 1
+
+    def rule(self, index):
+        """
+        Returns a Horn-form rule by name.
+
+        Args:
+            index (int): The rule index.
+
+        Returns:
+            tuple: (head, premises) with the premises as a list of symbol names.
+        """
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.symbols[self.heads[index]], [self.symbols[premise] for premise in self.premises[start:end]]
+
+    def clause(self, index):
+        """
+        Returns a stored clause.
+
+        Args:
+            index (int): The clause index.
+
+        Returns:
+            tuple of int: The DIMACS literals of the clause.
+        """
+        offsets = self.views['clause_offsets']
+        return tuple(self.views['literals'][offsets[index]:offsets[index + 1]])
+
+    def evaluate(self, values, index=None):
+        """
+        Evaluates the compiled sentences under an assignment.
+
+        Args:
+            values (sequence): A truth value per symbol id, e.g. a bytearray.
+            index (int): Evaluate only this sentence. Optional.
+
+        Returns:
+            bool: True if every sentence (or the given one) is true.
+        """
+        offsets, program = self.views['program_offsets'], self.views['program']
+        sentences = range(self.num_sentences) if index is None else [index]
+        for sentence in sentences:
+            stack = []
+            for code in program[offsets[sentence]:offsets[sentence + 1]]:
+                if code >= self.PUSH:
+                    stack.append(bool(values[code - self.PUSH]))
+                elif code == self.NOT:
+                    stack.append(not stack.pop())
+                else:
+                    right, left = stack.pop(), stack.pop()
+                    if code == self.AND:
+                        stack.append(left and right)
+                    elif code == self.OR:
+                        stack.append(left or right)
+                    elif code == self.IMPLIES:
+                        stack.append(not left or right)
+                    else:
+                        stack.append(left == right)
+            if not stack.pop():
+                return False
+        return True
+
+    def close(self):
+        """
+        Releases this process's view of the block.
+        """
+        self.heads = self.offsets = self.premises = None
+        for view in reversed(self.exports):
+            view.release()
+        self.views = {}
+        self.exports = []
+        self.buffer.release()
+        if self.owner is not None:
+            self.owner.close()
+            self.owner = None
+
+    def unlink(self):
+        """
+        Frees the block once every process has closed it. Called by the process that froze it.
+        """
+        kind, name = self.handle
+        if kind == 'file':
+            os.remove(name)
+        else:
+            memory = shared_memory.SharedMemory(name=name)
+            memory.close()
+            memory.unlink()
+
+def query_worker(query):
+    """
+    Answers a query by forward chaining on the frozen KB of a pool worker started with
+    SharedKB.attach_chaining_worker, reusing the engine built there.
+
+    Args:
+        query (str): The query symbol.
+
+    Returns:
+        str: The forward chaining answer.
+    """
+    return SharedKB.engine.solve(query)
+
+if __name__ == "__main__":
+    import multiprocessing
+    from KnowledgeBase import KnowledgeBase
+
+    tell = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+    frozen = SharedKB.freeze(KnowledgeBase(tell, 'HF'))
+    with multiprocessing.Pool(2, initializer=SharedKB.attach_chaining_worker, initargs=(frozen.handle,)) as pool:
+        print(pool.map(query_worker, ["d", "f", "h"]))
+    frozen.close()
+    frozen.unlink()
+
+    kb = KnowledgeBase(["a => b", "~b || c", "(a & c) <=> d"], 'GS')
+    frozen = SharedKB.freeze(kb)
+    values = bytearray(len(kb.symbols))
+    for symbol in ["a", "b", "c", "d"]:
+        values[kb.ids[symbol]] = 1
+    print("Clauses:", [frozen.clause(index) for index in range(frozen.num_clauses)])
+    print("Model satisfies KB:", frozen.evaluate(values))
+    frozen.close()
+    frozen.unlink()
@@ -0,0 +1,139 @@
+from KnowledgeBase import KnowledgeBase
+from CNF import CNF
+from DPLL import DPLL
+from TruthTable import TruthTable
+
+class Slicer:
+    """
+    Relevance analysis splitting a knowledge base into independent components.
+
+    Two sentences are connected when they share a symbol; the connected components of this
+    sentence-symbol graph share no symbols, so the models of the knowledge base are exactly
+    the combinations of the models of its components. The query's cone of influence is the
+    union of the components mentioning a query symbol. Whether the query is entailed depends
+    only on the cone, provided every other component is satisfiable; if one is not, the
+    whole knowledge base is unsatisfiable and entails everything.
+    """
+
+    def __init__(self, knowledge_base):
+        """
+        Groups the sentences of a knowledge base into connected components.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base of general sentences.
+        """
+        self.kb = knowledge_base
+        parent = list(range(len(self.kb.symbols)))
+
+        def find(symbol):
+            while parent[symbol] != symbol:
+                parent[symbol] = parent[parent[symbol]]
+                symbol = parent[symbol]
+            return symbol
+
+        for sentence in self.kb.sentences:
+            ids = [self.kb.ids[symbol] for symbol in sentence.symbols]
+            for symbol in ids[1:]:
+                a, b = find(ids[0]), find(symbol)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+        self.component = [find(symbol) for symbol in range(len(self.kb.symbols))]
+        self.groups = {}
+        for index, sentence in enumerate(self.kb.sentences):
+            if sentence.symbols:
+                root = self.component[self.kb.ids[sentence.symbols[0]]]
+            else:
+                root = -1  # a sentence without symbols is its own component
+            self.groups.setdefault(root, []).append(index)
+
+    def components(self):
+        """
+        Returns the independent components in order of their first sentence.
+
+        Returns:
+            list of KnowledgeBase: One knowledge base per component.
+        """
+        return [self.part(indices) for indices in self.groups.values()]
+
+    def part(self, indices):
+        """
+        Builds a knowledge base from some of the sentences, without parsing them again.
+
+        Args:
+            indices (list of int): Sentence indices, in KB order.
+
+        Returns:
+            KnowledgeBase: The knowledge base holding those sentences.
+        """
+        kb = KnowledgeBase([], 'GS')
+        for index in indices:
+            sentence = self.kb.sentences[index]
+            kb.sentences.append(sentence)
+            for symbol in sentence.symbols:
+                kb.intern(symbol)
+        return kb
+
+    def slice(self, query):
+        """
+        Splits the knowledge base into the query's cone of influence and the other components.
+
+        Args:
+            query (Sentence): The query sentence.
+
+        Returns:
+            tuple: (cone, rest) where cone is a KnowledgeBase of the sentences connected to
+            the query and rest is a list of KnowledgeBase, one per remaining component.
+        """
+        roots = {self.component[self.kb.ids[symbol]] for symbol in query.symbols if symbol in self.kb.ids}
+        cone = []
+        rest = []
+        for root, indices in self.groups.items():
+            if root in roots:
+                cone.extend(indices)
+            else:
+                rest.append(self.part(indices))
+        return self.part(sorted(cone)), rest
+
+    @staticmethod
+    def consistent(parts, budget=None):
+        """
+        Checks that every component has a model, so it can be pruned from an entailment check.
+
+        Args:
+            parts (list of KnowledgeBase): The components.
+            budget (Budget): Limits time and memory. Optional.
+
+        Returns:
+            bool: True if every component is satisfiable.
+        """
+        return all(DPLL(part, None, budget=budget).satisfiable(CNF.from_kb(part)) for part in parts)
+
+    @staticmethod
+    def count(parts, budget=None):
+        """
+        Counts the models of a set of independent components by enumerating each on its own.
+
+        Args:
+            parts (list of KnowledgeBase): The components.
+            budget (Budget): Limits time, memory and assignments per component ('models'). Optional.
+
+        Returns:
+            int: The product of the component model counts.
+        """
+        total = 1
+        for part in parts:
+            total *= len(TruthTable(part, budget=budget).satisfying_models())
+            if total == 0:
+                break
+        return total
+
+if __name__ == "__main__":
+    from Sentence import Sentence
+
+    kb = KnowledgeBase(["p => q", "q => r", "p", "a || b", "c & d => e", "e => c"], 'GS')
+    cone, rest = Slicer(kb).slice(Sentence("r"))
+    print("Cone:", cone.symbols)
+    print("Other components:", [part.symbols for part in rest])
+    print("Other components satisfiable:", Slicer.consistent(rest))
+    print("Models of other components:", Slicer.count(rest))
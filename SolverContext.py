@@ -0,0 +1,26 @@
+class SolverContext:
+    """
+    The mutable state of one query.
+
+    ForwardChaining, BackwardChaining, TruthTable and ResolutionProver keep only the
+    preprocessed, read-only form of the knowledge base. Everything a solve call changes
+    lives in a context, so one engine can answer any number of queries, also from several
+    threads at once, as long as every call has its own context. Engines create a fresh
+    context when none is given and keep a reference to the last one, so their inferred,
+    count and step attributes still describe the latest call.
+    """
+
+    def __init__(self, **arrays):
+        """
+        Initializes an empty context.
+
+        Args:
+            **arrays: Engine specific per-query scratch arrays, e.g. proved=bytearray(n).
+        """
+        self.inferred = []  # Symbols in the order they were inferred (FC, BC)
+        self.count = 0  # Models of the knowledge base (TT)
+        self.step = 0  # Resolution steps (RP)
+        self.resolved_literals = set()  # Literals already resolved upon (RP)
+        self.stats = {}  # Engine specific counters
+        for name, value in arrays.items():
+            setattr(self, name, value)
@@ -0,0 +1,227 @@
+from CNF import CNF
+
+class Symmetry:
+    """
+    Symmetry detection and lex-leader symmetry breaking for a clause store.
+
+    A symmetry is a permutation of the symbols that maps the clause set onto itself, so it
+    maps models to models. Symmetries are found as automorphisms of the clause-literal
+    graph: one vertex per literal and per clause, an edge from every clause to its literals
+    and from every literal to its negation. Positive literals, negative literals and clauses
+    start with different colours, so only plain symbol permutations are found.
+
+    Colours are refined until every vertex of a colour has the same number of neighbours of
+    each colour. To map symbol x to symbol y, x and y are given a fresh colour in two copies
+    of the graph which are refined side by side, individualizing further vertices until
+    every colour class is a single vertex; the matching colours give the permutation, which
+    is then checked against the clauses. The search does not backtrack, so it may miss
+    symmetries, but every generator it reports is a real symmetry.
+    """
+
+    def __init__(self, cnf, colors=None, max_generators=64, budget=None):
+        """
+        Detects symmetry generators of a clause store.
+
+        Args:
+            cnf (CNF): The clause store.
+            colors (list of int): A colour per clause; only permutations mapping every clause
+                to a clause of the same colour are found. Optional.
+            max_generators (int): Stop after this many generators.
+            budget (Budget): Limits time and memory. Optional.
+        """
+        self.cnf = cnf
+        self.budget = budget
+        self.generators = []
+        n = cnf.num_vars
+        self.size = 2 * n + len(cnf.clauses)
+        self.adjacency = [[] for _ in range(self.size)]
+        for var in range(1, n + 1):
+            self.adjacency[self.node(var)].append(self.node(-var))
+            self.adjacency[self.node(-var)].append(self.node(var))
+        for index, clause in enumerate(cnf.clauses):
+            for literal in clause:
+                self.adjacency[2 * n + index].append(self.node(literal))
+                self.adjacency[self.node(literal)].append(2 * n + index)
+
+        clause_colors = colors or [0] * len(cnf.clauses)
+        initial = [0, 1] * n + [2 + color for color in clause_colors]
+        self.colors = self.refine(initial)[0]
+        self.clause_colors = {}
+        for clause, color in zip(cnf.clauses, clause_colors):
+            self.clause_colors.setdefault(frozenset(clause), set()).add(color)
+
+        parent = list(range(n + 1))
+
+        def find(var):
+            while parent[var] != var:
+                parent[var] = parent[parent[var]]
+                var = parent[var]
+            return var
+
+        for x in range(1, n + 1):
+            for y in range(x + 1, n + 1):
+                if len(self.generators) >= max_generators:
+                    break
+                if self.colors[self.node(x)] != self.colors[self.node(y)] or find(x) == find(y):
+                    continue
+                if self.budget:
+                    self.budget.check()
+                permutation = self.search(x, y)
+                if permutation is not None:
+                    self.generators.append(permutation)
+                    for var, image in permutation.items():
+                        parent[find(var)] = find(image)
+
+        self.stats = {'generators': len(self.generators),
+                      'symmetric_symbols': len({var for generator in self.generators for var in generator})}
+
+    def node(self, literal):
+        """
+        Maps a literal to its vertex.
+
+        Args:
+            literal (int): The encoded literal.
+
+        Returns:
+            int: The vertex index.
+        """
+        return 2 * (abs(literal) - 1) + (literal < 0)
+
+    def refine(self, left, right=None):
+        """
+        Refines one colouring, or two side by side with a shared colour naming.
+
+        Args:
+            left (list of int): A colour per vertex.
+            right (list of int): A second colouring refined in step with the first. Optional.
+
+        Returns:
+            tuple: The refined colourings (right is None when not given), or None if the two
+            colourings stop having the same number of vertices of every colour.
+        """
+        sides = [left] if right is None else [left, right]
+        count = len(set(left))
+        while True:
+            signatures = [[(colors[v], tuple(sorted(colors[w] for w in self.adjacency[v]))) for v in range(self.size)]
+                          for colors in sides]
+            if right is not None and sorted(signatures[0]) != sorted(signatures[1]):
+                return None
+            names = {signature: index for index, signature in enumerate(sorted(set(signatures[0])))}
+            sides = [[names[signature] for signature in side] for side in signatures]
+            if len(names) == count:
+                return sides[0], sides[1] if right is not None else None
+            count = len(names)
+
+    def search(self, x, y):
+        """
+        Looks for a symmetry mapping symbol x to symbol y.
+
+        Args:
+            x (int): The source symbol.
+            y (int): The target symbol.
+
+        Returns:
+            dict or None: The permutation as {symbol: image} for the moved symbols, or None.
+        """
+        fresh = self.size
+        left, right = list(self.colors), list(self.colors)
+        left[self.node(x)] = right[self.node(y)] = fresh
+        refined = self.refine(left, right)
+        while refined is not None and len(set(refined[0])) < self.size:
+            left, right = refined
+            members = {}
+            for v, color in enumerate(left):
+                members.setdefault(color, []).append(v)
+            color = min(color for color, vertices in members.items() if len(vertices) > 1)
+            a = members[color][0]
+            refined = None
+            for b in (v for v in range(self.size) if right[v] == color):
+                left_try, right_try = list(left), list(right)
+                left_try[a] = right_try[b] = fresh
+                refined = self.refine(left_try, right_try)
+                if refined is not None:
+                    break
+        if refined is None:
+            return None
+
+        image = {color: v for v, color in enumerate(refined[1])}
+        permutation = {}
+        for var in range(1, self.cnf.num_vars + 1):
+            target = image[refined[0][self.node(var)]] // 2 + 1
+            if target != var:
+                permutation[var] = target
+        return permutation if permutation and self.preserves(permutation) else None
+
+    def preserves(self, permutation):
+        """
+        Checks that a permutation maps every clause to a clause of the same colour.
+
+        Args:
+            permutation (dict): {symbol: image} for the moved symbols.
+
+        Returns:
+            bool: True if the permutation is a symmetry.
+        """
+        for clause, colors in self.clause_colors.items():
+            image = frozenset(permutation.get(abs(literal), abs(literal)) * (1 if literal > 0 else -1) for literal in clause)
+            if image not in self.clause_colors or self.clause_colors[image] != colors:
+                return False
+        return True
+
+    def orbits(self):
+        """
+        Groups the symbols into orbits of the group generated by the generators.
+
+        Returns:
+            list of list of int: The orbits with more than one symbol.
+        """
+        orbit = {}
+        for generator in self.generators:
+            for var, image in generator.items():
+                a, b = orbit.setdefault(var, {var}), orbit.setdefault(image, {image})
+                if a is not b:
+                    a |= b
+                    for member in b:
+                        orbit[member] = a
+        unique = {id(members): sorted(members) for members in orbit.values()}
+        return sorted(unique.values())
+
+    def break_symmetries(self):
+        """
+        Adds lex-leader symmetry-breaking clauses for every generator.
+
+        For a generator g over the moved symbols v1 < v2 < ... < vk, the clauses require the
+        assignment to be lexicographically no larger than its image under g (false < true):
+        v1 <= g(v1), and vi <= g(vi) whenever vj = g(vj) for every j < i. An auxiliary symbol
+        per position records that the prefix is equal. Every class of symmetric assignments
+        keeps its lex-smallest member, so satisfiability is preserved.
+
+        Returns:
+            CNF: A copy of the clause store with the extra clauses and auxiliary symbols.
+        """
+        cnf = CNF()
+        for name in self.cnf.symbols:
+            cnf.intern(name)
+        cnf.clauses = list(self.cnf.clauses)
+        for number, generator in enumerate(self.generators, 1):
+            previous = None
+            for position, var in enumerate(sorted(generator), 1):
+                image = generator[var]
+                guard = [-previous] if previous else []
+                cnf.add_clause(guard + [-var, image])
+                equal = cnf.intern(f"#sb{number}_{position}")
+                cnf.add_clause(guard + [-var, -image, equal])
+                cnf.add_clause(guard + [var, image, equal])
+                previous = equal
+        self.stats['sbp_clauses'] = len(cnf.clauses) - len(self.cnf.clauses)
+        return cnf
+
+if __name__ == "__main__":
+    from KnowledgeBase import KnowledgeBase
+
+    # Three pigeons, two holes: p<i><j> means pigeon i sits in hole j.
+    tell = ["p11 || p12", "p21 || p22", "p31 || p32"]
+    tell += [f"~p{i}{j} || ~p{k}{j}" for j in (1, 2) for i in (1, 2, 3) for k in (1, 2, 3) if i < k]
+    symmetry = Symmetry(CNF.from_kb(KnowledgeBase(tell, 'GS')))
+    print("Generators:", [{symmetry.cnf.symbols[v - 1]: symmetry.cnf.symbols[w - 1] for v, w in g.items()} for g in symmetry.generators])
+    print("Orbits:", [[symmetry.cnf.symbols[v - 1] for v in orbit] for orbit in symmetry.orbits()])
@@ -0,0 +1,75 @@
+import sys
+import json
+from collections import Counter
+from Tracer import Tracer
+
+class TraceReplay:
+    """
+    Offline reader for JSONL traces written by Tracer, used to replay or summarise a run
+    without solving the problem again.
+    """
+
+    def __init__(self, filename):
+        """
+        Loads a trace file.
+
+        Args:
+            filename (str): Path to a JSONL trace.
+        """
+        self.events = []
+        with open(filename) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    self.events.append(json.loads(line))
+
+    def replay(self, events=None, out=sys.stdout):
+        """
+        Prints the events in the same readable form as debug mode.
+
+        Args:
+            events (list of str): Only replay these event types. Optional.
+            out (file): Output stream.
+        """
+        for record in self.events:
+            if events is None or record['event'] in events:
+                out.write(f"[{record['seq']} {record['t']:.6f}s] {Tracer.format(record)}\n")
+
+    def summary(self):
+        """
+        Summarises the trace: event counts, time span, search depth and the final result.
+
+        Returns:
+            dict: The summary.
+        """
+        counts = Counter(record['event'] for record in self.events)
+        levels = [record['level'] for record in self.events if record['event'] in ('decision', 'backtrack')]
+        result = next((record for record in reversed(self.events) if record['event'] == 'result'), None)
+        summary = {
+            'events': len(self.events),
+            'span': round(self.events[-1]['t'] - self.events[0]['t'], 6) if self.events else 0,
+            'counts': dict(counts.most_common()),
+            'max_level': max(levels, default=0),
+        }
+        if self.events and self.events[0]['seq'] != 1:
+            summary['dropped'] = self.events[0]['seq'] - 1
+        if result is not None:
+            summary['result'] = result.get('answer')
+            summary['stats'] = result.get('stats')
+        return summary
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Enter command in the following format: python TraceReplay.py tracefile [--summary] [--events=decision,conflict]")
+        exit(0)
+
+    trace = TraceReplay(sys.argv[1])
+    if "--summary" in sys.argv:
+        for key, value in trace.summary().items():
+            print(f"{key}: {value}")
+    else:
+        selected = None
+        for arg in sys.argv[2:]:
+            if arg.startswith("--events="):
+                selected = arg[len("--events="):].split(",")
+        trace.replay(selected)
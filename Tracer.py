@@ -0,0 +1,128 @@
+import sys
+import json
+import time
+from collections import deque
+
+class Tracer:
+    """
+    Structured event tracer shared by the inference engines.
+
+    Engines hold either a Tracer or None and guard every emission with `if self.trace:`,
+    so a disabled trace costs a single branch and none of the event fields are built.
+    Events are typed records (decision, propagate, pure, conflict, backtrack, resolvent,
+    rule-fired, model, result, ...) carrying a sequence number and a timestamp. They are
+    streamed as JSONL to a file, kept in a bounded ring buffer, or printed as text for
+    debug mode.
+    """
+
+    TEMPLATES = {
+        'start': "Starting {engine} with {clauses} clauses over {symbols} symbols",
+        'clause': "  {clause}",
+        'decision': "Decision {level}: {literal}",
+        'propagate': "  Unit clause {clause}: propagating {literal}",
+        'pure': "  Pure literal {literal}",
+        'conflict': "  Conflict in clause {clause}",
+        'backtrack': "Backtrack to level {level}: trying {literal}",
+        'resolvent': "{step}. Resolve {left} with {right} -> {resolvent}",
+        'rule-fired': "Rule fired: {premises} => {head}",
+        'model': "Model: {model}",
+        'result': "Result: {answer} {stats}",
+    }
+
+    def __init__(self, path=None, capacity=None, text=False, stream=None):
+        """
+        Initializes the tracer.
+
+        Args:
+            path (str): JSONL file to write to. With a capacity the buffer is written on close.
+            capacity (int): Keep only the last `capacity` events in a ring buffer.
+            text (bool): Print events in human readable form instead of JSON.
+            stream (file): Output stream for text or JSON events when no path is given.
+        """
+        self.path = path
+        self.text = text
+        self.seq = 0
+        self.start = time.perf_counter()
+        self.buffer = deque(maxlen=capacity) if capacity else None
+        self.out = None
+        self.closed = False
+        if self.buffer is None:
+            self.out = open(path, 'w') if path else (stream or sys.stdout)
+
+    @classmethod
+    def debug(cls):
+        """
+        Returns a tracer printing readable events to stdout, used by the -d flag.
+
+        Returns:
+            Tracer: The tracer.
+        """
+        return cls(text=True)
+
+    def emit(self, event, **fields):
+        """
+        Records one event.
+
+        Args:
+            event (str): The event type.
+            **fields: Event payload. Values must be JSON serialisable.
+        """
+        self.seq += 1
+        record = {'seq': self.seq, 't': round(time.perf_counter() - self.start, 6), 'event': event}
+        record.update(fields)
+        if self.buffer is not None:
+            self.buffer.append(record)
+        else:
+            self.write(record, self.out)
+
+    def write(self, record, out):
+        """
+        Writes one event record to an output stream.
+
+        Args:
+            record (dict): The event record.
+            out (file): The output stream.
+        """
+        if self.text:
+            out.write(self.format(record) + "\n")
+        else:
+            out.write(json.dumps(record) + "\n")
+
+    @classmethod
+    def format(cls, record):
+        """
+        Formats an event record as a readable line.
+
+        Args:
+            record (dict): The event record.
+
+        Returns:
+            str: The formatted event.
+        """
+        template = cls.TEMPLATES.get(record['event'])
+        if template is not None:
+            try:
+                return template.format(**record)
+            except KeyError:
+                pass
+        fields = ", ".join(f"{key}={value}" for key, value in record.items() if key not in ('seq', 't', 'event'))
+        return f"{record['event']}: {fields}"
+
+    def close(self):
+        """
+        Flushes the trace, writing out the ring buffer if one is used. Closing it again is harmless.
+        """
+        if self.buffer is not None and not self.closed:
+            out = open(self.path, 'w') if self.path else sys.stdout
+            for record in self.buffer:
+                self.write(record, out)
+            if self.path:
+                out.close()
+            self.buffer.clear()
+        elif self.out is not None:
+            if self.path:
+                self.out.close()
+                self.out = None
+            else:
+                self.out.flush()
+        self.closed = True
@@ -1,42 +1,139 @@
+import threading
 from itertools import product
 from Sentence import Sentence
+from SolverContext import SolverContext
+from CNF import CNF
+from Symmetry import Symmetry
 
 class TruthTable:
-    def __init__(self, knowledge_base):
+    def __init__(self, knowledge_base, tracer=None, budget=None, symmetry=False):
         """
         Initializes the TruthTable with a given knowledge base.
 
+        The models of the knowledge base do not depend on the query, so they are enumerated
+        once, on the first call to solve, and shared by every later query, including
+        concurrent ones that each have their own SolverContext.
+
         Args:
             knowledge_base (KnowledgeBase): The knowledge base containing propositional logic sentences.
+            tracer (Tracer): Receives an event for every model of the knowledge base. Optional.
+            budget (Budget): Limits time, memory and the number of assignments checked ('models'). Optional.
+            symmetry (bool): Evaluate the knowledge base once per class of symmetric assignments.
         """
         self.kb = knowledge_base
-        self.count = 0
+        self.trace = tracer
+        self.budget = budget
+        self.symmetry = symmetry
+        self.stats = {}
+        self.context = SolverContext()
+        self.kb_models = None
+        self.lock = threading.Lock()
+
+    @property
+    def count(self):
+        """int: The number of models of the knowledge base found by the latest call to solve."""
+        return self.context.count
 
     def generate_truth_assignments(self):
         """
         Generates all possible truth assignments for the symbols in the knowledge base.
 
         Returns:
-            list: A list of tuples, each representing a possible truth assignment.
+            iterator: Tuples, each representing a possible truth assignment, generated lazily.
         """
-        return list(product([True, False], repeat=len(self.kb.symbols)))
+        return product([True, False], repeat=len(self.kb.symbols))
 
-    def evaluate_knowledge_base(self, assignments):
+    def evaluate_knowledge_base(self, assignments, context=None):
         """
         Evaluates the knowledge base against all possible truth assignments.
 
         Args:
-            assignments (list): A list of all possible truth assignments.
+            assignments (iterable): All possible truth assignments.
+            context (SolverContext): Counts the models found. Defaults to the latest context.
 
         Returns:
             list: A list of truth assignments that satisfy the knowledge base.
         """
+        context = context or self.context
         satisfying_models = []
-        for assignment in assignments:
+        for checked, assignment in enumerate(assignments, 1):
+            if self.budget:
+                self.budget.check('models', checked)
             truth_dict = dict(zip(self.kb.symbols, assignment))
             if all(sentence.solve(truth_dict) for sentence in self.kb.sentences):
                 satisfying_models.append(truth_dict)
-                self.count += 1
+                context.count += 1
+                if self.trace:
+                    self.trace.emit('model', model=truth_dict)
+        return satisfying_models
+
+    def satisfying_models(self):
+        """
+        Returns the models of the knowledge base, enumerating them on the first call.
+
+        Returns:
+            list: The truth assignments that satisfy the knowledge base.
+        """
+        with self.lock:
+            if self.kb_models is None:
+                if self.symmetry:
+                    self.kb_models = self.evaluate_symmetric(self.generate_truth_assignments(), SolverContext())
+                else:
+                    self.kb_models = self.evaluate_knowledge_base(self.generate_truth_assignments(), SolverContext())
+        return self.kb_models
+
+    def evaluate_symmetric(self, assignments, context):
+        """
+        Evaluates the knowledge base once per orbit of symmetric assignments.
+
+        Symmetries of the knowledge base map models to models, so when the first member of
+        an orbit in enumeration order is a model, its whole orbit is added without further
+        evaluation. An assignment that some generator maps to an earlier assignment is not
+        the first of its orbit and is skipped; so is a member of an orbit already added.
+        The model count stays exact.
+
+        Args:
+            assignments (iterable): All possible truth assignments, in the order of generate_truth_assignments.
+            context (SolverContext): Counts the models found.
+
+        Returns:
+            list: A list of truth assignments that satisfy the knowledge base.
+        """
+        symmetry = Symmetry(CNF.from_kb(self.kb), budget=self.budget)
+        # CNF.from_kb numbers the KB symbols in order, so symbol i has id i + 1.
+        permutations = [tuple(generator.get(var, var) - 1 for var in range(1, len(self.kb.symbols) + 1))
+                        for generator in symmetry.generators]
+        self.stats = dict(symmetry.stats, evaluated=0)
+        covered = set()
+        satisfying_models = []
+        for checked, assignment in enumerate(assignments, 1):
+            if self.budget:
+                self.budget.check('models', checked)
+            if assignment in covered:
+                continue
+            # product() enumerates True before False, so earlier assignments compare greater.
+            if any(tuple(assignment[i] for i in permutation) > assignment for permutation in permutations):
+                continue
+            self.stats['evaluated'] += 1
+            truth_dict = dict(zip(self.kb.symbols, assignment))
+            if not all(sentence.solve(truth_dict) for sentence in self.kb.sentences):
+                continue
+            orbit = {assignment}
+            frontier = [assignment]
+            while frontier:
+                member = frontier.pop()
+                for permutation in permutations:
+                    image = tuple(member[i] for i in permutation)
+                    if image not in orbit:
+                        orbit.add(image)
+                        frontier.append(image)
+            covered |= orbit
+            for member in sorted(orbit, reverse=True):
+                model = dict(zip(self.kb.symbols, member))
+                satisfying_models.append(model)
+                context.count += 1
+                if self.trace:
+                    self.trace.emit('model', model=model)
         return satisfying_models
 
     def check_query_entailment(self, query, satisfying_models):
@@ -57,20 +154,23 @@ class TruthTable:
                     return "NO"
             else:
                 return "NO"
-        return "YES: " + str(self.count)
+        return "YES: " + str(len(satisfying_models))
 
-    def solve(self, query):
+    def solve(self, query, context=None):
         """
         Solves the query using the truth table method.
 
         Args:
             query (Sentence): The query sentence to be solved.
+            context (SolverContext): Receives the model count. A new one is created if omitted.
 
         Returns:
             str: The result of the query entailment check.
         """
-        assignments = self.generate_truth_assignments()
-        models = self.evaluate_knowledge_base(assignments)
+        context = context or SolverContext()
+        self.context = context
+        models = self.satisfying_models()
+        context.count = len(models)
         result = self.check_query_entailment(query, models)
         return result
 
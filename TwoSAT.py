@@ -0,0 +1,174 @@
+from CNF import CNF
+
+class TwoSAT:
+    """
+    Linear time solver for clause sets in which every clause has at most two literals.
+
+    Each clause (a || b) becomes the implications ~a -> b and ~b -> a. The clauses are
+    unsatisfiable exactly when some symbol and its negation lie in the same strongly
+    connected component of this implication graph.
+    """
+
+    def __init__(self, knowledge_base, query, tracer=None, budget=None):
+        """
+        Initialize the 2-SAT solver with a knowledge base and a query.
+
+        Args:
+            knowledge_base (KnowledgeBase): The knowledge base containing propositional sentences.
+            query (Sentence): The query sentence to be solved.
+            tracer (Tracer): Receives start, model and result events. Optional.
+            budget (Budget): Limits time and memory. Optional.
+        """
+        self.kb = knowledge_base
+        self.query = query
+        self.trace = tracer
+        self.budget = budget
+        self.model = None
+        self.stats = {'nodes': 0, 'edges': 0, 'components': 0}
+
+    def solve(self):
+        """
+        Solve the query; it is entailed exactly when KB ∧ ¬query is unsatisfiable.
+
+        Returns:
+            bool: True if the query is entailed by the knowledge base, False otherwise.
+        """
+        return not self.satisfiable(CNF.from_kb(self.kb, self.query))
+
+    def satisfiable(self, cnf):
+        """
+        Decide satisfiability of a 2-CNF clause store, leaving a satisfying model in self.model.
+
+        Args:
+            cnf (CNF): The clause store. Every clause must have at most two literals.
+
+        Returns:
+            bool: True if the clauses are satisfiable, False otherwise.
+
+        Raises:
+            ValueError: If a clause has more than two literals.
+        """
+        if self.trace:
+            self.trace.emit('start', engine='2SAT', clauses=len(cnf.clauses), symbols=cnf.num_vars)
+
+        self.model = None
+        n = 2 * cnf.num_vars
+        graph = [[] for _ in range(n)]
+        for clause in cnf.clauses:
+            if len(clause) == 0:
+                return self.__result(False)
+            if len(clause) > 2:
+                raise ValueError(f"Clause is not in 2-CNF: {cnf.clause_str(clause)}")
+            a, b = clause[0], clause[-1]
+            graph[self.node(-a)].append(self.node(b))
+            graph[self.node(-b)].append(self.node(a))
+        self.stats['nodes'] = n
+        self.stats['edges'] = sum(len(edges) for edges in graph)
+
+        component = self.components(graph)
+        for var in range(1, cnf.num_vars + 1):
+            if component[self.node(var)] == component[self.node(-var)]:
+                return self.__result(False)
+
+        # Tarjan numbers components in reverse topological order, so a literal is made
+        # true when its component comes before the component of its negation.
+        self.model = {cnf.symbols[var - 1]: component[self.node(var)] < component[self.node(-var)]
+                      for var in range(1, cnf.num_vars + 1)}
+        if self.trace:
+            self.trace.emit('model', model=self.model)
+        return self.__result(True)
+
+    def __result(self, satisfiable):
+        """
+        Record the outcome in the trace.
+
+        Args:
+            satisfiable (bool): The outcome.
+
+        Returns:
+            bool: The outcome, unchanged.
+        """
+        if self.trace:
+            self.trace.emit('result', answer="SATISFIABLE" if satisfiable else "UNSATISFIABLE", stats=self.stats)
+        return satisfiable
+
+    @staticmethod
+    def node(literal):
+        """
+        Map a literal to its vertex in the implication graph.
+
+        Args:
+            literal (int): The encoded literal.
+
+        Returns:
+            int: The vertex index.
+        """
+        return 2 * (abs(literal) - 1) + (literal < 0)
+
+    def components(self, graph):
+        """
+        Compute strongly connected components with an iterative Tarjan search.
+
+        Args:
+            graph (list of list of int): Adjacency lists of the implication graph.
+
+        Returns:
+            list of int: The component number of every vertex.
+        """
+        n = len(graph)
+        index = [-1] * n
+        low = [0] * n
+        component = [-1] * n
+        on_stack = [False] * n
+        stack = []
+        counter = 0
+        count = 0
+
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            if self.budget:
+                self.budget.check()
+            work = [(root, 0)]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                v, i = work[-1]
+                if i < len(graph[v]):
+                    work[-1] = (v, i + 1)
+                    w = graph[v][i]
+                    if index[w] == -1:
+                        index[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], index[w])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        component[w] = count
+                        if w == v:
+                            break
+                    count += 1
+
+        self.stats['components'] = count
+        return component
+
+if __name__ == "__main__":
+    from KnowledgeBase import KnowledgeBase
+    from Sentence import Sentence
+
+    kb = KnowledgeBase(["a || b", "~a || c", "~b || c", "c => d"], 'GS')
+    query = Sentence("d")
+    print("YES" if TwoSAT(kb, query).solve() else "NO")
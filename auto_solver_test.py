@@ -0,0 +1,86 @@
+import random
+from CNF import CNF
+from DPLL import DPLL
+from HornSAT import HornSAT
+from TwoSAT import TwoSAT
+from AutoSolver import AutoSolver
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from random_problems import random_problems, truth_table, verdict
+
+def random_cnf(rng, num_vars, num_clauses, shape):
+    cnf = CNF()
+    for var in range(num_vars):
+        cnf.intern(f"x{var + 1}")
+    while len(cnf.clauses) < num_clauses:
+        width = rng.randint(1, min(num_vars, 2 if shape == '2-cnf' else 4))
+        variables = rng.sample(range(1, num_vars + 1), width)
+        if shape == 'horn':
+            positive = rng.randrange(width + 1)  # index width: no positive literal
+            cnf.add_clause(var if index == positive else -var for index, var in enumerate(variables))
+        elif shape == 'dual-horn':
+            negative = rng.randrange(width + 1)
+            cnf.add_clause(-var if index == negative else var for index, var in enumerate(variables))
+        else:
+            cnf.add_clause(var if rng.random() < 0.5 else -var for var in variables)
+    return cnf
+
+def auto(tell, ask):
+    solver = AutoSolver(KnowledgeBase(tell, 'GS'), Sentence(ask))
+    return "YES" if solver.solve() else "NO", solver.stats
+
+def satisfies(model, cnf):
+    return all(any(model[cnf.symbols[abs(literal) - 1]] == (literal > 0) for literal in clause) for clause in cnf.clauses)
+
+def test_fast_paths_match_dpll():
+    rng = random.Random(29)
+    solvers = {'horn': lambda: HornSAT(None, None), 'dual-horn': lambda: HornSAT(None, None, dual=True),
+               '2-cnf': lambda: TwoSAT(None, None)}
+    for shape, make in solvers.items():
+        for _ in range(300):
+            cnf = random_cnf(rng, rng.randint(2, 8), rng.randint(1, 14), shape)
+            solver = make()
+            satisfiable = solver.satisfiable(cnf)
+            assert satisfiable == DPLL(None, None).satisfiable(cnf), (shape, cnf.clauses)
+            if satisfiable:
+                assert satisfies(solver.model, cnf), (shape, cnf.clauses)
+
+def test_classification():
+    rng = random.Random(290)
+    allowed = {'horn': ['horn'], 'dual-horn': ['horn', 'dual-horn'], '2-cnf': ['horn', 'dual-horn', '2-cnf']}
+    for shape, kinds in allowed.items():
+        for _ in range(50):
+            assert AutoSolver.classify(random_cnf(rng, 6, 8, shape)) in kinds
+    general = CNF()
+    general.add_clause([1, 2, 3])
+    general.add_clause([-1, -2, -3])
+    assert AutoSolver.classify(general) == 'general'
+
+def test_auto_matches_truth_table():
+    for clauses in (False, True):
+        for tell, ask in random_problems(150, seed=291, clauses=clauses):
+            answer, stats = auto(tell, ask)
+            assert answer == verdict(truth_table(tell, ask)), (tell, ask, stats)
+
+def test_definite_horn_uses_forward_chaining():
+    tell = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+    for query, expected in [("d", "YES"), ("h", "NO")]:
+        answer, stats = auto(tell, query)
+        assert answer == expected and stats['class'] == 'definite-horn'
+
+def test_nested_implications_are_not_read_as_horn_rules():
+    # c&(a=>b) is not the rule c&a=>b, so only the clause classification may answer it
+    tell, ask = ["c&(a=>b)", "a"], "b"
+    answer, stats = auto(tell, ask)
+    assert answer == verdict(truth_table(tell, ask)) == "YES" and stats['class'] != 'definite-horn'
+    assert AutoSolver.horn_rule(Sentence("(a & b) & c => d")) == "a&b&c=>d"
+    assert AutoSolver.horn_rule(Sentence("a => (b => c)")) is None
+    assert AutoSolver.horn_rule(Sentence("~a")) is None
+
+if __name__ == "__main__":
+    test_fast_paths_match_dpll()
+    test_classification()
+    test_auto_matches_truth_table()
+    test_definite_horn_uses_forward_chaining()
+    test_nested_implications_are_not_read_as_horn_rules()
+    print("AUTO tests passed.")
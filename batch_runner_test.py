@@ -0,0 +1,71 @@
+import os
+import json
+import tempfile
+from BatchRunner import BatchRunner
+from random_problems import random_problems, truth_table, verdict
+
+def write_problems(directory, problems):
+    paths = []
+    for index, (tell, ask) in enumerate(problems):
+        path = os.path.join(directory, f"problem{index}.txt")
+        with open(path, 'w') as f:
+            f.write("TELL\n" + "; ".join(tell) + ";\nASK\n" + ask + "\n")
+        paths.append(path)
+    return paths
+
+class CountingRunner(BatchRunner):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.started = 0
+
+    def start_worker(self, context):
+        self.started += 1
+        return super().start_worker(context)
+
+def read_results(output):
+    with open(output) as f:
+        return [json.loads(line) for line in f]
+
+def test_results_match_truth_table_and_resume():
+    directory = tempfile.mkdtemp()
+    problems = list(random_problems(6, seed=34))
+    paths = write_problems(directory, problems)
+    output = os.path.join(directory, "results.jsonl")
+    runner = CountingRunner(['TT', 'DPLL'], jobs=2, timeout=30)
+    assert runner.run(BatchRunner.files(directory + "/*.txt"), output) == 12
+    assert runner.started == 2
+    results = read_results(output)
+    expected = {path: truth_table(tell, ask) for path, (tell, ask) in zip(paths, problems)}
+    for record in results:
+        assert verdict(record['answer']) == verdict(expected[record['file']]), record
+    assert runner.run(paths, output) == 0
+    assert len(read_results(output)) == 12
+
+def test_slow_job_times_out_without_blocking_others():
+    directory = tempfile.mkdtemp()
+    slow = os.path.join(directory, "slow.txt")
+    with open(slow, 'w') as f:
+        f.write("TELL\n" + "; ".join(f"x{i} || y{i}" for i in range(16)) + ";\nASK\nx0 || z\n")
+    fast = write_problems(directory, [(["a => b", "a"], "b")])[0]
+    output = os.path.join(directory, "results.jsonl")
+    runner = CountingRunner(['TT'], jobs=2, timeout=0.5)
+    runner.run([slow, fast, fast], output)
+    answers = [(record['file'], record['answer']) for record in read_results(output)]
+    assert answers[-1][0] == slow and answers[-1][1].startswith("UNKNOWN")
+    assert answers[:2] == [(fast, "YES: 1")] * 2
+    # the second fast job reuses the first fast job's worker
+    assert runner.started == 2
+
+def test_unknown_method_is_rejected():
+    try:
+        BatchRunner(['XYZ'])
+    except ValueError as e:
+        assert "XYZ" in str(e)
+    else:
+        assert False, "an unknown method was accepted"
+
+if __name__ == "__main__":
+    test_results_match_truth_table_and_resume()
+    test_slow_job_times_out_without_blocking_others()
+    test_unknown_method_is_rejected()
+    print("Batch runner tests passed.")
@@ -0,0 +1,89 @@
+import random
+from BDD import BDD, BDDManager
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from random_problems import random_problems, truth_table
+
+def bdd(tell, ask, **options):
+    engine = BDD(KnowledgeBase(tell, 'GS'), Sentence(ask), **options)
+    return engine.solve(), engine.stats
+
+def evaluate(manager, node, assignment):
+    while node > manager.TRUE:
+        level, low, high = manager.nodes[node]
+        node = high if assignment[manager.order[level]] else low
+    return node == manager.TRUE
+
+def test_answers_and_counts_match_truth_table():
+    for tell, ask in random_problems(150, seed=30, sentences=(2, 8)):
+        expected = truth_table(tell, ask)
+        for order in BDD.ORDERS:
+            for sift in (False, True):
+                answer, _ = bdd(tell, ask, order=order, sift=sift)
+                assert answer == expected, (tell, ask, order, sift, answer, expected)
+
+def test_sifting_finds_the_interleaved_order():
+    n = 8
+    manager = BDDManager([f"x{i}" for i in range(n)] + [f"y{i}" for i in range(n)])
+    f = manager.FALSE
+    for i in range(n):
+        f = manager.apply('||', f, manager.apply('&', manager.var(f"x{i}"), manager.var(f"y{i}")))
+    count, size = manager.count(f), manager.size(f)
+    assert manager.sift([f]) == 2 * n < size
+    assert manager.count(f) == count
+    rng = random.Random(300)
+    for _ in range(500):
+        assignment = {name: rng.random() < 0.5 for name in manager.order}
+        assert evaluate(manager, f, assignment) == any(assignment[f"x{i}"] and assignment[f"y{i}"] for i in range(n))
+
+def test_swaps_keep_node_functions():
+    rng = random.Random(301)
+    names = [f"v{i}" for i in range(7)]
+    for _ in range(30):
+        manager = BDDManager(names)
+        f = manager.FALSE
+        for _ in range(4):
+            term = manager.TRUE
+            for name in rng.sample(names, 3):
+                literal = manager.var(name)
+                term = manager.apply('&', term, literal if rng.random() < 0.5 else manager.neg(literal))
+            f = manager.apply('||', f, term)
+        table = {}
+        for bits in range(1 << len(names)):
+            assignment = {name: bool(bits >> index & 1) for index, name in enumerate(names)}
+            table[bits] = evaluate(manager, f, assignment)
+        by_level = manager.levels([f])
+        manager.collect(by_level)
+        for _ in range(20):
+            manager.swap(rng.randrange(len(names) - 1), by_level)
+        for bits, value in table.items():
+            assignment = {name: bool(bits >> index & 1) for index, name in enumerate(names)}
+            assert evaluate(manager, f, assignment) == value
+        assert manager.apply('<=>', f, f) == manager.TRUE
+
+def test_sifting_during_construction():
+    n = 9
+    tell = [" || ".join(f"x{i}" for i in range(n))] + [f"(x{i} <=> y{i})" for i in range(n)]
+    ask = " || ".join(f"y{i}" for i in range(n))
+    static, static_stats = bdd(tell, ask)
+    sifted, sifted_stats = bdd(tell, ask, sift=True)
+    assert static == sifted == "YES: " + str(2 ** n - 1)
+    assert sifted_stats['reorders'] > 1 and sifted_stats['nodes'] < static_stats['nodes']
+
+def test_deep_diagrams_do_not_recurse():
+    n = 5000
+    manager = BDDManager([f"v{i}" for i in range(n)])
+    chain = manager.TRUE
+    for i in reversed(range(n)):
+        chain = manager.apply('&', manager.var(f"v{i}"), chain)
+    negated = manager.neg(chain)
+    assert manager.count(negated) == 2 ** n - 1
+    assert manager.apply('||', chain, negated) == manager.TRUE
+
+if __name__ == "__main__":
+    test_answers_and_counts_match_truth_table()
+    test_sifting_finds_the_interleaved_order()
+    test_swaps_keep_node_functions()
+    test_sifting_during_construction()
+    test_deep_diagrams_do_not_recurse()
+    print("BDD tests passed.")
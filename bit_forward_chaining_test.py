@@ -0,0 +1,44 @@
+import random
+from KnowledgeBase import KnowledgeBase
+from BitForwardChaining import BitForwardChaining
+from InferenceEngine import run
+from random_problems import random_horn_kb, truth_table, verdict
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+def check_random_kbs(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        tell = random_horn_kb(rng, SYMBOLS, rules=(2, 14))
+        for query in KnowledgeBase(tell, 'HF').symbols:
+            expected = verdict(truth_table(tell, query))
+            answer = run('FC', tell, query, bitmatrix=True)[0]
+            assert verdict(answer) == verdict(run('FC', tell, query)[0]) == expected, (tell, query)
+            if expected == "YES":
+                inferred = answer[len("YES: "):].split(", ")
+                assert query in inferred and len(set(inferred)) == len(inferred), (tell, query, answer)
+                assert all(verdict(truth_table(tell, symbol)) == "YES" for symbol in inferred), (tell, query, answer)
+
+def test_answers_match_forward_chaining_and_truth_table():
+    check_random_kbs(60, seed=41)
+
+def test_rules_spread_over_many_blocks():
+    block = BitForwardChaining.BLOCK
+    BitForwardChaining.BLOCK = 2
+    try:
+        check_random_kbs(60, seed=410)
+    finally:
+        BitForwardChaining.BLOCK = block
+
+def test_long_chain_rounds():
+    tell = ["x0"] + [f"x{i}&x0=>x{i + 1}" for i in range(9000)] + ["y&x5=>z"]
+    answer, stats = run('FC', tell, "x9000", bitmatrix=True)
+    assert answer == run('FC', tell, "x9000")[0]
+    assert stats['rounds'] == 9001 and stats['fired'] == 9001
+    assert run('FC', tell, "z", bitmatrix=True)[0] == "NO"
+
+if __name__ == "__main__":
+    test_answers_match_forward_chaining_and_truth_table()
+    test_rules_spread_over_many_blocks()
+    test_long_chain_rounds()
+    print("Bit-matrix forward chaining tests passed.")
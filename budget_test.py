@@ -0,0 +1,69 @@
+import os
+import sys
+import subprocess
+import tempfile
+from unittest import mock
+from Budget import Budget, BudgetExceeded
+from InferenceEngine import run
+from random_problems import random_problems, truth_table, verdict
+
+# Four pigeons in three holes: unsatisfiable, but only after some search
+HARD_TELL = [f"p{i}1 || p{i}2 || p{i}3" for i in range(1, 5)] + \
+    [f"~p{i}{h} || ~p{j}{h}" for h in (1, 2, 3) for i in range(1, 5) for j in range(i + 1, 5)]
+HARD_ASK = "p11"
+
+def test_counter_limits_give_unknown():
+    cases = [('TT', {'models': 5}), ('RP', {'clauses': 3}), ('DPLL', {'decisions': 0}),
+             ('BDD', {'nodes': 5}), ('DDNNF', {'decisions': 1}), ('LS', {'flips': 0})]
+    for method, limits in cases:
+        options = {'local_search': {'seed': 1}} if method == 'LS' else {}
+        answer, stats = run(method, HARD_TELL, HARD_ASK, budget=Budget(**limits), **options)
+        assert answer.startswith(Budget.UNKNOWN), (method, answer)
+        assert 'checks' in stats and 'elapsed' in stats, (method, stats)
+
+def test_generous_limits_do_not_change_answers():
+    for tell, ask in random_problems(60, seed=33):
+        expected = truth_table(tell, ask)
+        for method in ['TT', 'DPLL', 'BDD', 'DDNNF']:
+            budget = Budget(time_limit=60, models=10 ** 6, decisions=10 ** 6, nodes=10 ** 6)
+            answer, _ = run(method, tell, ask, budget=budget)
+            assert verdict(answer) == verdict(expected), (method, tell, ask, answer)
+
+def test_time_limit_and_cancel():
+    answer, _ = run('TT', HARD_TELL, HARD_ASK, budget=Budget(time_limit=0))
+    assert answer == f"{Budget.UNKNOWN}: time limit of 0s exceeded"
+    budget = Budget()
+    budget.cancel()
+    try:
+        budget.check()
+    except BudgetExceeded as e:
+        assert e.reason == "cancelled"
+    else:
+        assert False, "a cancelled budget did not raise"
+
+def test_peak_memory_is_in_megabytes_on_every_platform():
+    assert 1 < Budget.memory() < 1024 * 1024
+    usage = mock.Mock(ru_maxrss=300 * 1024 * 1024)  # macOS reports bytes
+    with mock.patch('Budget.sys.platform', 'darwin'), mock.patch('Budget.resource.getrusage', return_value=usage):
+        assert Budget.memory() == 300
+    usage = mock.Mock(ru_maxrss=300 * 1024)  # Linux reports kilobytes
+    with mock.patch('Budget.sys.platform', 'linux'), mock.patch('Budget.resource.getrusage', return_value=usage):
+        assert Budget.memory() == 300
+
+def test_command_line_errors_are_reported_with_and_without_cache():
+    cache = os.path.join(tempfile.mkdtemp(), "cache.json")
+    for extra in [[], [f"--cache={cache}"]]:
+        result = subprocess.run([sys.executable, "InferenceEngine.py", "DPLL", "test.txt", "--workers=x"] + extra,
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert result.stdout.startswith("Error: invalid literal"), (extra, result.stdout, result.stderr)
+        result = subprocess.run([sys.executable, "InferenceEngine.py", "TT", "test.txt", "--max-models=2"] + extra,
+                                capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        assert result.stdout.startswith(Budget.UNKNOWN), (extra, result.stdout, result.stderr)
+
+if __name__ == "__main__":
+    test_counter_limits_give_unknown()
+    test_generous_limits_do_not_change_answers()
+    test_time_limit_and_cancel()
+    test_peak_memory_is_in_megabytes_on_every_platform()
+    test_command_line_errors_are_reported_with_and_without_cache()
+    print("Budget tests passed.")
@@ -0,0 +1,97 @@
+import os
+import sys
+import subprocess
+import tempfile
+from ResultCache import ResultCache
+from InferenceEngine import run
+from random_problems import random_problems, truth_table
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+def engine(*args):
+    result = subprocess.run([sys.executable, "InferenceEngine.py"] + list(args), capture_output=True, text=True, cwd=DIRECTORY)
+    return result.stdout.splitlines()[0]
+
+def test_equivalent_queries_hit_and_match_truth_table():
+    cache = ResultCache()
+    for tell, ask in random_problems(60, seed=37):
+        expected = truth_table(tell, ask)
+        assert cache.lookup('TT', tell, ask, lambda: run('TT', tell, ask))[0] == expected
+        hits = cache.stats['hits']
+        rewritten = f"({ask}) & ({ask})"
+        assert cache.lookup('TT', list(reversed(tell)), rewritten, lambda: (None, None))[0] == expected, (tell, ask)
+        assert cache.stats['hits'] == hits + 1
+    tell = ["a => b", "a"]
+    assert ResultCache.key('TT', tell, "a&b") == ResultCache.key('TT', tell, "b & a & b")
+    assert ResultCache.key('TT', tell, "a || ~a") != ResultCache.key('TT', tell, "z || ~z")
+    assert ResultCache.key('TT', tell, "a => b") != ResultCache.key('TT', tell, "b => a")
+
+def test_order_dependent_statistics_are_not_shared():
+    for tell, ask in random_problems(40, seed=370):
+        reordered = list(reversed(tell))
+        for method in ['DPLL', 'AUTO', 'BDD', 'DDNNF']:
+            cache = ResultCache()
+            cache.lookup(method, tell, ask, lambda: run(method, tell, ask))
+            assert cache.lookup(method, reordered, ask, lambda: run(method, reordered, ask)) == run(method, reordered, ask)
+    tell = ["a => b", "c", "a"]
+    assert ResultCache.key('TT', tell, "b") == ResultCache.key('TT', tell[::-1] + ["c"], "b")
+    assert ResultCache.key('BDD', tell, "b") != ResultCache.key('BDD', tell[::-1], "b")
+
+def test_options_are_part_of_the_key():
+    tell = ["a => b", "a"]
+    assert ResultCache.key('DPLL', tell, "b") == ResultCache.key('DPLL', tell, "b", {'workers': None, 'slice': False})
+    keys = [ResultCache.key('DPLL', tell, "b", options) for options in
+            [{}, {'heuristic': 'MOMS'}, {'heuristic': 'DLIS'}, {'order': 'FORCE'}, {'sift': True}, {'slice': True},
+             {'symmetry': True}, {'workers': 1}, {'workers': 0}, {'bitmatrix': True},
+             {'local_search': {}}, {'local_search': {'seed': 1}}]]
+    assert len(set(keys)) == len(keys)
+    # another heuristic misses instead of returning the first heuristic's statistics
+    cache = os.path.join(tempfile.mkdtemp(), "cache.json")
+    engine("DPLL", "test.txt", f"--cache={cache}")
+    engine("DPLL", "test.txt", f"--cache={cache}")
+    assert len(ResultCache(path=cache).entries) == 1
+    engine("DPLL", "test.txt", "--heuristic=FIXED", f"--cache={cache}")
+    assert len(ResultCache(path=cache).entries) == 2
+    # the default prover and the level saturation disagree on this inconsistent KB
+    path = os.path.join(tempfile.mkdtemp(), "kb.txt")
+    with open(path, 'w') as f:
+        f.write("TELL\ne; (e||b)=>e; f&~e;\nASK\ne\n")
+    cache = path + ".json"
+    fresh = engine("RP", path, "--workers=1")
+    engine("RP", path, f"--cache={cache}")
+    assert engine("RP", path, "--workers=1", f"--cache={cache}") == fresh == "YES"
+
+def test_nnf_and_certificate_bypass_the_cache():
+    directory = tempfile.mkdtemp()
+    cache = os.path.join(directory, "cache.json")
+    nnf = os.path.join(directory, "kb.nnf")
+    certificate = os.path.join(directory, "kb.cert")
+    answer = engine("DDNNF", "test.txt", f"--cache={cache}")
+    assert engine("DDNNF", "test.txt", f"--cache={cache}", f"--nnf={nnf}") == answer
+    assert os.path.exists(nnf)
+    engine("DPLL", "test.txt", f"--cache={cache}")
+    engine("DPLL", "test.txt", f"--cache={cache}", f"--certificate={certificate}")
+    assert os.path.exists(certificate)
+
+def test_eviction_persistence_and_unknown_answers():
+    path = os.path.join(tempfile.mkdtemp(), "cache.json")
+    cache = ResultCache(capacity=2, path=path)
+    for query in ["a", "b", "c"]:
+        cache.put('TT', ["a", "b", "c"], query, "YES: 1", {'models': 1})
+    cache.put('TT', ["a"], "z", "UNKNOWN: time limit of 0s exceeded", {})
+    cache.put('TT', ["a"], "z", "Error: oops.", {})
+    assert cache.get('TT', ["a", "b", "c"], "a") is None
+    assert cache.info()['size'] == 2 and cache.stats['evictions'] == 1
+    cache.get('TT', ["a", "b", "c"], "b")
+    cache.save()
+    loaded = ResultCache(capacity=1, path=path)
+    assert loaded.get('TT', ["c", "b", "a"], "b") == ("YES: 1", {'models': 1})
+    assert loaded.get('TT', ["a", "b", "c"], "c") is None
+
+if __name__ == "__main__":
+    test_equivalent_queries_hit_and_match_truth_table()
+    test_order_dependent_statistics_are_not_shared()
+    test_options_are_part_of_the_key()
+    test_nnf_and_certificate_bypass_the_cache()
+    test_eviction_persistence_and_unknown_answers()
+    print("Cache tests passed.")
@@ -0,0 +1,128 @@
+import os
+import sys
+import random
+import tempfile
+import subprocess
+from itertools import product
+from Sentence import Sentence
+from Certificate import Certificate
+from CertificateChecker import CertificateChecker
+from InferenceEngine import run
+from random_problems import random_problems, truth_table, verdict
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+def write_problem(directory, tell, ask):
+    path = os.path.join(directory, "problem.txt")
+    with open(path, 'w') as f:
+        f.write("TELL\n" + "; ".join(tell) + ";\nASK\n" + ask + "\n")
+    return path
+
+def test_certificates_check_out_and_match_truth_table():
+    directory = tempfile.mkdtemp()
+    certificate = os.path.join(directory, "proof.cert")
+    for tell, ask in random_problems(60, seed=44):
+        expected = verdict(truth_table(tell, ask))
+        checker = CertificateChecker(write_problem(directory, tell, ask))
+        for method, options in [('DPLL', {}), ('RP', {'workers': 1}), ('LS', {'local_search': {'seed': 1, 'max_flips': 500, 'restarts': 1}})]:
+            answer = run(method, tell, ask, certificate=certificate, **options)[0]
+            if answer.startswith("UNKNOWN"):
+                continue
+            assert answer == expected, (method, tell, ask)
+            assert checker.check(certificate)[0] == expected, (method, tell, ask, checker.check(certificate))
+
+def test_own_clause_conversion_is_equivalent():
+    for tell, ask in random_problems(150, seed=440):
+        for text in tell + [ask]:
+            sentence = Sentence(text)
+            symbols = sorted(set(sentence.symbols))
+            for value in (True, False):
+                clauses = CertificateChecker.clauses(sentence, value)
+                for values in product([True, False], repeat=len(symbols)):
+                    model = dict(zip(symbols, values))
+                    satisfied = all(any(model[name] == sign for name, sign in clause) for clause in clauses)
+                    assert satisfied == (sentence.solve(model) == value), (text, value, model)
+
+def test_tampered_certificates_are_rejected():
+    directory = tempfile.mkdtemp()
+    checker = CertificateChecker(write_problem(directory, ["a => b", "a", "c || d"], "b"))
+    path = os.path.join(directory, "tampered.cert")
+    cases = {
+        "not implied": lambda cert: [cert.input([-1]), cert.input([1]), cert.resolvent(1, 2)],
+        "foreign symbol": lambda cert: [cert.input([4]), cert.input([-4]), cert.resolvent(1, 2)],
+        "no clash": lambda cert: [cert.input([-1, 2]), cert.input([1]), cert.resolvent(2, 2)],
+        "later clause": lambda cert: [cert.input([1]), cert.resolvent(1, 3)],
+        "bad lemma": lambda cert: [cert.input([-1, 2]), cert.lemma([2], [1])],
+        "model satisfies query": lambda cert: cert.model([1, 2, 3, 5]),
+        "model falsifies KB": lambda cert: cert.model([1, -2, -3, -5]),
+    }
+    for case, write in cases.items():
+        certificate = Certificate(path)
+        certificate.header(["a", "b", "c", "e", "d"])
+        write(certificate)
+        certificate.close()
+        assert checker.check(path)[0] == "INVALID", case
+    run('DPLL', ["a => b", "a", "c || d"], "b", certificate=path)
+    assert checker.check(path)[0] == "YES"
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-3])
+    assert checker.check(path)[0] == "INVALID"
+
+def test_certificates_without_a_conclusion_are_unknown():
+    directory = tempfile.mkdtemp()
+    problem = write_problem(directory, ["a => b", "a", "c || d"], "b")
+    path = os.path.join(directory, "proof.cert")
+    certificate = Certificate(path)
+    certificate.header(["a", "b"])
+    certificate.input([-1, 2])
+    certificate.close()
+    assert CertificateChecker(problem).check(path)[0] == "UNKNOWN"
+    # local search cannot refute, so it ends UNKNOWN on an entailed query
+    answer = run('LS', ["a => b", "a", "c || d"], "b", certificate=path, local_search={'max_flips': 10, 'restarts': 0})[0]
+    assert answer.startswith("UNKNOWN") and CertificateChecker(problem).check(path)[0] == "UNKNOWN"
+    result = subprocess.run([sys.executable, "CertificateChecker.py", problem, path], capture_output=True, text=True, cwd=DIRECTORY)
+    assert result.stdout.startswith("UNKNOWN") and result.returncode == 1
+    result = subprocess.run([sys.executable, "CertificateChecker.py", problem, path + ".missing"], capture_output=True, text=True, cwd=DIRECTORY)
+    assert result.stdout == "File not found.\n" and result.returncode == 1
+
+def test_subsumption_index_finds_every_contained_clause():
+    rng = random.Random(441)
+    for _ in range(200):
+        clauses = {frozenset((rng.choice("abcdef"), rng.random() < 0.5) for _ in range(rng.randint(0, 3))) for _ in range(rng.randint(1, 12))}
+        index = CertificateChecker.subsumption_index(clauses)
+        clause = frozenset((rng.choice("abcdef"), rng.random() < 0.5) for _ in range(rng.randint(0, 5)))
+        found = any(c <= clause for literal in [None, *clause] for c in index.get(literal, ()))
+        assert found == any(c <= clause for c in clauses), (clauses, clause)
+
+def test_large_sentences_are_not_enumerated():
+    directory = tempfile.mkdtemp()
+    padding = " || ".join(f"d{i}" for i in range(CertificateChecker.ENUMERATION_LIMIT + 1))
+    checker = CertificateChecker(write_problem(directory, [f"((b <=> b) => c) & ({padding})"], "c"))
+    assert checker.implied(frozenset([("c", True)])) is None
+    path = os.path.join(directory, "proof.cert")
+    certificate = Certificate(path)
+    certificate.header(["c"])
+    certificate.input([1])
+    certificate.close()
+    assert checker.check(path)[0] == "UNKNOWN"
+
+def test_clauses_simplified_by_sympy_are_accepted():
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "proof.cert")
+    tell = ["a & ~a", "(b <=> b) => c"]
+    checker = CertificateChecker(write_problem(directory, tell, "c"))
+    for method, options in [('DPLL', {}), ('RP', {'workers': 1})]:
+        assert run(method, tell, "c", certificate=path, **options)[0] == "YES"
+        assert checker.check(path)[0] == "YES", method
+
+if __name__ == "__main__":
+    test_certificates_check_out_and_match_truth_table()
+    test_own_clause_conversion_is_equivalent()
+    test_tampered_certificates_are_rejected()
+    test_certificates_without_a_conclusion_are_unknown()
+    test_subsumption_index_finds_every_contained_clause()
+    test_large_sentences_are_not_enumerated()
+    test_clauses_simplified_by_sympy_are_accepted()
+    print("Certificate tests passed.")
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+from itertools import product
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from DDNNF import DDNNF
+from BDD import BDD
+from random_problems import random_problems, truth_table
+
+def models(kb):
+    result = []
+    for values in product([True, False], repeat=len(kb.symbols)):
+        model = dict(zip(kb.symbols, values))
+        if all(sentence.solve(model) for sentence in kb.sentences):
+            result.append(model)
+    return result
+
+def test_answers_match_truth_table():
+    for tell, ask in random_problems(200, seed=31, sentences=(2, 8)):
+        answer = DDNNF.compile(KnowledgeBase(tell, 'GS')).solve(Sentence(ask))
+        assert answer == truth_table(tell, ask), (tell, ask, answer)
+
+def test_inconsistent_knowledge_base_entails_everything():
+    for tell, ask in [(["~(a<=>a)"], "~e"), (["~b", "~(f=>f)", "f", "(d=>~b)"], "a"), (["a", "~a"], "b")]:
+        assert DDNNF.compile(KnowledgeBase(tell, 'GS')).solve(Sentence(ask)) == "YES: 0"
+        assert DDNNF.compile(KnowledgeBase(tell, 'GS')).count() == 0
+
+def test_conditioned_counts_match_enumeration():
+    for tell, _ in random_problems(60, seed=310, sentences=(2, 6)):
+        kb = KnowledgeBase(tell, 'GS')
+        circuit = DDNNF.compile(kb)
+        all_models = models(kb)
+        assert circuit.count() == len(all_models)
+        for name in kb.symbols:
+            var = circuit.ids[name]
+            assert circuit.count([var]) == sum(1 for model in all_models if model[name])
+            assert circuit.count([-var]) == sum(1 for model in all_models if not model[name])
+
+def test_saved_circuit_is_reused():
+    tell = ["a => b", "b => c", "a || d"]
+    path = os.path.join(tempfile.mkdtemp(), "kb.nnf")
+    circuit = DDNNF.compile(KnowledgeBase(tell, 'GS'))
+    circuit.save(path)
+    loaded = DDNNF.load(path)
+    assert loaded.kb_hash == DDNNF.hash_kb(KnowledgeBase(tell, 'GS'))
+    assert loaded.solve(Sentence("c || d")) == circuit.solve(Sentence("c || d")) == truth_table(tell, "c || d")
+    assert loaded.count() == circuit.count()
+
+def test_deep_search_runs_under_a_low_recursion_limit():
+    n = 300
+    tell = [f"(x{i} <=> ~x{i + 1}) || z{i}" for i in range(n)]
+    kb = KnowledgeBase(tell, 'GS')
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(500)  # below the depth of a recursive search on this chain
+    try:
+        circuit = DDNNF.compile(kb)
+        assert sys.getrecursionlimit() == 500
+    finally:
+        sys.setrecursionlimit(limit)
+    assert "YES: " + str(circuit.count()) == BDD(kb, Sentence("x0 || ~x0")).solve()
+
+if __name__ == "__main__":
+    test_answers_match_truth_table()
+    test_inconsistent_knowledge_base_entails_everything()
+    test_conditioned_counts_match_enumeration()
+    test_saved_circuit_is_reused()
+    test_deep_search_runs_under_a_low_recursion_limit()
+    print("DDNNF tests passed.")
@@ -0,0 +1,83 @@
+import os
+import json
+import random
+import tempfile
+from CNF import CNF
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from FileReader import FileReader
+from BatchRunner import BatchRunner
+from InferenceEngine import run_cnf
+from random_problems import random_problems, random_clause, truth_table, verdict
+
+def test_round_trip_keeps_clauses_and_answers():
+    directory = tempfile.mkdtemp()
+    for index, (tell, ask) in enumerate(random_problems(80, seed=36)):
+        cnf = CNF.from_kb(KnowledgeBase(tell, 'GS'), Sentence(ask))
+        path = os.path.join(directory, f"problem{index}.cnf")
+        FileReader.write_dimacs(cnf, path)
+        read = FileReader.read_dimacs(path)
+        assert read.symbols == cnf.symbols and read.clauses == cnf.clauses
+        expected = verdict(truth_table(tell, ask))
+        for method in ['DPLL', 'AUTO']:
+            assert run_cnf(method, read)[0] == expected, (method, tell, ask)
+
+def test_named_query_files_are_matched_by_name():
+    rng = random.Random(360)
+    directory = tempfile.mkdtemp()
+    for tell, _ in random_problems(60, seed=361, clauses=True):
+        kb_cnf = CNF.from_kb(KnowledgeBase(tell, 'GS'))
+        ask = random_clause(rng, kb_cnf.symbols, 2)
+        query = CNF()
+        for name in reversed(kb_cnf.symbols):  # a different numbering than the KB's
+            query.intern(name)
+        query.add_clause(-query.ids[literal[1:]] if literal.startswith("~") else query.ids[literal]
+                         for literal in ask.split(" || "))
+        path = os.path.join(directory, "query.cnf")
+        FileReader.write_dimacs(query, path)
+        clauses = FileReader.read_dimacs_query(path, kb_cnf)
+        assert run_cnf('DPLL', kb_cnf, clauses)[0] == verdict(truth_table(tell, ask)), (tell, ask)
+
+def test_mismatched_query_files_are_rejected():
+    directory = tempfile.mkdtemp()
+    kb_cnf = CNF.from_kb(KnowledgeBase(["a || b", "b => c"], 'GS'))
+    cases = {"p cnf 2 1\n1 0\n": "declares 2 variables", "c symbol 1 z\np cnf 1 1\n1 0\n": "z is not a symbol"}
+    for text, message in cases.items():
+        path = os.path.join(directory, "query.cnf")
+        with open(path, 'w') as f:
+            f.write(text)
+        try:
+            FileReader.read_dimacs_query(path, kb_cnf)
+        except ValueError as e:
+            assert message in str(e)
+        else:
+            assert False, f"{text!r} was accepted"
+    with open(path, 'w') as f:
+        f.write("p cnf 3 1\n-3 0\n")
+    assert FileReader.read_dimacs_query(path, kb_cnf) == [(-3,)]
+
+def test_batch_jobs_pass_options_to_dimacs_input():
+    directory = tempfile.mkdtemp()
+    cnf = CNF()
+    for pigeon in range(1, 5):
+        cnf.add_clause([cnf.intern(f"p{pigeon}{hole}") for hole in range(1, 4)])
+    for hole in range(1, 4):
+        for i in range(1, 5):
+            for j in range(i + 1, 5):
+                cnf.add_clause([-cnf.ids[f"p{i}{hole}"], -cnf.ids[f"p{j}{hole}"]])
+    path = os.path.join(directory, "pigeons.cnf")
+    FileReader.write_dimacs(cnf, path)
+    output = os.path.join(directory, "results.jsonl")
+    BatchRunner(['DPLL'], jobs=1, options={'symmetry': True, 'order': 'FORCE'}).run([path], output)
+    BatchRunner(['LS'], jobs=1, options={'local_search': {'max_flips': 7, 'restarts': 0}}).run([path], output)
+    with open(output) as f:
+        results = {record['method']: record for record in map(json.loads, f)}
+    assert results['DPLL']['answer'] == "YES" and results['DPLL']['stats']['generators'] > 0
+    assert results['LS']['answer'].startswith("UNKNOWN") and results['LS']['stats']['flips'] == 7
+
+if __name__ == "__main__":
+    test_round_trip_keeps_clauses_and_answers()
+    test_named_query_files_are_matched_by_name()
+    test_mismatched_query_files_are_rejected()
+    test_batch_jobs_pass_options_to_dimacs_input()
+    print("DIMACS tests passed.")
@@ -0,0 +1,42 @@
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from DPLL import DPLL
+from random_problems import random_problems, truth_table, verdict
+
+def test_heuristics_match_truth_table():
+    for tell, ask in random_problems(150, seed=26):
+        expected = verdict(truth_table(tell, ask))
+        for heuristic in DPLL.HEURISTICS:
+            answer = "YES" if DPLL(KnowledgeBase(tell, 'GS'), Sentence(ask), heuristic=heuristic).solve() else "NO"
+            assert answer == expected, (heuristic, tell, ask, answer, expected)
+
+def test_pure_literals_do_not_change_answers():
+    for tell, ask in random_problems(100, seed=260):
+        kb, query = KnowledgeBase(tell, 'GS'), Sentence(ask)
+        with_pure = DPLL(kb, query, pure_literals=True).solve()
+        without_pure = DPLL(kb, query, pure_literals=False).solve()
+        assert with_pure == without_pure, (tell, ask)
+
+def test_model_satisfies_every_clause():
+    for tell, ask in random_problems(100, seed=261):
+        for heuristic in DPLL.HEURISTICS:
+            solver = DPLL(KnowledgeBase(tell, 'GS'), Sentence(ask), heuristic=heuristic)
+            if not solver.solve():
+                cnf = solver.cnf
+                for clause in cnf.clauses:
+                    assert any(solver.model[cnf.symbols[abs(literal) - 1]] == (literal > 0) for literal in clause)
+
+def test_unknown_heuristic_is_rejected():
+    try:
+        DPLL(None, None, heuristic='RANDOM')
+    except Exception as e:
+        assert "RANDOM" in str(e)
+    else:
+        assert False, "an unknown heuristic was accepted"
+
+if __name__ == "__main__":
+    test_heuristics_match_truth_table()
+    test_pure_literals_do_not_change_answers()
+    test_model_satisfies_every_clause()
+    test_unknown_heuristic_is_rejected()
+    print("DPLL tests passed.")
@@ -0,0 +1,79 @@
+import random
+from KnowledgeBase import KnowledgeBase
+from IncrementalForwardChaining import IncrementalForwardChaining
+from ForwardChaining import ForwardChaining
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f", "g", "h"]
+
+def random_horn(rng):
+    head = rng.choice(SYMBOLS)
+    if rng.random() < 0.35:
+        return head
+    premises = rng.sample(SYMBOLS, rng.randint(1, 3))
+    return "&".join(premises) + "=>" + head
+
+def closure(sentences):
+    rules = [(sentence.split("=>")[1], sentence.split("=>")[0].split("&")) if "=>" in sentence else (sentence, [])
+             for sentence in sentences]
+    known = set()
+    changed = True
+    while changed:
+        changed = False
+        for head, premises in rules:
+            if head not in known and all(premise in known for premise in premises):
+                known.add(head)
+                changed = True
+    return known
+
+def test_retraction_matches_recomputed_closure():
+    rng = random.Random(28)
+    for _ in range(200):
+        reasoner = IncrementalForwardChaining()
+        told = []
+        for _ in range(30):
+            if told and rng.random() < 0.4:
+                sentence = told.pop(rng.randrange(len(told)))
+                reasoner.retract(sentence)
+            else:
+                sentence = random_horn(rng)
+                told.append(sentence)
+                reasoner.tell(sentence)
+            expected = closure(told)
+            assert {symbol for symbol in SYMBOLS if reasoner.ask(symbol)} == expected, told
+
+def test_loaded_knowledge_base_matches_forward_chaining():
+    tell = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+    reasoner = IncrementalForwardChaining(KnowledgeBase(tell, 'HF'))
+    for query in ["d", "f", "h", "p1"]:
+        assert reasoner.solve(query) == ForwardChaining(KnowledgeBase(tell, 'HF')).solve(query).split(":")[0]
+    reasoner.retract("p2")
+    assert reasoner.solve("d") == "NO"
+    reasoner.tell("p3")
+    assert reasoner.solve("d") == "YES" and reasoner.solve("p2") == "NO"
+
+def test_duplicate_facts_need_two_retractions():
+    reasoner = IncrementalForwardChaining()
+    reasoner.tell("a")
+    reasoner.tell("a")
+    reasoner.tell("a=>b")
+    reasoner.retract("a")
+    assert reasoner.ask("b")
+    reasoner.retract("a")
+    assert not reasoner.ask("b")
+
+def test_retracting_an_unknown_sentence_raises():
+    reasoner = IncrementalForwardChaining()
+    for sentence in ["a", "a=>b"]:
+        try:
+            reasoner.retract(sentence)
+        except KeyError:
+            pass
+        else:
+            assert False, f"retracting {sentence} did not raise"
+
+if __name__ == "__main__":
+    test_retraction_matches_recomputed_closure()
+    test_loaded_knowledge_base_matches_forward_chaining()
+    test_duplicate_facts_need_two_retractions()
+    test_retracting_an_unknown_sentence_raises()
+    print("Incremental forward chaining tests passed.")
@@ -0,0 +1,48 @@
+import random
+from KnowledgeBase import KnowledgeBase
+from ForwardChaining import ForwardChaining
+from BackwardChaining import BackwardChaining
+from random_problems import random_horn_kb, truth_table, verdict
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f", "g"]
+
+def test_rules_round_trip_through_the_arrays():
+    kb = KnowledgeBase(["a", "b&a&b=>c", "c=>d", "d&a=>e"], 'HF')
+    assert kb.symbols == ["a", "b", "c", "d", "e"]
+    assert list(kb.rules()) == [("a", []), ("c", ["b", "a"]), ("d", ["c"]), ("e", ["d", "a"])]
+    assert list(kb.offsets) == [0, 0, 2, 3, 5] and kb.num_rules == 4
+    assert [kb.ids[symbol] for symbol in kb.symbols] == list(range(len(kb.symbols)))
+
+def test_chaining_matches_truth_table():
+    rng = random.Random(32)
+    for _ in range(200):
+        tell = random_horn_kb(rng, SYMBOLS)
+        kb = KnowledgeBase(tell, 'HF')
+        for query in kb.symbols:
+            expected = verdict(truth_table(tell, query))
+            for engine in [ForwardChaining, BackwardChaining]:
+                assert verdict(engine(kb).solve(query)) == expected, (engine.__name__, tell, query)
+
+def test_repeated_premises_count_once():
+    # a repeated premise is one condition, so its rule is queued with the priority of a single-premise rule
+    tell = ["e", "e&e=>f", "e&e&d=>f", "c=>d", "a", "c"]
+    kb = KnowledgeBase(tell, 'HF')
+    assert kb.rule(1) == ("f", ["e"]) and kb.rule(2) == ("f", ["e", "d"])
+    assert ForwardChaining(kb).solve("d") == "YES: e, a, c, f, d"
+    assert BackwardChaining(kb).solve("f") == "YES: e, f"
+
+def test_general_sentences_are_rejected_as_horn():
+    for sentence in ["a || b", "a => b || c", "~a"]:
+        try:
+            KnowledgeBase([sentence], 'HF')
+        except Exception:
+            pass
+        else:
+            assert False, f"{sentence} was accepted as Horn form"
+
+if __name__ == "__main__":
+    test_rules_round_trip_through_the_arrays()
+    test_chaining_matches_truth_table()
+    test_repeated_premises_count_once()
+    test_general_sentences_are_rejected_as_horn()
+    print("Knowledge base tests passed.")
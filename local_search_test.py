@@ -0,0 +1,57 @@
+import random
+from CNF import CNF
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from LocalSearch import LocalSearch
+from InferenceEngine import run
+from random_problems import random_problems, truth_table, verdict
+
+def random_3sat(rng, num_vars, num_clauses):
+    cnf = CNF()
+    for var in range(1, num_vars + 1):
+        cnf.intern(f"x{var}")
+    while len(cnf.clauses) < num_clauses:
+        cnf.add_clause(var if rng.random() < 0.5 else -var for var in rng.sample(range(1, num_vars + 1), 3))
+    return cnf
+
+def test_answers_never_contradict_truth_table():
+    for algorithm in LocalSearch.ALGORITHMS:
+        for seed, (tell, ask) in enumerate(random_problems(80, seed=42)):
+            expected = verdict(truth_table(tell, ask))
+            answer = run('LS', tell, ask, local_search={'algorithm': algorithm, 'seed': seed, 'max_flips': 500, 'restarts': 1})[0]
+            # small countermodels are always found, and YES only comes from an empty clause
+            assert answer == expected or (expected == "YES" and answer.startswith("UNKNOWN")), (algorithm, tell, ask, answer)
+
+def test_countermodels_falsify_the_query():
+    for seed, (tell, ask) in enumerate(random_problems(80, seed=420)):
+        kb, query = KnowledgeBase(tell, 'GS'), Sentence(ask)
+        engine = LocalSearch(kb, query, seed=seed, max_flips=500, restarts=1)
+        if engine.solve() is False:
+            model = {symbol: engine.model.get(symbol, False) for symbol in kb.symbols + query.symbols}
+            assert all(sentence.solve(model) for sentence in kb.sentences) and not query.solve(model), (tell, ask)
+
+def test_seeded_search_finds_models_of_satisfiable_instances():
+    rng = random.Random(421)
+    for _ in range(10):
+        cnf = random_3sat(rng, 60, 180)
+        for algorithm in LocalSearch.ALGORITHMS:
+            engine = LocalSearch(None, None, algorithm=algorithm, seed=7)
+            assert engine.satisfiable(cnf), algorithm
+            assert all(any(engine.model[cnf.symbols[abs(literal) - 1]] == (literal > 0) for literal in clause)
+                       for clause in cnf.clauses)
+            stats = dict(engine.stats)
+            again = LocalSearch(None, None, algorithm=algorithm, seed=7)
+            again.satisfiable(cnf)
+            assert again.stats == stats and again.model == engine.model
+
+def test_flip_limits_and_unknown_algorithm():
+    answer, stats = run('LS', ["a || b", "~a || b", "a || ~b", "~a || ~b"], "a", local_search={'max_flips': 5, 'restarts': 2, 'seed': 1})
+    assert answer.startswith("UNKNOWN") and stats['tries'] == 3 and stats['flips'] == 15
+    assert run('LS', ["a"], "a", local_search={'algorithm': 'GSAT'})[0].startswith("Error: Unknown local search algorithm")
+
+if __name__ == "__main__":
+    test_answers_never_contradict_truth_table()
+    test_countermodels_falsify_the_query()
+    test_seeded_search_finds_models_of_satisfiable_instances()
+    test_flip_limits_and_unknown_algorithm()
+    print("Local search tests passed.")
@@ -0,0 +1,26 @@
+from ResolutionProver import ResolutionProver
+from InferenceEngine import run
+from random_problems import random_problems, truth_table, verdict
+
+def test_saturation_matches_truth_table():
+    for tell, ask in random_problems(150, seed=40, clauses=True):
+        expected = verdict(truth_table(tell, ask))
+        assert run('RP', tell, ask, workers=1)[0] == expected, (tell, ask)
+
+def test_worker_pool_derives_the_same_clauses():
+    threshold = ResolutionProver.PARALLEL_PAIRS
+    ResolutionProver.PARALLEL_PAIRS = 0  # send every level to the pool
+    try:
+        for tell, ask in random_problems(20, seed=400, sentences=(3, 6)):
+            expected = verdict(truth_table(tell, ask))
+            single = run('RP', tell, ask, workers=1)
+            parallel = run('RP', tell, ask, workers=2)
+            assert parallel[0] == expected, (tell, ask)
+            assert parallel[1] == single[1], (tell, ask)
+    finally:
+        ResolutionProver.PARALLEL_PAIRS = threshold
+
+if __name__ == "__main__":
+    test_saturation_matches_truth_table()
+    test_worker_pool_derives_the_same_clauses()
+    print("Parallel resolution tests passed.")
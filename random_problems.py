@@ -0,0 +1,114 @@
+import random
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from TruthTable import TruthTable
+
+SYMBOLS = ["a", "b", "c", "d", "e", "f"]
+
+def random_sentence(rng, symbols, depth=2):
+    """
+    Builds a random sentence in the input syntax.
+
+    Args:
+        rng (random.Random): The random generator.
+        symbols (list of str): The symbols to draw from.
+        depth (int): The maximum nesting depth.
+
+    Returns:
+        str: The sentence.
+    """
+    if depth == 0 or rng.random() < 0.3:
+        symbol = rng.choice(symbols)
+        return "~" + symbol if rng.random() < 0.4 else symbol
+    if rng.random() < 0.15:
+        return "~(" + random_sentence(rng, symbols, depth - 1) + ")"
+    operator = rng.choice(["&", "||", "=>", "<=>", "||"])
+    return "(" + random_sentence(rng, symbols, depth - 1) + operator + random_sentence(rng, symbols, depth - 1) + ")"
+
+def random_clause(rng, symbols, width=3):
+    """
+    Builds a random clause in the input syntax.
+
+    Args:
+        rng (random.Random): The random generator.
+        symbols (list of str): The symbols to draw from.
+        width (int): The maximum number of literals.
+
+    Returns:
+        str: The clause.
+    """
+    chosen = rng.sample(symbols, rng.randint(1, width))
+    return " || ".join("~" + symbol if rng.random() < 0.5 else symbol for symbol in chosen)
+
+def random_problems(count, seed=0, symbols=SYMBOLS, sentences=(2, 5), clauses=False):
+    """
+    Yields random problems whose query only uses knowledge base symbols, so the truth
+    table answer is the reference answer.
+
+    Args:
+        count (int): The number of problems.
+        seed (int): Seed of the random generator.
+        symbols (list of str): The symbols to draw from.
+        sentences (tuple of int): The smallest and largest number of KB sentences.
+        clauses (bool): Generate clauses instead of nested sentences.
+
+    Yields:
+        tuple: (tell, ask) as returned by FileReader.read.
+    """
+    rng = random.Random(seed)
+    produced = 0
+    while produced < count:
+        make = random_clause if clauses else random_sentence
+        tell = [make(rng, symbols) for _ in range(rng.randint(*sentences))]
+        used = sorted({symbol for sentence in tell for symbol in symbols if symbol in sentence})
+        if not used:
+            continue
+        ask = random_sentence(rng, used, 1)
+        produced += 1
+        yield tell, ask
+
+def random_horn_kb(rng, symbols=SYMBOLS, rules=(2, 9)):
+    """
+    Builds a random knowledge base of facts and definite clauses.
+
+    Args:
+        rng (random.Random): The random generator.
+        symbols (list of str): The symbols to draw from.
+        rules (tuple of int): The smallest and largest number of sentences.
+
+    Returns:
+        list of str: The sentences.
+    """
+    tell = []
+    for _ in range(rng.randint(*rules)):
+        head = rng.choice(symbols)
+        if rng.random() < 0.3:
+            tell.append(head)
+        else:
+            tell.append("&".join(rng.choice(symbols) for _ in range(rng.randint(1, 3))) + "=>" + head)
+    return tell
+
+def truth_table(tell, ask):
+    """
+    Returns the truth table answer of a problem.
+
+    Args:
+        tell (list of str): The knowledge base sentences.
+        ask (str): The query.
+
+    Returns:
+        str: "YES: <models>" or "NO".
+    """
+    return TruthTable(KnowledgeBase(tell, 'GS')).solve(Sentence(ask))
+
+def verdict(answer):
+    """
+    Drops the model count of an answer.
+
+    Args:
+        answer (str): An answer such as "YES: 3".
+
+    Returns:
+        str: "YES", "NO" or the answer unchanged.
+    """
+    return answer.split(":")[0] if answer.startswith(("YES", "NO")) else answer
@@ -0,0 +1,97 @@
+import os
+import random
+import tempfile
+import multiprocessing
+from itertools import product
+from CNF import CNF
+from KnowledgeBase import KnowledgeBase
+from SharedKB import SharedKB, query_worker
+from ForwardChaining import ForwardChaining
+from BackwardChaining import BackwardChaining
+from BitForwardChaining import BitForwardChaining
+from random_problems import random_problems, random_horn_kb
+
+def frozen_copies(kb):
+    """Yields the KB frozen in shared memory and in a file, each also attached a second time."""
+    for path in [None, os.path.join(tempfile.mkdtemp(), "kb.skb")]:
+        frozen = SharedKB.freeze(kb, path=path)
+        attached = SharedKB.attach(frozen.handle)
+        try:
+            yield frozen
+            yield attached
+        finally:
+            attached.close()
+            frozen.close()
+            frozen.unlink()
+
+def test_chaining_on_a_frozen_kb_matches_the_original():
+    rng = random.Random(43)
+    for _ in range(40):
+        kb = KnowledgeBase(random_horn_kb(rng), 'HF')
+        for frozen in frozen_copies(kb):
+            assert frozen.symbols == kb.symbols and frozen.num_rules == kb.num_rules
+            assert [frozen.rule(index) for index in range(kb.num_rules)] == list(kb.rules())
+            for query in kb.symbols:
+                assert ForwardChaining(frozen).solve(query) == ForwardChaining(kb).solve(query)
+                assert BackwardChaining(frozen).solve(query) == BackwardChaining(kb).solve(query)
+                assert BitForwardChaining(frozen).solve(query) == BitForwardChaining(kb).solve(query)
+
+def test_clauses_and_sentences_round_trip():
+    for tell, _ in random_problems(40, seed=430):
+        kb = KnowledgeBase(tell, 'GS')
+        cnf = CNF.from_kb(kb)
+        for frozen in frozen_copies(kb):
+            assert [frozen.clause(index) for index in range(frozen.num_clauses)] == cnf.clauses
+            assert frozen.num_sentences == len(kb.sentences)
+            for values in product([0, 1], repeat=len(kb.symbols)):
+                model = {symbol: bool(value) for symbol, value in zip(kb.symbols, values)}
+                truths = [sentence.solve(model) for sentence in kb.sentences]
+                assert frozen.evaluate(values) == all(truths), (tell, model)
+                assert [frozen.evaluate(values, index) for index in range(len(truths))] == truths, (tell, model)
+
+def engine_id(_):
+    return id(SharedKB.engine)
+
+def test_pool_workers_answer_from_the_frozen_kb():
+    tell = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+    kb = KnowledgeBase(tell, 'HF')
+    queries = kb.symbols + ["z"]
+    for path in [None, os.path.join(tempfile.mkdtemp(), "kb.skb")]:
+        frozen = SharedKB.freeze(kb, path=path)
+        try:
+            with multiprocessing.Pool(2, initializer=SharedKB.attach_chaining_worker, initargs=(frozen.handle,)) as pool:
+                assert pool.map(query_worker, queries) == [ForwardChaining(kb).solve(query) for query in queries]
+            # every query of a worker runs on the engine built when the worker started
+            with multiprocessing.Pool(1, initializer=SharedKB.attach_chaining_worker, initargs=(frozen.handle,)) as pool:
+                assert pool.map(query_worker, queries, chunksize=1) == [ForwardChaining(kb).solve(query) for query in queries]
+                assert len(set(pool.map(engine_id, range(8), chunksize=1))) == 1
+        finally:
+            frozen.close()
+            frozen.unlink()
+
+def test_invalid_blocks_and_symbol_tables_are_rejected():
+    kb = KnowledgeBase(["a => b", "b || c"], 'GS')
+    cnf = CNF()
+    cnf.intern("z")
+    try:
+        SharedKB.freeze(kb, cnf)
+    except ValueError as e:
+        assert "must start with" in str(e)
+    else:
+        assert False, "a CNF with other symbols was frozen"
+    path = os.path.join(tempfile.mkdtemp(), "junk.skb")
+    with open(path, 'wb') as f:
+        f.write(b"\0" * 256)
+    try:
+        SharedKB.attach(('file', path))
+    except ValueError as e:
+        assert "Not a frozen knowledge base" in str(e)
+    else:
+        assert False, "a block without the header was attached"
+
+if __name__ == "__main__":
+    test_chaining_on_a_frozen_kb_matches_the_original()
+    test_clauses_and_sentences_round_trip()
+    test_pool_workers_answer_from_the_frozen_kb()
+    test_invalid_blocks_and_symbol_tables_are_rejected()
+    print("Shared KB tests passed.")
@@ -0,0 +1,49 @@
+import random
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from Slicer import Slicer
+from InferenceEngine import run
+from random_problems import random_sentence, truth_table, verdict
+
+GROUPS = [["a", "b", "c"], ["d", "e"], ["f", "g"]]
+
+def random_split_problems(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        tell = [random_sentence(rng, rng.choice(GROUPS)) for _ in range(rng.randint(2, 7))]
+        used = sorted({symbol for sentence in tell for group in GROUPS for symbol in group if symbol in sentence})
+        yield tell, random_sentence(rng, used, 1)
+
+def test_sliced_answers_match_truth_table():
+    for tell, ask in random_split_problems(150, seed=35):
+        expected = truth_table(tell, ask)
+        assert run('TT', tell, ask, slice=True)[0] == expected, (tell, ask)
+        assert run('DPLL', tell, ask, slice=True)[0] == verdict(expected), (tell, ask)
+        assert run('RP', tell, ask, slice=True, workers=1)[0] == verdict(expected), (tell, ask)
+
+def test_components_share_no_symbols():
+    for tell, ask in random_split_problems(100, seed=350):
+        kb = KnowledgeBase(tell, 'GS')
+        parts = Slicer(kb).components()
+        assert sorted(sentence.text for part in parts for sentence in part.sentences) == sorted(s.text for s in kb.sentences)
+        for i, part in enumerate(parts):
+            for other in parts[i + 1:]:
+                assert not set(part.symbols) & set(other.symbols)
+        # every KB sentence is entailed, so the truth table reports the model count
+        assert "YES: " + str(Slicer.count(parts)) == truth_table(tell, tell[0])
+
+def test_cone_and_inconsistent_rest():
+    kb = KnowledgeBase(["p => q", "q => r", "p", "a || b", "c & d => e", "e => c"], 'GS')
+    cone, rest = Slicer(kb).slice(Sentence("r"))
+    assert cone.symbols == ["p", "q", "r"]
+    assert sorted(part.symbols for part in rest) == [["a", "b"], ["c", "d", "e"]]
+    assert Slicer.consistent(rest) and Slicer.count(rest) == 3 * 5
+    tell = ["p", "a & ~a"]
+    assert run('DPLL', tell, "~p", slice=True)[0] == "YES"
+    assert run('TT', tell, "~p", slice=True)[0] == "YES: 0"
+
+if __name__ == "__main__":
+    test_sliced_answers_match_truth_table()
+    test_components_share_no_symbols()
+    test_cone_and_inconsistent_rest()
+    print("Slicer tests passed.")
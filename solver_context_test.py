@@ -0,0 +1,60 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from SolverContext import SolverContext
+from ForwardChaining import ForwardChaining
+from BackwardChaining import BackwardChaining
+from TruthTable import TruthTable
+from ResolutionProver import ResolutionProver
+from InferenceEngine import run
+from random_problems import random_problems, random_sentence, random_horn_kb, truth_table, verdict
+
+def test_one_engine_answers_many_queries():
+    rng = random.Random(38)
+    for tell, ask in random_problems(40, seed=38):
+        kb = KnowledgeBase(tell, 'GS')
+        tt = TruthTable(kb)
+        rp = ResolutionProver(kb, Sentence(ask), workers=1)
+        for query in [ask] + [random_sentence(rng, kb.symbols, 1) for _ in range(4)]:
+            expected = truth_table(tell, query)
+            assert tt.solve(Sentence(query)) == expected, (tell, query)
+            assert tt.count == run('TT', tell, query)[1]['models']
+            assert ("YES" if rp.solve(Sentence(query)) else "NO") == verdict(expected), (tell, query)
+    for _ in range(60):
+        tell = random_horn_kb(rng)
+        kb = KnowledgeBase(tell, 'HF')
+        fc, bc = ForwardChaining(kb), BackwardChaining(kb)
+        for query in kb.symbols + kb.symbols:
+            assert fc.solve(query) == run('FC', tell, query)[0], (tell, query)
+            assert bc.solve(query) == run('BC', tell, query)[0], (tell, query)
+
+def test_concurrent_queries_with_their_own_contexts():
+    rng = random.Random(380)
+    for tell, _ in random_problems(10, seed=380, sentences=(3, 6)):
+        kb = KnowledgeBase(tell, 'GS')
+        queries = [random_sentence(rng, kb.symbols, 1) for _ in range(16)]
+        tt = TruthTable(kb)
+        rp = ResolutionProver(kb, Sentence(queries[0]), workers=1)
+        contexts = [SolverContext() for _ in queries]
+        with ThreadPoolExecutor(4) as pool:
+            answers = list(pool.map(lambda pair: tt.solve(Sentence(pair[0]), pair[1]), zip(queries, contexts)))
+            proofs = list(pool.map(lambda query: rp.solve(Sentence(query), SolverContext()), queries))
+        for query, context, answer, proof in zip(queries, contexts, answers, proofs):
+            expected = truth_table(tell, query)
+            assert answer == expected and context.count == tt.count, (tell, query)
+            assert ("YES" if proof else "NO") == verdict(expected), (tell, query)
+    for _ in range(20):
+        kb = KnowledgeBase(random_horn_kb(rng), 'HF')
+        fc, bc = ForwardChaining(kb), BackwardChaining(kb)
+        queries = kb.symbols * 4
+        with ThreadPoolExecutor(4) as pool:
+            forward = list(pool.map(lambda query: fc.solve(query, SolverContext()), queries))
+            backward = list(pool.map(lambda query: bc.solve(query, bc.new_context()), queries))
+        assert forward == [ForwardChaining(kb).solve(query) for query in queries]
+        assert backward == [BackwardChaining(kb).solve(query) for query in queries]
+
+if __name__ == "__main__":
+    test_one_engine_answers_many_queries()
+    test_concurrent_queries_with_their_own_contexts()
+    print("Solver context tests passed.")
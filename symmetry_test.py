@@ -0,0 +1,60 @@
+import random
+from itertools import product
+from CNF import CNF
+from KnowledgeBase import KnowledgeBase
+from Symmetry import Symmetry
+from InferenceEngine import run, run_cnf
+from random_problems import random_problems, random_clause, truth_table, verdict
+
+PIGEONS = [f"p{i}1 || p{i}2 || p{i}3" for i in range(1, 5)] + \
+    [f"~p{i}{h} || ~p{j}{h}" for h in (1, 2, 3) for i in range(1, 5) for j in range(i + 1, 5)]
+
+def symmetric_problems(count, seed):
+    """Random clause sets closed under swapping a and b, so they have a symmetry to find."""
+    rng = random.Random(seed)
+    swap = str.maketrans("ab", "ba")
+    for _ in range(count):
+        tell = [random_clause(rng, ["a", "b", "c", "d", "e"]) for _ in range(rng.randint(2, 5))]
+        tell += [clause.translate(swap) for clause in tell]
+        used = sorted({symbol for clause in tell for symbol in "abcde" if symbol in clause})
+        yield tell, random_clause(rng, used, 2)
+
+def satisfiable(cnf):
+    return any(all(any(model[abs(literal) - 1] == (literal > 0) for literal in clause) for clause in cnf.clauses)
+               for model in product([True, False], repeat=cnf.num_vars))
+
+def test_answers_match_truth_table():
+    problems = list(random_problems(60, seed=39, clauses=True)) + list(symmetric_problems(60, seed=390))
+    for tell, ask in problems:
+        expected = truth_table(tell, ask)
+        assert run('TT', tell, ask, symmetry=True)[0] == expected, (tell, ask)
+        assert run('DPLL', tell, ask, symmetry=True)[0] == verdict(expected), (tell, ask)
+
+def test_pigeonhole_symmetries():
+    answer, stats = run('DPLL', PIGEONS, "p11", symmetry=True)
+    assert answer == "YES" and stats['generators'] > 0 and stats['sbp_clauses'] > 0
+    answer, stats = run('TT', PIGEONS, "~p11", symmetry=True)
+    assert answer == truth_table(PIGEONS, "~p11") == "YES: 0"
+    assert stats['evaluated'] < 2 ** 12
+    holes = PIGEONS[:3] + [clause for clause in PIGEONS[4:] if "p4" not in clause]
+    answer, stats = run('TT', holes, "p11 || p12 || p13", symmetry=True)
+    assert answer == truth_table(holes, "p11 || p12 || p13") and stats['evaluated'] < 2 ** 9
+
+def test_generators_preserve_clauses_and_satisfiability():
+    for tell, _ in symmetric_problems(80, seed=391):
+        cnf = CNF.from_kb(KnowledgeBase(tell, 'GS'))
+        symmetry = Symmetry(cnf)
+        assert symmetry.generators or "a" not in cnf.symbols, tell
+        clauses = {frozenset(clause) for clause in cnf.clauses}
+        for generator in symmetry.generators:
+            image = {frozenset(generator.get(abs(literal), abs(literal)) * (1 if literal > 0 else -1) for literal in clause)
+                     for clause in clauses}
+            assert image == clauses, (tell, generator)
+        assert satisfiable(symmetry.break_symmetries()) == satisfiable(cnf), tell
+        assert run_cnf('DPLL', cnf, symmetry=True)[0] == run_cnf('DPLL', cnf)[0], tell
+
+if __name__ == "__main__":
+    test_answers_match_truth_table()
+    test_pigeonhole_symmetries()
+    test_generators_preserve_clauses_and_satisfiability()
+    print("Symmetry tests passed.")
@@ -0,0 +1,71 @@
+import io
+import os
+import json
+import tempfile
+from Tracer import Tracer
+from TraceReplay import TraceReplay
+from KnowledgeBase import KnowledgeBase
+from Sentence import Sentence
+from DPLL import DPLL
+from ForwardChaining import ForwardChaining
+
+TELL = ["p2=>p3", "p3=>p1", "c=>e", "b&e=>f", "f&g=>h", "p1=>d", "p1&p3=>c", "a", "b", "p2"]
+
+def test_events_are_numbered_json_records():
+    stream = io.StringIO()
+    tracer = Tracer(stream=stream)
+    DPLL(KnowledgeBase(["a || b", "~a || c", "~b"], 'GS'), Sentence("c"), tracer=tracer).solve()
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [record['seq'] for record in records] == list(range(1, len(records) + 1))
+    assert records[0]['event'] == 'start' and records[0]['engine'] == 'DPLL'
+    assert records[-1]['event'] == 'result' and records[-1]['answer'] == "UNSATISFIABLE"
+
+def test_ring_buffer_keeps_the_last_events():
+    path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+    tracer = Tracer(path, capacity=3)
+    answer = ForwardChaining(KnowledgeBase(TELL, 'HF'), tracer=tracer).solve("d")
+    tracer.close()
+    trace = TraceReplay(path)
+    assert answer.startswith("YES")
+    assert len(trace.events) == 3
+    assert trace.summary()['dropped'] == trace.events[0]['seq'] - 1 > 0
+
+def test_replay_summarises_a_run():
+    path = os.path.join(tempfile.mkdtemp(), "trace.jsonl")
+    tracer = Tracer(path)
+    ForwardChaining(KnowledgeBase(TELL, 'HF'), tracer=tracer).solve("d")
+    tracer.close()
+    trace = TraceReplay(path)
+    summary = trace.summary()
+    assert summary['counts']['rule-fired'] == summary['events']
+    out = io.StringIO()
+    trace.replay(['rule-fired'], out)
+    assert "Rule fired: ['p2'] => p3" in out.getvalue()
+
+def test_close_twice_keeps_the_trace():
+    directory = tempfile.mkdtemp()
+    for capacity in (None, 3):
+        path = os.path.join(directory, f"trace-{capacity}.jsonl")
+        tracer = Tracer(path, capacity=capacity)
+        ForwardChaining(KnowledgeBase(TELL, 'HF'), tracer=tracer).solve("d")
+        tracer.close()
+        with open(path) as f:
+            written = f.read()
+        tracer.close()
+        with open(path) as f:
+            assert f.read() == written != ""
+    tracer = Tracer(stream=io.StringIO())
+    tracer.close()
+    tracer.close()
+
+def test_text_format_uses_templates():
+    assert Tracer.format({'event': 'decision', 'level': 2, 'literal': "~a"}) == "Decision 2: ~a"
+    assert Tracer.format({'event': 'custom', 'x': 1}) == "custom: x=1"
+
+if __name__ == "__main__":
+    test_events_are_numbered_json_records()
+    test_ring_buffer_keeps_the_last_events()
+    test_replay_summarises_a_run()
+    test_close_twice_keeps_the_trace()
+    test_text_format_uses_templates()
+    print("Tracer tests passed.")